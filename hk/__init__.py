@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""HK Podravka – podatkovni sloj i pomoćni alati koji rade bez Streamlita."""
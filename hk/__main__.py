@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""python -m hk … → naredbeni redak (hk/cli.py)."""
+
+from hk.cli import main
+
+main()
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Analitika prisustva: postotak dolazaka po sportašu i grupi, sati trenera,
+nizovi dolazaka i izostanci, tjedni trend s pomičnim prosjekom od 4 tjedna.
+
+Sve se računa vektorski (numpy/pandas) nad jednim skupnim dohvatom sesija
+i prisustva u razdoblju (indeks na sessions.start_ts), bez upita po
+sportašu. Dolasci stižu kao jedan redak po sesiji (group_concat), ne redak
+po dolasku – pretvaranje stotina tisuća redaka u Python objekte bilo je
+najskuplji dio. Grupe i tjedni trend računaju se iz zbrojeva po sesiji.
+Očekivani treninzi sportaša su sesije njegove (trenutne) grupe.
+
+▶ Mjerenje nad sintetičkom bazom:
+    python -m hk.analytics --db bench.db
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hk.schedule import TS_FORMAT, season_bounds
+
+WINDOWS = {"sezona": "Sezona", "4t": "Zadnja 4 tjedna"}
+
+
+def window_bounds(window: str, as_of: date) -> Tuple[date, date]:
+    if window == "4t":
+        return as_of - timedelta(days=27), as_of
+    return season_bounds(as_of)[0], as_of
+
+
+def latest_session_date(conn) -> Optional[date]:
+    row = conn.execute("SELECT MAX(start_ts) FROM sessions").fetchone()
+    return date.fromisoformat(row[0][:10]) if row and row[0] else None
+
+
+def fingerprint(conn) -> tuple:
+    """Jeftin otisak podataka – za priručnu memoriju (cache) rezultata."""
+    return (conn.execute("SELECT COUNT(*), MAX(id), TOTAL(present), TOTAL(minutes) FROM attendance").fetchone()
+            + conn.execute("SELECT COUNT(*), MAX(id) FROM sessions").fetchone()
+            + conn.execute("SELECT COUNT(*), MAX(id), TOTAL(group_id) FROM members").fetchone())
+
+
+def _ints(csv: str) -> np.ndarray:
+    """"1,2,3" → int64."""
+    return np.fromstring(csv, dtype=np.int64, sep=",") if csv else np.empty(0, dtype=np.int64)
+
+
+def load_frames(conn, date_from: date, date_to: date) -> Dict[str, pd.DataFrame]:
+    """Jedan dohvat po tablici: sesije i prisustvo u razdoblju, članovi, grupe, treneri."""
+    lo = date_from.strftime(TS_FORMAT)
+    hi = (date_to + timedelta(days=1)).strftime(TS_FORMAT)
+    # dolasci sesije kao "članovi;minute" (dva group_concat u istom prolazu – isti redoslijed),
+    # iz pokrivajućeg indeksa ix_attendance_session_cover
+    rows = conn.execute("""
+        SELECT id, group_id, coach_id, start_ts,
+               (julianday(end_ts) - julianday(start_ts)) * 1440.0,
+               (SELECT group_concat(a.member_id) || ';' || group_concat(CAST(COALESCE(a.minutes, 0) AS INTEGER))
+                FROM attendance a
+                WHERE a.session_id = s.id AND a.present = 1 AND a.member_id IS NOT NULL)
+        FROM sessions s WHERE start_ts >= ? AND start_ts < ?""", (lo, hi)).fetchall()
+    sessions = pd.DataFrame([r[:5] for r in rows],
+                            columns=["session_id", "group_id", "coach_id", "start_ts", "trajanje_min"])
+    packed = [r[5].split(";") for r in rows if r[5]]
+    att = pd.DataFrame({
+        "session_id": np.repeat([r[0] for r in rows if r[5]], [p[0].count(",") + 1 for p in packed]).astype(np.int64),
+        "member_id": _ints(",".join(p[0] for p in packed)),
+        "minutes": _ints(",".join(p[1] for p in packed)),
+    })
+    members = pd.DataFrame(conn.execute("SELECT id, full_name, group_id FROM members").fetchall(),
+                           columns=["member_id", "ime_prezime", "group_id"])
+    groups = pd.DataFrame(conn.execute("SELECT id, name FROM groups").fetchall(), columns=["group_id", "grupa"])
+    coaches = pd.DataFrame(conn.execute("SELECT id, full_name FROM coaches").fetchall(), columns=["coach_id", "trener"])
+    sessions["start"] = pd.to_datetime(sessions["start_ts"], format=TS_FORMAT, errors="coerce")
+    sessions["trajanje_min"] = sessions["trajanje_min"].fillna(0).clip(lower=0)
+    return {"sessions": sessions, "attendance": att, "members": members, "groups": groups, "coaches": coaches}
+
+
+def _expected(f: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Sportaš × sesije njegove grupe, s oznakom dolaska (kronološki po sportašu)."""
+    s = f["sessions"].dropna(subset=["group_id"]).sort_values(["group_id", "start", "session_id"], kind="stable")
+    m = f["members"].dropna(subset=["group_id"]).sort_values("member_id", kind="stable")
+    s_gid = s["group_id"].to_numpy(np.int64)
+    gids, g_first, g_count = np.unique(s_gid, return_index=True, return_counts=True)
+    m = m[m["group_id"].isin(gids)]
+    pos = np.searchsorted(gids, m["group_id"].to_numpy(np.int64))
+    first, count = g_first[pos], g_count[pos]
+    # sesije grupe su uzastopni blok u s → indeksi bez spajanja (merge)
+    total = int(count.sum())
+    block_start = np.repeat(np.cumsum(count) - count, count)
+    s_idx = np.repeat(first, count) + (np.arange(total) - block_start)
+    mids = np.repeat(m["member_id"].to_numpy(np.int64), count)
+    exp = pd.DataFrame({
+        "member_id": mids,
+        "group_id": s_gid[s_idx],
+        "session_id": s["session_id"].to_numpy(np.int64)[s_idx],
+    })
+    # dolazak: članstvo para (sportaš, položaj sesije u s) preko jednog cjelobrojnog ključa;
+    # ključevi exp su već rastući (sportaš, pa sesije bloka redom), pa je pretraga lokalna
+    att = f["attendance"]
+    sids, a_sid = s["session_id"].to_numpy(np.int64), att["session_id"].to_numpy(np.int64)
+    pos_of = np.full(int(max(sids.max(initial=0), a_sid.max(initial=0))) + 1, -1, dtype=np.int64)
+    pos_of[sids] = np.arange(len(sids))
+    a_pos = pos_of[a_sid]
+    came = np.sort(att["member_id"].to_numpy(np.int64)[a_pos >= 0] << 32 | a_pos[a_pos >= 0])
+    key = mids << 32 | s_idx
+    hit = np.searchsorted(came, key)
+    exp["dosao"] = came[np.minimum(hit, len(came) - 1)] == key if len(came) else False
+    return exp
+
+
+def _streaks(exp: pd.DataFrame) -> pd.DataFrame:
+    """Najdulji i trenutni niz dolazaka te trenutni niz izostanaka po sportašu."""
+    if exp.empty:
+        return pd.DataFrame(columns=["member_id", "niz_najdulji", "niz_trenutni", "izostanci_zaredom"])
+    d = exp["dosao"].to_numpy()
+    mid = exp["member_id"].to_numpy()
+    idx = np.arange(len(d))
+    new_run = np.ones(len(d), dtype=bool)
+    new_run[1:] = (d[1:] != d[:-1]) | (mid[1:] != mid[:-1])
+    run_len = idx - np.maximum.accumulate(np.where(new_run, idx, 0)) + 1
+    last = np.ones(len(d), dtype=bool)
+    last[:-1] = mid[1:] != mid[:-1]
+    longest = pd.Series(np.where(d, run_len, 0)).groupby(mid).max()
+    return pd.DataFrame({
+        "member_id": mid[last],
+        "niz_najdulji": longest.to_numpy(),
+        "niz_trenutni": np.where(d[last], run_len[last], 0),
+        "izostanci_zaredom": np.where(d[last], 0, run_len[last]),
+    })
+
+
+def _count_by(ids: np.ndarray, keys: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Broj (ili zbroj weights) redaka po ključu za svaki id – bincount umjesto groupby."""
+    if not len(keys):
+        return np.zeros(len(ids), dtype=np.int64)
+    n = max(int(keys.max()), int(ids.max(initial=0))) + 1
+    return np.bincount(keys, weights=weights, minlength=n)[ids].astype(np.int64)
+
+
+def member_rollup(f: Dict[str, pd.DataFrame], exp: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    exp = _expected(f) if exp is None else exp
+    out = f["members"].merge(f["groups"], on="group_id", how="left")
+    ids = out["member_id"].to_numpy(np.int64)
+    e_mid, a_mid = exp["member_id"].to_numpy(np.int64), f["attendance"]["member_id"].to_numpy(np.int64)
+    out["treninga"] = _count_by(ids, e_mid)
+    out["dolazaka"] = _count_by(ids, e_mid, exp["dosao"].to_numpy(np.float64))
+    out["minute"] = _count_by(ids, a_mid, f["attendance"]["minutes"].to_numpy(np.float64))
+    out = out.merge(_streaks(exp), on="member_id", how="left")
+    num = ["niz_najdulji", "niz_trenutni", "izostanci_zaredom"]
+    out[num] = out[num].fillna(0).astype(int)
+    out["izostanaka"] = out["treninga"] - out["dolazaka"]
+    out["postotak"] = (100 * out["dolazaka"] / out["treninga"].where(out["treninga"] > 0)).round(1)
+    cols = ["member_id", "ime_prezime", "grupa", "treninga", "dolazaka", "izostanaka", "postotak",
+            "minute", "niz_trenutni", "niz_najdulji", "izostanci_zaredom"]
+    return out[cols].sort_values(["grupa", "ime_prezime"], na_position="last").reset_index(drop=True)
+
+
+def _per_session(f: Dict[str, pd.DataFrame], exp: pd.DataFrame) -> pd.DataFrame:
+    """Po sesiji: mogući dolasci (članovi grupe) i dolasci članova grupe; samo sesije s članovima."""
+    s = f["sessions"][["session_id", "group_id", "start"]].copy()
+    ids, e_sid = s["session_id"].to_numpy(np.int64), exp["session_id"].to_numpy(np.int64)
+    s["moguće"] = _count_by(ids, e_sid)
+    s["dolazaka"] = _count_by(ids, e_sid, exp["dosao"].to_numpy(np.float64))
+    return s[s["moguće"] > 0]
+
+
+def group_rollup(f: Dict[str, pd.DataFrame], exp: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    exp = _expected(f) if exp is None else exp
+    per = _per_session(f, exp).groupby("group_id")[["moguće", "dolazaka"]].sum()
+    n_sess = f["sessions"].groupby("group_id").agg(treninga=("session_id", "size"))
+    n_mem = f["members"].groupby("group_id").agg(članova=("member_id", "size"))
+    out = f["groups"].merge(n_sess, on="group_id", how="left").merge(n_mem, on="group_id", how="left") \
+        .merge(per, on="group_id", how="left")
+    out[["treninga", "članova", "moguće", "dolazaka"]] = out[["treninga", "članova", "moguće", "dolazaka"]].fillna(0).astype(int)
+    out["postotak"] = (100 * out["dolazaka"] / out["moguće"].where(out["moguće"] > 0)).round(1)
+    return out[["grupa", "treninga", "članova", "dolazaka", "postotak"]].sort_values("grupa").reset_index(drop=True)
+
+
+def coach_hours(f: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    per = f["sessions"].groupby("coach_id").agg(treninga=("session_id", "size"), minute=("trajanje_min", "sum"))
+    out = f["coaches"].merge(per, on="coach_id", how="inner")
+    out["sati"] = (out["minute"] / 60).round(1)
+    return out[["trener", "treninga", "sati"]].sort_values("sati", ascending=False).reset_index(drop=True)
+
+
+def weekly_rates(f: Dict[str, pd.DataFrame], exp: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Tjedni postotak dolazaka po grupi i pomični prosjek 4 tjedna (stupci: grupe)."""
+    exp = _expected(f) if exp is None else exp
+    if exp.empty:
+        return pd.DataFrame()
+    ps = _per_session(f, exp)
+    day = ps["start"].dt.normalize()
+    tjedan = day - pd.to_timedelta(day.dt.weekday, unit="D")   # ponedjeljak tjedna
+    names = f["groups"].set_index("group_id")["grupa"]
+    sums = ps[["moguće", "dolazaka"]].groupby([tjedan.rename("tjedan"), ps["group_id"].map(names).rename("grupa")]).sum()
+    rate = (sums["dolazaka"] / sums["moguće"]).unstack("grupa") * 100
+    return rate.rolling(4, min_periods=1).mean().round(1)
+
+
+def compute(conn, window: str = "sezona", as_of: Optional[date] = None) -> Dict[str, object]:
+    """Sve tablice za odabrano razdoblje ("sezona" ili "4t") do datuma as_of."""
+    as_of = as_of or latest_session_date(conn) or date.today()
+    d_from, d_to = window_bounds(window, as_of)
+    t0 = time.perf_counter()
+    f = load_frames(conn, d_from, d_to)
+    t1 = time.perf_counter()
+    exp = _expected(f)
+    out = {
+        "od": d_from, "do": d_to,
+        "sportasi": member_rollup(f, exp),
+        "grupe": group_rollup(f, exp),
+        "treneri": coach_hours(f),
+        "tjedno": weekly_rates(f, exp),
+    }
+    t2 = time.perf_counter()
+    out["ms"] = {"dohvat": round((t1 - t0) * 1000, 1), "izračun": round((t2 - t1) * 1000, 1)}
+    return out
+
+
+def main(argv=None):
+    from hk.db import get_conn, init_db
+
+    ap = argparse.ArgumentParser(description="Analitika prisustva – trajanje i sažetak.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    ap.add_argument("--window", choices=list(WINDOWS), default="sezona")
+    ap.add_argument("--as-of", help="datum YYYY-MM-DD (zadano: zadnja sesija)")
+    args = ap.parse_args(argv)
+    init_db(args.db)
+    conn = get_conn(args.db)
+    res = compute(conn, args.window, date.fromisoformat(args.as_of) if args.as_of else None)
+    conn.close()
+    print(f"Razdoblje {res['od']} – {res['do']}: dohvat {res['ms']['dohvat']} ms, izračun {res['ms']['izračun']} ms")
+    print(res["grupe"].to_string(index=False))
+    print(res["treneri"].head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
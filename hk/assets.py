@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Statički resursi (logo) iz memorije – render ne ovisi o mreži.
+
+LOGO.png iz repozitorija (ili logo učitan u odjeljku Klub) čita se s diska
+jednom po procesu, a varijante za bočnu traku i zaglavlje smanjuju se
+jednom i drže u memoriji. st.image(bytes) dobiva URL /media/<hash sadržaja>,
+pa isti bajtovi daju isti URL pri svakom rerunu i preglednik ga ne dohvaća
+ponovno.
+"""
+
+import io
+import os
+from functools import lru_cache
+from typing import Optional
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_PATH = os.path.join(ASSET_DIR, "LOGO.png")
+
+SIDEBAR_WIDTH = 120
+HEADER_WIDTH = 240
+
+
+@lru_cache(maxsize=16)
+def _variant(path: str, mtime_ns: int, width: Optional[int]) -> bytes:
+    """Bajtovi slike smanjene na širinu width (bez povećavanja); mtime poništava cache."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if width is None or Image is None:
+        return data
+    try:
+        im = Image.open(io.BytesIO(data))
+        if im.width <= width:
+            return data
+        im = im.convert("RGBA").resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+        out = io.BytesIO()
+        im.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+    except Exception:
+        return data
+
+
+def logo(width: Optional[int] = None, path: Optional[str] = None) -> bytes:
+    """Logo kluba: učitani logo (path) ako postoji na disku, inače LOGO.png iz repozitorija."""
+    if not path or not os.path.isfile(path):
+        path = LOGO_PATH
+    return _variant(path, os.stat(path).st_mtime_ns, width)
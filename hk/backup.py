@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Sigurnosne kopije baze i priloga (uploads/) te vraćanje iz kopije.
+
+Baza se kopira SQLite backup API-jem (Connection.backup) u koracima od
+`pages` stranica: između koraka upisi iz aplikacije nastavljaju, a kopija
+je uvijek dosljedna (obična kopija datoteke usred upisa to ne jamči).
+Kopija se odmah provjerava s PRAGMA integrity_check.
+
+Prilozi se spremaju po sadržaju (blobs/<sha256>): nova kopija kopira samo
+datoteke kojih još nema, a nepromijenjene datoteke (ista veličina i mtime)
+ne hashira ponovno. Svaka kopija ima manifest.json s popisom datoteka.
+
+Rotacija: zadnjih N kopija + jedna po tjednu i jedna po mjesecu; blobovi
+koje više ne koristi nijedna kopija brišu se.
+
+▶ Pokretanje:
+    python -m hk.backup create                       # kopija + rotacija
+    python -m hk.backup list
+    python -m hk.backup restore 20251019-210000 --db hk_podravka.db --uploads uploads
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from hk.config import BACKUP_DIR, DB_PATH, UPLOAD_DIR
+
+KEEP_LAST = 7
+KEEP_WEEKLY = 4
+KEEP_MONTHLY = 6
+
+STEP_PAGES = 256       # stranica po koraku backup API-ja
+STEP_SLEEP_S = 0.005   # stanka između koraka – prostor za upise iz aplikacije
+
+MANIFEST = "manifest.json"
+DB_NAME = "hk.db"
+ID_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _blob_path(backup_dir: str, sha: str) -> str:
+    return os.path.join(backup_dir, "blobs", sha[:2], sha)
+
+
+def _copy_atomic(src: str, dst: str):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def integrity_check(db_path: str) -> str:
+    """"ok" ili prve poruke PRAGMA integrity_check."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return "; ".join(r[0] for r in rows[:5])
+
+
+# ==========================
+# KOPIJA
+# ==========================
+def backup_db(src_path: str, dest_path: str, pages: int = STEP_PAGES, sleep: float = STEP_SLEEP_S) -> dict:
+    """Online kopija baze u koracima; vraća broj stranica, koraka i trajanje."""
+    from hk.db import get_read_conn
+
+    os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+    steps = []
+    src = get_read_conn(src_path)
+    dst = sqlite3.connect(dest_path)
+    t0 = time.perf_counter()
+    try:
+        src.backup(dst, pages=pages, sleep=sleep, progress=lambda status, remaining, total: steps.append(total))
+    finally:
+        dst.close()
+        src.close()
+    return {"pages": steps[-1] if steps else 0, "steps": len(steps),
+            "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+def snapshot_uploads(upload_dir: str, backup_dir: str, previous: Optional[Dict[str, dict]] = None) -> dict:
+    """Prilozi po sadržaju; hashira samo nove/promijenjene datoteke i kopira samo nove blobove."""
+    previous = previous or {}
+    files: Dict[str, dict] = {}
+    hashed = copied = copied_bytes = 0
+    if os.path.isdir(upload_dir):
+        for root, _dirs, names in os.walk(upload_dir):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, upload_dir).replace(os.sep, "/")
+                st = os.stat(path)
+                prev = previous.get(rel)
+                if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+                    sha = prev["sha256"]
+                else:
+                    sha = _sha256(path)
+                    hashed += 1
+                blob = _blob_path(backup_dir, sha)
+                if not os.path.exists(blob):
+                    _copy_atomic(path, blob)
+                    copied += 1
+                    copied_bytes += st.st_size
+                files[rel] = {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return {"files": files, "hashed": hashed, "copied": copied, "copied_bytes": copied_bytes}
+
+
+def list_backups(backup_dir: str = BACKUP_DIR) -> List[dict]:
+    """Manifesti postojećih kopija, od najnovije."""
+    out = []
+    if os.path.isdir(backup_dir):
+        for name in sorted(os.listdir(backup_dir), reverse=True):
+            path = os.path.join(backup_dir, name, MANIFEST)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    out.append(json.load(f))
+    return out
+
+
+def create_backup(db_path: str = DB_PATH, upload_dir: str = UPLOAD_DIR, backup_dir: str = BACKUP_DIR,
+                  rotate: bool = True) -> dict:
+    """Nova kopija baze i priloga; manifest se zapisuje zadnji, pa nedovršena kopija ne postoji."""
+    now = datetime.now()
+    backup_id = now.strftime(ID_FORMAT)
+    n = 1
+    while os.path.exists(os.path.join(backup_dir, backup_id)):
+        n += 1
+        backup_id = f"{now.strftime(ID_FORMAT)}-{n}"
+    snap_dir = os.path.join(backup_dir, backup_id)
+    os.makedirs(snap_dir)
+
+    db_copy = os.path.join(snap_dir, DB_NAME)
+    db_stats = backup_db(db_path, db_copy)
+    check = integrity_check(db_copy)
+    if check != "ok":
+        shutil.rmtree(snap_dir, ignore_errors=True)
+        raise ValueError(f"Kopija baze nije ispravna: {check}")
+
+    prev = list_backups(backup_dir)
+    up = snapshot_uploads(upload_dir, backup_dir, prev[0]["files"] if prev else None)
+    manifest = {
+        "id": backup_id, "created": now.isoformat(timespec="seconds"),
+        "db": {"source": os.path.abspath(db_path), "sha256": _sha256(db_copy),
+               "size": os.path.getsize(db_copy), "integrity": check, **db_stats},
+        "uploads": {"source": os.path.abspath(upload_dir), "hashed": up["hashed"],
+                    "copied": up["copied"], "copied_bytes": up["copied_bytes"]},
+        "files": up["files"],
+    }
+    tmp = os.path.join(snap_dir, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(snap_dir, MANIFEST))
+    if rotate:
+        manifest["removed"] = prune(backup_dir)
+    return manifest
+
+
+# ==========================
+# ROTACIJA
+# ==========================
+def prune(backup_dir: str = BACKUP_DIR, keep_last: int = KEEP_LAST, keep_weekly: int = KEEP_WEEKLY,
+          keep_monthly: int = KEEP_MONTHLY) -> List[str]:
+    """Zadrži zadnjih keep_last, najnoviju u svakom od keep_weekly tjedana i keep_monthly mjeseci."""
+    backups = list_backups(backup_dir)
+    keep = {b["id"] for b in backups[:keep_last]}
+    weeks, months = set(), set()
+    for b in backups:
+        created = datetime.fromisoformat(b["created"])
+        week, month = created.isocalendar()[:2], (created.year, created.month)
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.add(week)
+            keep.add(b["id"])
+        if month not in months and len(months) < keep_monthly:
+            months.add(month)
+            keep.add(b["id"])
+    removed = [b["id"] for b in backups if b["id"] not in keep]
+    for backup_id in removed:
+        shutil.rmtree(os.path.join(backup_dir, backup_id), ignore_errors=True)
+
+    # blobovi koje ne koristi nijedna preostala kopija
+    used = {f["sha256"] for b in backups if b["id"] in keep for f in b["files"].values()}
+    blob_root = os.path.join(backup_dir, "blobs")
+    if os.path.isdir(blob_root):
+        for root, _dirs, names in os.walk(blob_root):
+            for name in names:
+                if name not in used:
+                    os.remove(os.path.join(root, name))
+    return removed
+
+
+# ==========================
+# VRAĆANJE
+# ==========================
+def restore(backup_id: str, db_path: str = DB_PATH, upload_dir: str = UPLOAD_DIR,
+            backup_dir: str = BACKUP_DIR) -> dict:
+    """Vrati bazu i priloge iz kopije; baza se provjerava prije i poslije vraćanja.
+
+    Baza se upisuje backup API-jem u postojeću datoteku (ispravno i uz WAL);
+    prilozi se vraćaju samo ako nedostaju ili se razlikuju, ostale datoteke ostaju.
+    """
+    snap_dir = os.path.join(backup_dir, backup_id)
+    with open(os.path.join(snap_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    db_copy = os.path.join(snap_dir, DB_NAME)
+    if _sha256(db_copy) != manifest["db"]["sha256"]:
+        raise ValueError(f"Kopija baze {backup_id} ne odgovara manifestu.")
+    check = integrity_check(db_copy)
+    if check != "ok":
+        raise ValueError(f"Kopija baze {backup_id} nije ispravna: {check}")
+
+    # blobovi se provjere prije nego se išta prepiše
+    missing = [rel for rel, f in manifest["files"].items() if not os.path.isfile(_blob_path(backup_dir, f["sha256"]))]
+    if missing:
+        raise ValueError(f"Nedostaju prilozi u kopiji: {', '.join(missing[:5])}")
+
+    src = sqlite3.connect(f"file:{os.path.abspath(db_copy)}?mode=ro", uri=True)
+    dst = sqlite3.connect(db_path)
+    try:
+        src.backup(dst, pages=STEP_PAGES)
+    finally:
+        dst.close()
+        src.close()
+    check = integrity_check(db_path)
+    if check != "ok":
+        raise ValueError(f"Vraćena baza nije ispravna: {check}")
+
+    restored = 0
+    for rel, f in manifest["files"].items():
+        target = os.path.join(upload_dir, *rel.split("/"))
+        if os.path.isfile(target) and os.path.getsize(target) == f["size"] and _sha256(target) == f["sha256"]:
+            continue
+        _copy_atomic(_blob_path(backup_dir, f["sha256"]), target)
+        restored += 1
+    return {"id": backup_id, "integrity": check, "files": len(manifest["files"]), "restored_files": restored}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sigurnosne kopije baze i priloga (SQLite backup API).")
+    ap.add_argument("--db", default=DB_PATH, help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    ap.add_argument("--uploads", default=UPLOAD_DIR, help="mapa priloga (zadano HK_UPLOAD_DIR / uploads)")
+    ap.add_argument("--dir", default=BACKUP_DIR, help="mapa kopija (zadano HK_BACKUP_DIR / backups)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    cp = sub.add_parser("create", help="nova kopija (i rotacija)")
+    cp.add_argument("--no-rotate", action="store_true")
+    sub.add_parser("list", help="popis kopija")
+    pp = sub.add_parser("prune", help="samo rotacija")
+    pp.add_argument("--keep-last", type=int, default=KEEP_LAST)
+    pp.add_argument("--keep-weekly", type=int, default=KEEP_WEEKLY)
+    pp.add_argument("--keep-monthly", type=int, default=KEEP_MONTHLY)
+    rp = sub.add_parser("restore", help="vrati bazu i priloge iz kopije")
+    rp.add_argument("id", help="oznaka kopije (python -m hk.backup list)")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.cmd == "create":
+            m = create_backup(args.db, args.uploads, args.dir, rotate=not args.no_rotate)
+            print(f"Kopija {m['id']}: baza {m['db']['pages']} stranica u {m['db']['steps']} koraka "
+                  f"({m['db']['ms']} ms, integrity_check {m['db']['integrity']}); prilozi {len(m['files'])}, "
+                  f"novih {m['uploads']['copied']} ({m['uploads']['copied_bytes']} B)")
+            if m.get("removed"):
+                print("Uklonjene kopije:", ", ".join(m["removed"]))
+        elif args.cmd == "list":
+            for m in list_backups(args.dir):
+                print(f"{m['id']}  {m['created']}  baza {m['db']['size']} B  prilozi {len(m['files'])}")
+        elif args.cmd == "prune":
+            removed = prune(args.dir, args.keep_last, args.keep_weekly, args.keep_monthly)
+            print("Uklonjene kopije:", ", ".join(removed) or "nijedna")
+        else:
+            r = restore(args.id, args.db, args.uploads, args.dir)
+            print(f"Vraćena kopija {r['id']} (integrity_check {r['integrity']}); "
+                  f"prilozi {r['files']}, vraćeno {r['restored_files']}")
+    except (OSError, ValueError) as e:
+        print(f"Greška: {e}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
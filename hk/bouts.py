@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Borbe po protivniku: tablica bouts iz competition_results.opponent_list.
+
+opponent_list je slobodan tekst – JSON, pseudo-JSON s jednostrukim
+navodnicima (kao u Excel predlošku) ili retci "Ime Prezime, Klub, win".
+parse_opponents() čita sve te oblike; svaka borba je jedan redak
+(result_id, member_id, opponent_name, opponent_club, outcome) s indeksima
+po protivniku, klubu i sportašu, pa su pitanja "kako naš sportaš stoji
+protiv X" i "od kojih klubova gubimo" pretraga po indeksu.
+
+Okidači na competition_results upisuju promijenjene rezultate u
+bouts_dirty (svaki put upisa: obrasci, Excel, pisač, naredbeni redak);
+refresh() ih parsira prije upita. Brisanje rezultata briše i borbe.
+
+▶ Ručno punjenje i provjera:
+    python -m hk.bouts refresh --db hk_podravka.db
+    python -m hk.bouts h2h "Horvat" --db hk_podravka.db
+"""
+
+import argparse
+import ast
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+Bout = Tuple[str, str, Optional[str]]   # (protivnik, klub, "win"/"lose"/None)
+
+NAME_KEYS = ("name", "ime", "ime_prezime", "protivnik", "opponent")
+CLUB_KEYS = ("club", "klub", "team", "ekipa")
+RESULT_KEYS = ("result", "rezultat", "ishod", "outcome", "win/lose")
+OUTCOMES = {
+    "win": "win", "w": "win", "won": "win", "pobjeda": "win", "pob": "win", "v": "win", "1": "win", "true": "win",
+    "lose": "lose", "loss": "lose", "lost": "lose", "l": "lose", "poraz": "lose", "0": "lose", "false": "lose",
+}
+_SPLIT_ROWS = re.compile(r"[;\n]+")
+_SPLIT_FIELDS = re.compile(r"\s*(?:,|\||\s-\s|\t)\s*")
+_PAREN = re.compile(r"^(.*?)\s*\(([^)]*)\)\s*(.*)$")
+
+
+# ==========================
+# PARSIRANJE
+# ==========================
+def outcome(value) -> Optional[str]:
+    if isinstance(value, bool):
+        return "win" if value else "lose"
+    return OUTCOMES.get(str(value or "").strip().lower().rstrip("."))
+
+
+def opponent_key(name: str) -> str:
+    """Ključ za pretragu: mala slova, bez dijakritika (đ → d), jedan razmak."""
+    s = unicodedata.normalize("NFKD", name.replace("đ", "d").replace("Đ", "D"))
+    return " ".join("".join(c for c in s if not unicodedata.combining(c)).lower().split())
+
+
+def _first(d: dict, keys: Iterable[str]):
+    for k in keys:
+        if d.get(k) not in (None, ""):
+            return d[k]
+    return ""
+
+
+def _parse_line(line: str) -> tuple:
+    """"Ime Prezime, Klub, win" / "Ime Prezime (Klub) win" / "Ime - Klub - W"."""
+    m = _PAREN.match(line.strip())
+    if m:
+        return m.group(1), m.group(2), m.group(3)
+    parts = _SPLIT_FIELDS.split(line.strip())
+    if len(parts) == 2 and outcome(parts[1]):
+        return parts[0], "", parts[1]
+    return tuple(parts[:3])
+
+
+def parse_opponents(text) -> List[Bout]:
+    """Borbe iz opponent_list; neprepoznatljiv tekst daje praznu listu, ne grešku."""
+    s = str(text or "").strip()
+    if not s or s.lower() in ("nan", "none", "[]"):
+        return []
+    data = None
+    for load in (json.loads, ast.literal_eval):
+        try:
+            data = load(s)
+            break
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+    if data is None or isinstance(data, str):
+        data = [_parse_line(line) for line in _SPLIT_ROWS.split(s if data is None else data) if line.strip()]
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, (list, tuple)):
+        return []
+
+    out: List[Bout] = []
+    for item in data:
+        if isinstance(item, dict):
+            low = {str(k).strip().lower(): v for k, v in item.items()}
+            name, club, res = _first(low, NAME_KEYS), _first(low, CLUB_KEYS), _first(low, RESULT_KEYS)
+        elif isinstance(item, (list, tuple)):
+            name, club, res = (list(item) + ["", "", ""])[:3]
+        elif isinstance(item, str):
+            name, club, res = (list(_parse_line(item)) + ["", "", ""])[:3]
+        else:
+            continue
+        name = " ".join(str(name or "").split())
+        if name:
+            out.append((name, " ".join(str(club or "").split()), outcome(res)))
+    return out
+
+
+# ==========================
+# SHEMA I SINKRONIZACIJA
+# ==========================
+def ensure_bouts(conn: sqlite3.Connection):
+    """Tablica, indeksi i okidači; pri prvom stvaranju puni se iz postojećih rezultata (poziva init_db)."""
+    new = not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='bouts'").fetchone()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS bouts (
+            id INTEGER PRIMARY KEY,
+            result_id INTEGER NOT NULL REFERENCES competition_results(id) ON DELETE CASCADE,
+            member_id INTEGER,
+            opponent_name TEXT NOT NULL,
+            opponent_key TEXT NOT NULL,
+            opponent_club TEXT NOT NULL DEFAULT '',
+            outcome TEXT CHECK (outcome IN ('win','lose'))
+        );
+        CREATE INDEX IF NOT EXISTS ix_bouts_result ON bouts(result_id);
+        CREATE INDEX IF NOT EXISTS ix_bouts_opponent ON bouts(opponent_key, outcome);
+        CREATE INDEX IF NOT EXISTS ix_bouts_member_opponent ON bouts(member_id, opponent_key);
+        CREATE INDEX IF NOT EXISTS ix_bouts_club ON bouts(opponent_club COLLATE NOCASE, outcome);
+
+        -- rezultati čije borbe treba ponovno parsirati (refresh)
+        CREATE TABLE IF NOT EXISTS bouts_dirty (result_id INTEGER PRIMARY KEY);
+        CREATE TRIGGER IF NOT EXISTS tr_results_bouts_ins AFTER INSERT ON competition_results
+        BEGIN INSERT OR IGNORE INTO bouts_dirty(result_id) VALUES (new.id); END;
+        CREATE TRIGGER IF NOT EXISTS tr_results_bouts_upd AFTER UPDATE OF opponent_list, member_id ON competition_results
+        BEGIN INSERT OR IGNORE INTO bouts_dirty(result_id) VALUES (new.id); END;
+        CREATE TRIGGER IF NOT EXISTS tr_results_bouts_del AFTER DELETE ON competition_results
+        BEGIN DELETE FROM bouts WHERE result_id=old.id; DELETE FROM bouts_dirty WHERE result_id=old.id; END;
+    """)
+    if new:
+        conn.execute("""INSERT OR IGNORE INTO bouts_dirty(result_id)
+                        SELECT id FROM competition_results WHERE COALESCE(opponent_list,'') <> ''""")
+        refresh(conn)
+
+
+def _sync(conn: sqlite3.Connection, ids: List[int]) -> int:
+    rows = []
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        for rid, mid, text in conn.execute(
+                f"SELECT id, member_id, opponent_list FROM competition_results WHERE id IN ({marks})", chunk):
+            rows += [(rid, mid, name, opponent_key(name), club, res) for name, club, res in parse_opponents(text)]
+        conn.execute(f"DELETE FROM bouts WHERE result_id IN ({marks})", chunk)
+        conn.execute(f"DELETE FROM bouts_dirty WHERE result_id IN ({marks})", chunk)
+    conn.executemany("""INSERT INTO bouts(result_id, member_id, opponent_name, opponent_key, opponent_club, outcome)
+                        VALUES (?,?,?,?,?,?)""", rows)
+    return len(rows)
+
+
+def refresh(conn: sqlite3.Connection) -> int:
+    """Parsiraj rezultate iz bouts_dirty; bez promjena je to jedan upit nad praznom tablicom."""
+    from hk.sequence import run_immediate
+
+    if not conn.execute("SELECT 1 FROM bouts_dirty LIMIT 1").fetchone():
+        return 0
+    return run_immediate(conn, lambda c: _sync(c, [r[0] for r in c.execute("SELECT result_id FROM bouts_dirty")]))
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Sve borbe ponovno iz opponent_list (npr. nakon izmjene parsera)."""
+    from hk.sequence import run_immediate
+
+    def work(c):
+        c.execute("DELETE FROM bouts")
+        c.execute("""INSERT OR IGNORE INTO bouts_dirty(result_id)
+                     SELECT id FROM competition_results WHERE COALESCE(opponent_list,'') <> ''""")
+        return _sync(c, [r[0] for r in c.execute("SELECT result_id FROM bouts_dirty")])
+    return run_immediate(conn, work)
+
+
+# ==========================
+# MEĐUSOBNI OMJERI
+# ==========================
+def opponents(conn: sqlite3.Connection, search: str = "", member_id: Optional[int] = None,
+              limit: int = 50) -> pd.DataFrame:
+    """Protivnici s brojem borbi i omjerom; search = dio imena (bez obzira na dijakritike)."""
+    where, params = [], []
+    if search.strip():
+        # dio imena ili prezimena; ključ je već bez dijakritika i velikih slova
+        key = opponent_key(search).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append("b.opponent_key LIKE ? ESCAPE '\\'")
+        params.append(f"%{key}%")
+    if member_id:
+        where.append("b.member_id = ?")
+        params.append(int(member_id))
+    sql = f"""
+        SELECT MIN(b.opponent_name) AS protivnik, MAX(b.opponent_club) AS klub, COUNT(*) AS borbi,
+               SUM(b.outcome='win') AS pobjede, SUM(b.outcome='lose') AS porazi, b.opponent_key AS ključ
+        FROM bouts b {'WHERE ' + ' AND '.join(where) if where else ''}
+        GROUP BY b.opponent_key
+        ORDER BY borbi DESC, protivnik
+        LIMIT ?"""
+    return pd.read_sql_query(sql, conn, params=params + [limit])
+
+
+def head_to_head(conn: sqlite3.Connection, opponent: str, member_id: Optional[int] = None) -> pd.DataFrame:
+    """Sve borbe protiv jednog protivnika (ključ ili ime), najnovije prve."""
+    params = [opponent_key(opponent)]
+    extra = ""
+    if member_id:
+        extra = " AND b.member_id = ?"
+        params.append(int(member_id))
+    return pd.read_sql_query(f"""
+        SELECT c.date_from AS datum, c.name AS natjecanje, m.full_name AS sportaš,
+               b.opponent_name AS protivnik, b.opponent_club AS klub, b.outcome AS ishod
+        FROM bouts b
+        JOIN competition_results cr ON cr.id = b.result_id
+        JOIN competitions c ON c.id = cr.competition_id
+        LEFT JOIN members m ON m.id = b.member_id
+        WHERE b.opponent_key = ?{extra}
+        ORDER BY c.date_from DESC""", conn, params=params)
+
+
+def club_record(conn: sqlite3.Connection, member_id: Optional[int] = None, min_bouts: int = 1) -> pd.DataFrame:
+    """Omjer po klubu protivnika – najviše poraza prvi ("od kojih klubova gubimo")."""
+    where, params = "b.opponent_club <> ''", []
+    if member_id:
+        where += " AND b.member_id = ?"
+        params.append(int(member_id))
+    return pd.read_sql_query(f"""
+        SELECT b.opponent_club AS klub, COUNT(*) AS borbi,
+               SUM(b.outcome='win') AS pobjede, SUM(b.outcome='lose') AS porazi,
+               ROUND(100.0 * SUM(b.outcome='lose') / COUNT(*), 1) AS postotak_poraza
+        FROM bouts b
+        WHERE {where}
+        GROUP BY b.opponent_club COLLATE NOCASE
+        HAVING COUNT(*) >= ?
+        ORDER BY porazi DESC, postotak_poraza DESC""", conn, params=params + [min_bouts])
+
+
+def main(argv=None):
+    from hk.db import get_conn, init_db
+
+    ap = argparse.ArgumentParser(description="Borbe po protivniku iz opponent_list.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("refresh", help="parsiraj promijenjene rezultate")
+    sub.add_parser("rebuild", help="sve borbe ponovno iz opponent_list")
+    hp = sub.add_parser("h2h", help="protivnici po dijelu imena i borbe protiv prvog")
+    hp.add_argument("search")
+    sub.add_parser("clubs", help="omjer po klubu protivnika")
+    args = ap.parse_args(argv)
+
+    init_db(args.db)
+    conn = get_conn(args.db)
+    t0 = time.perf_counter()
+    if args.cmd in ("refresh", "rebuild"):
+        n = refresh(conn) if args.cmd == "refresh" else rebuild(conn)
+        print(f"Upisano borbi: {n} ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+    elif args.cmd == "h2h":
+        refresh(conn)
+        opp = opponents(conn, args.search)
+        print(opp.to_string(index=False))
+        if not opp.empty:
+            print(head_to_head(conn, opp.iloc[0]["ključ"]).to_string(index=False))
+        print(f"({(time.perf_counter() - t0) * 1000:.1f} ms)")
+    else:
+        refresh(conn)
+        print(club_record(conn, min_bouts=3).to_string(index=False))
+        print(f"({(time.perf_counter() - t0) * 1000:.1f} ms)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Pripreme reprezentacije: upis sudjelovanja (UPSERT po pripremi i sportašu)
+i sezonski izvještaj – ukupno priprema, treninga i sati po sportašu –
+jednim agregatnim upitom.
+"""
+
+import sqlite3
+from datetime import date
+from typing import List, Sequence, Tuple
+
+import pandas as pd
+
+CAMP_ATTENDANCE_UPSERT = """
+    INSERT INTO camp_attendance (camp_id, member_id, trainings, hours) VALUES (?,?,?,?)
+    ON CONFLICT(camp_id, member_id) DO UPDATE SET trainings=excluded.trainings, hours=excluded.hours
+"""
+
+
+def season_label(start_year: int) -> str:
+    return f"{start_year}/{start_year + 1}"
+
+
+def camp_seasons(conn: sqlite3.Connection) -> List[int]:
+    """Početne godine sezona (rujan–kolovoz) u kojima postoje pripreme, najnovije prve."""
+    return [r[0] for r in conn.execute("""
+        SELECT DISTINCT CAST(substr(start_date,1,4) AS INTEGER) - (CAST(substr(start_date,6,2) AS INTEGER) < 9)
+        FROM camps WHERE start_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*' ORDER BY 1 DESC""").fetchall()]
+
+
+def camp_season_report(conn: sqlite3.Connection, start_year: int) -> pd.DataFrame:
+    """Sportaši na pripremama u sezoni start_year/start_year+1 (indeks na camps.start_date)."""
+    return pd.read_sql_query("""
+        SELECT m.full_name AS sportaš, g.name AS grupa,
+               COUNT(*) AS priprema, SUM(ca.trainings) AS treninga, ROUND(SUM(ca.hours), 1) AS sati,
+               MIN(c.start_date) AS prve, MAX(c.end_date) AS zadnje
+        FROM camps c
+        JOIN camp_attendance ca ON ca.camp_id = c.id
+        JOIN members m ON m.id = ca.member_id
+        LEFT JOIN groups g ON g.id = m.group_id
+        WHERE c.start_date >= ? AND c.start_date < ?
+        GROUP BY ca.member_id
+        ORDER BY sati DESC, sportaš
+    """, conn, params=(date(start_year, 9, 1).isoformat(), date(start_year + 1, 9, 1).isoformat()))
+
+
+def upsert_rows(camp_id: int, member_ids: Sequence[int], trainings: int, hours: float) -> List[Tuple]:
+    return [(int(camp_id), int(mid), int(trainings), float(hours)) for mid in member_ids]
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Naredbeni redak za uvoz, izvoz i izvještaje (bez Streamlita i preglednika).
+
+▶ Primjeri:
+    python -m hk import members clanovi.xlsx
+    python -m hk export results --year 2025 -o rezultati_2025.xlsx
+    python -m hk report camps --season 2024
+    python -m hk report expiry --days 30 --format eml --out izvjestaji
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+
+from hk import dataio
+
+
+def _timed(label: str, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return out
+
+
+def cmd_import(args, conn):
+    from hk.sequence import run_immediate
+
+    df = _timed(f"Učitano {args.file}", lambda: dataio.read_table(args.file))
+    importer = dataio.IMPORTERS[args.kind]
+    n = _timed(f"Uvoz {args.kind}: {len(df)} redaka u tablici",
+               lambda: run_immediate(conn, lambda c: importer(c, df)))
+    print(f"Upisano redaka: {n}")
+
+
+def cmd_export(args, conn):
+    export, sheet = dataio.EXPORTERS[args.kind]
+    df = _timed(f"Upit {args.kind}", lambda: export(conn, args.year) if args.kind == "results" else export(conn))
+    path = args.output or dataio.default_export_path(args.kind, args.year)
+    _timed(f"Zapisano {len(df)} redaka u {path}", lambda: dataio.write_table(df, path, sheet))
+
+
+def cmd_report(args, conn):
+    if args.name == "camps":
+        from hk.camps import camp_season_report, camp_seasons, season_label
+        season = args.season or (camp_seasons(conn) or [date.today().year])[0]
+        df = _timed(f"Pripreme {season_label(season)}", lambda: camp_season_report(conn, season))
+        path = args.output or f"pripreme_{season}-{season + 1}.xlsx"
+        _timed(f"Zapisano {len(df)} redaka u {path}", lambda: dataio.write_table(df, path, "Pripreme"))
+    elif args.name == "expiry":
+        from hk.expiry import write_digest
+        path = _timed("Pregled isteka", lambda: write_digest(conn, args.out, args.days, args.format))
+        print(path)
+    elif args.name == "attendance":
+        from hk.analytics import compute
+        res = _timed("Analitika prisustva", lambda: compute(conn, args.window))
+        path = args.output or f"prisustvo_{res['od']}_{res['do']}.xlsx"
+        df = res["sportasi"].merge(res["grupe"][["grupa", "postotak"]].rename(columns={"postotak": "postotak_grupe"}),
+                                   on="grupa", how="left")
+        _timed(f"Zapisano {len(df)} redaka u {path}", lambda: dataio.write_table(df, path, "Prisustvo"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="hk", description="HK Podravka – uvoz, izvoz i izvještaji.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("import", help="uvoz iz Excela/CSV-a po predlošku")
+    p.add_argument("kind", choices=list(dataio.IMPORTERS))
+    p.add_argument("file")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="izvoz u Excel/CSV")
+    p.add_argument("kind", choices=list(dataio.EXPORTERS))
+    p.add_argument("--year", type=int, help="samo natjecanja te godine (rezultati)")
+    p.add_argument("-o", "--output", help="datoteka (.xlsx ili .csv)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("report", help="izvještaji")
+    p.add_argument("name", choices=["camps", "expiry", "attendance"])
+    p.add_argument("--season", type=int, help="početna godina sezone (pripreme)")
+    p.add_argument("--days", type=int, default=30, help="istek: broj dana unaprijed")
+    p.add_argument("--format", choices=["csv", "eml"], default="csv")
+    p.add_argument("--out", default="izvjestaji", help="istek: mapa za pregled")
+    p.add_argument("--window", choices=["sezona", "4t"], default="sezona")
+    p.add_argument("-o", "--output", help="datoteka (.xlsx ili .csv)")
+    p.set_defaults(func=cmd_report)
+    return ap
+
+
+def main(argv=None):
+    from hk.db import get_conn, get_read_conn, init_db
+
+    args = build_parser().parse_args(argv)
+    init_db(args.db)
+    # izvoz i izvještaji samo čitaju – ne smiju zadržavati upis iz web aplikacije
+    conn = get_read_conn(args.db) if args.cmd in ("export", "report") else get_conn(args.db)
+    try:
+        args.func(args, conn)
+    except (OSError, ValueError) as e:
+        print(f"Greška: {e}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
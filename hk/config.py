@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Podaci kluba i putanje zajednički za web aplikaciju i skripte."""
+
+import os
+
+KLUB_NAZIV  = "Hrvački klub Podravka"
+KLUB_EMAIL  = "hsk-podravka@gmail.com"
+KLUB_ADRESA = "Miklinovec 6a, 48000 Koprivnica"
+KLUB_OIB    = "60911784858"
+KLUB_WEB    = "https://hk-podravka.com"
+KLUB_IBAN   = "HR6923860021100518154"
+
+# Opcije natjecanja i treninga
+KINDS = [
+    "PRVENSTVO HRVATSKE","MEĐUNARODNI TURNIR","REPREZENTATIVNI NASTUP",
+    "HRVAČKA LIGA ZA SENIORE","MEĐUNARODNA HRVAČKA LIGA ZA KADETE",
+    "REGIONALNO PRVENSTVO","LIGA ZA DJEVOJČICE","OSTALO"
+]
+REP_SUB = ["PRVENSTVO EUROPE","PRVENSTVO SVIJETA","PRVENSTVO BALKANA","UWW TURNIR"]
+STYLES = ["GR","FS","WW","BW","MODIFICIRANO"]
+AGES = ["POČETNICI","U11","U13","U15","U17","U20","U23","SENIORI"]
+LOCATIONS = ["DVORANA SJEVER", "IGRALIŠTE ANG", "IGRALIŠTE SREDNJA", "Drugo (upiši)"]
+
+# Putanje se mogu preusmjeriti varijablama okruženja (npr. za testove opterećenja)
+DB_PATH     = os.environ.get("HK_DB_PATH", "hk_podravka.db")
+UPLOAD_DIR  = os.environ.get("HK_UPLOAD_DIR", "uploads")
+BACKUP_DIR  = os.environ.get("HK_BACKUP_DIR", "backups")
+
+# Statistika: "sqlite" (zadano) ili "duckdb" (hk/olap.py; opcionalni paket duckdb)
+STATS_ENGINE       = os.environ.get("HK_STATS_ENGINE", "sqlite")
+STATS_SNAPSHOT_DIR = os.environ.get("HK_STATS_SNAPSHOT_DIR", "")   # Parquet snimka umjesto ATTACH
+
+# Izvještaji, statistika i izvozi čitaju preko zasebne konekcije samo za čitanje (0 = ista kao obrasci)
+REPORT_READONLY = os.environ.get("HK_REPORT_RO", "1") != "0"
+
+# Održavanje baze (hk/maintenance.py) pri pokretanju aplikacije kad je zadnje starije od N dana
+MAINTENANCE_DAYS = float(os.environ.get("HK_MAINT_DAYS", "7"))
+
+BUSY_TIMEOUT_MS = 5000   # koliko dugo konekcija čeka zaključanu bazu
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Uvoz i izvoz podataka (članovi, treneri, rezultati, grupe) bez Streamlita.
+
+Odjeljci web aplikacije i naredbeni redak (hk/cli.py) koriste iste
+funkcije. Uvoz čita tablicu po predlošku i upisuje skupno (executemany,
+jedan dohvat šifrarnika umjesto upita po retku) kroz repozitorije
+(hk/repos.py), iste naredbe kao i obrasci; pozivatelj ga izvodi u
+jednoj transakciji (run_immediate). Izvoz vraća DataFrame spreman za Excel.
+"""
+
+import io
+import os
+from datetime import date, datetime
+from typing import Optional
+
+import pandas as pd
+
+from hk.expiry import to_iso_date
+from hk.profiler import profiled
+from hk.repos import CompetitionsRepo, Member, MembersRepo, Result, ResultsRepo
+
+
+# ==========================
+# PREDLOŠCI I EXCEL
+# ==========================
+def members_template_df() -> pd.DataFrame:
+    return pd.DataFrame([{
+        "ime":"", "prezime":"", "ime_prezime":"",
+        "datum_rođenja":"", "spol(M/Ž)":"",
+        "oib":"", "ulica":"", "grad":"", "poštanski_broj":"",
+        "email_sportaša":"", "email_roditelja":"",
+        "telefon_sportaša":"", "telefon_roditelja":"",
+        "osobna_broj":"", "osobna_izdavatelj":"", "osobna_vrijedi_do":"",
+        "putovnica_broj":"", "putovnica_izdavatelj":"", "putovnica_vrijedi_do":"",
+        "aktivni_natjecatelj(0/1)":"", "veteran(0/1)":"", "ostalo(0/1)":"",
+        "članarina_EUR":"30", "grupa":"", "napomena":""
+    }])
+
+
+def coaches_template_df() -> pd.DataFrame:
+    return pd.DataFrame([{
+        "ime":"", "prezime":"", "ime_prezime":"",
+        "datum_rođenja":"", "oib":"", "email":"", "iban":"", "grupa":""
+    }])
+
+
+def comp_results_template_df() -> pd.DataFrame:
+    return pd.DataFrame([{
+        "natjecanje_id":"", "clan(ime_prezime)":"",
+        "kategorija":"", "stil":"", "ukupno_borbi":"",
+        "pobjede":"", "porazi":"", "plasman(1-100)":"",
+        "protivnici(JSON)":"[{'name':'Ime Prezime','club':'Klub','result':'win/lose'}]",
+        "napomena":""
+    }])
+
+
+@profiled()
+def excel_bytes_from_df(df: pd.DataFrame, sheet_name: str = "Sheet1") -> bytes:
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def read_table(source) -> pd.DataFrame:
+    """Excel (uploadana datoteka ili putanja) ili CSV po nastavku imena."""
+    name = getattr(source, "name", source if isinstance(source, str) else "")
+    if str(name).lower().endswith(".csv"):
+        return pd.read_csv(source, dtype=str).fillna("")
+    return pd.read_excel(source).fillna("")
+
+
+def write_table(df: pd.DataFrame, path: str, sheet_name: str = "Sheet1"):
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    else:
+        with open(path, "wb") as f:
+            f.write(excel_bytes_from_df(df, sheet_name))
+
+
+def fmt_dates(col: pd.Series) -> pd.Series:
+    """Stupac datuma kao dd.mm.yyyy.; neprepoznate vrijednosti ostaju kako jesu."""
+    parsed = pd.to_datetime(col.where(col.fillna("") != ""), errors="coerce", format="mixed")
+    return parsed.dt.strftime("%d.%m.%Y.").fillna(col.fillna("").astype(str))
+
+
+def _text(r, key) -> str:
+    v = r.get(key, "")
+    return v if isinstance(v, str) else ("" if v is None else str(v))
+
+
+def _int(v) -> int:
+    try:
+        return int(float(v or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _group_ids(conn) -> dict:
+    return dict(conn.execute("SELECT name, id FROM groups").fetchall())
+
+
+# ==========================
+# UVOZ
+# ==========================
+def import_members(conn, df: pd.DataFrame) -> int:
+    gids = _group_ids(conn)
+    rows = []
+    for r in df.to_dict("records"):
+        t = {k: _text(r, k) for k in ("ime", "prezime", "ulica", "grad", "poštanski_broj")}
+        rows.append(Member(
+            full_name=_text(r, "ime_prezime") or f"{t['ime']} {t['prezime']}".strip(),
+            first_name=t["ime"], last_name=t["prezime"], dob=to_iso_date(r.get("datum_rođenja", "")),
+            gender=_text(r, "spol(M/Ž)"), oib=_text(r, "oib"),
+            street=t["ulica"], city=t["grad"], postal_code=t["poštanski_broj"],
+            residence=f"{t['ulica']}, {t['grad']} {t['poštanski_broj']}",
+            athlete_email=_text(r, "email_sportaša"), parent_email=_text(r, "email_roditelja"),
+            athlete_phone=_text(r, "telefon_sportaša"), parent_phone=_text(r, "telefon_roditelja"),
+            parent_name=_text(r, "roditelj_ime_prezime"),
+            id_card_number=_text(r, "osobna_broj"), id_card_issuer=_text(r, "osobna_izdavatelj"),
+            id_card_valid_until=to_iso_date(r.get("osobna_vrijedi_do", "")),
+            passport_number=_text(r, "putovnica_broj"), passport_issuer=_text(r, "putovnica_izdavatelj"),
+            passport_valid_until=to_iso_date(r.get("putovnica_vrijedi_do", "")),
+            active_competitor=_int(r.get("aktivni_natjecatelj(0/1)")), veteran=_int(r.get("veteran(0/1)")),
+            other_flag=_int(r.get("ostalo(0/1)")), membership_fee_eur=float(r.get("članarina_EUR", 0) or 0),
+            group_id=gids.get(_text(r, "grupa"))))
+    return MembersRepo(conn).insert_many(rows)
+
+
+def import_coaches(conn, df: pd.DataFrame) -> int:
+    gids = _group_ids(conn)
+    now = datetime.now().isoformat()
+    links = []
+    cur = conn.cursor()
+    for r in df.to_dict("records"):
+        full_name = _text(r, "ime_prezime") or f"{_text(r, 'ime')} {_text(r, 'prezime')}".strip()
+        cur.execute("""INSERT INTO coaches (full_name,first_name,last_name,dob,oib,email,iban)
+                       VALUES (?,?,?,?,?,?,?)""",
+                    (full_name, _text(r, "ime"), _text(r, "prezime"), to_iso_date(r.get("datum_rođenja", "")),
+                     _text(r, "oib"), _text(r, "email"), _text(r, "iban")))
+        gid = gids.get(_text(r, "grupa"))
+        if gid:
+            links.append((cur.lastrowid, gid, now))
+    cur.executemany("INSERT INTO coach_groups (coach_id,group_id,assigned_at) VALUES (?,?,?)", links)
+    return len(df)
+
+
+def import_results(conn, df: pd.DataFrame) -> int:
+    """Redci bez postojećeg natjecanja ili člana (po imenu) se preskaču."""
+    mids = MembersRepo(conn).name_ids()
+    comps = CompetitionsRepo(conn).ids()
+    rows = []
+    for r in df.to_dict("records"):
+        cid = _int(r.get("natjecanje_id"))
+        mid = mids.get(_text(r, "clan(ime_prezime)"))
+        if cid in comps and mid:
+            rows.append(Result(competition_id=cid, member_id=mid, weight_category=_text(r, "kategorija"),
+                               style=_text(r, "stil"), bouts_total=_int(r.get("ukupno_borbi")),
+                               wins=_int(r.get("pobjede")), losses=_int(r.get("porazi")),
+                               placement=_int(r.get("plasman(1-100)")),
+                               opponent_list=str(r.get("protivnici(JSON)", "")), notes=_text(r, "napomena")))
+    return ResultsRepo(conn).insert_many(rows)
+
+
+def import_groups(conn, df: pd.DataFrame) -> int:
+    names = [(str(n).strip(),) for n in df.get("name", pd.Series(dtype=str)) if str(n).strip()]
+    cur = conn.executemany("INSERT OR IGNORE INTO groups(name) VALUES (?)", names)
+    return max(cur.rowcount, 0)
+
+
+# ==========================
+# IZVOZ
+# ==========================
+def export_members(conn, group_id: Optional[int] = None) -> pd.DataFrame:
+    """Popis članova (svi ili jedne grupe) – datumi dd.mm.yyyy., starost (godine, dani), R.br. od 1."""
+    mdf = pd.read_sql_query(f"""
+        SELECT m.id, m.full_name AS ime_prezime, m.first_name AS ime, m.last_name AS prezime,
+               m.gender AS spol, m.oib, m.street AS ulica, m.city AS grad, m.postal_code AS poštanski_broj,
+               m.athlete_email, m.parent_email, m.athlete_phone, m.parent_phone, m.parent_name,
+               m.active_competitor AS aktivni, m.veteran,
+               m.membership_fee_eur AS članarina, m.medical_valid_until AS liječnička_do, m.dob,
+               g.name AS grupa
+        FROM members m LEFT JOIN groups g ON m.group_id=g.id
+        {"WHERE m.group_id=?" if group_id else ""}
+        ORDER BY m.full_name
+    """, conn, params=(int(group_id),) if group_id else ())
+    if not mdf.empty:
+        dob = pd.to_datetime(mdf["dob"].where(mdf["dob"].fillna("") != ""), errors="coerce", format="mixed")
+        days = (pd.Timestamp(date.today()) - dob).dt.days
+        ages = [f"{int(d) // 365} godina, {int(d) - int(d) // 365 * 365} dana" if pd.notna(d) else "" for d in days]
+        mdf.insert(0, "R.br.", range(1, len(mdf) + 1))
+        mdf["dob"] = fmt_dates(mdf["dob"])
+        mdf["liječnička_do"] = fmt_dates(mdf["liječnička_do"])
+        mdf.insert(3, "starost", ages)
+    return mdf
+
+
+def export_results(conn, year: Optional[int] = None) -> pd.DataFrame:
+    q = """
+        SELECT cr.id, c.name AS natjecanje, c.date_from AS datum, m.full_name AS sportaš,
+               cr.weight_category AS kategorija, cr.style AS stil,
+               cr.bouts_total AS borbi, cr.wins AS pobjede, cr.losses AS porazi, cr.placement AS plasman
+        FROM competition_results cr
+        JOIN competitions c ON c.id=cr.competition_id
+        LEFT JOIN members m ON m.id=cr.member_id
+    """
+    params: list = []
+    if year:
+        q += " WHERE c.date_from >= ? AND c.date_from < ?"
+        params = [f"{int(year)}-01-01", f"{int(year) + 1}-01-01"]
+    res_all = pd.read_sql_query(q + " ORDER BY c.date_from DESC", conn, params=params)
+    # formatiraj datum i redni broj za prikaz i export
+    if not res_all.empty:
+        try:
+            res_all['datum'] = pd.to_datetime(res_all['datum']).dt.strftime('%d.%m.%Y.')
+        except Exception:
+            pass
+        res_all.insert(0, 'R.br.', range(1, len(res_all)+1))
+    return res_all
+
+
+def export_coaches(conn) -> pd.DataFrame:
+    return pd.read_sql_query("SELECT id, full_name AS ime_prezime, dob, email, iban FROM coaches", conn)
+
+
+def export_groups(conn) -> pd.DataFrame:
+    return pd.read_sql_query("SELECT id, name FROM groups", conn)
+
+
+IMPORTERS = {"members": import_members, "coaches": import_coaches,
+             "results": import_results, "groups": import_groups}
+EXPORTERS = {"members": (export_members, "Clanovi"), "coaches": (export_coaches, "Treneri"),
+             "results": (export_results, "Rezultati"), "groups": (export_groups, "Grupe")}
+
+
+def default_export_path(kind: str, year: Optional[int] = None, ext: str = ".xlsx") -> str:
+    names = {"members": "clanovi", "coaches": "treneri", "results": "rezultati", "groups": "grupe"}
+    return os.path.join(os.getcwd(), f"{names[kind]}{f'_{year}' if year else ''}{ext}")
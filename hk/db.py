@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""Shema baze i otvaranje konekcije (bez ovisnosti o Streamlitu)."""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+from urllib.request import pathname2url
+
+from hk.config import (DB_PATH, BUSY_TIMEOUT_MS, KLUB_NAZIV, KLUB_EMAIL, KLUB_ADRESA,
+                       KLUB_OIB, KLUB_WEB, KLUB_IBAN, REPORT_READONLY)
+from hk.bouts import ensure_bouts
+from hk.expiry import ensure_expiry_indexes
+from hk.profiler import connection_factory
+from hk.ratings import ensure_ratings
+from hk.schedule import normalize_session_timestamps
+
+
+def fold(value) -> Optional[str]:
+    """Tekst za pretragu bez obzira na velika/mala slova – i za Š/Ž/Đ (SQLite LIKE to radi samo za ASCII).
+
+    Registrira se kao SQL funkcija hk_fold (SQLite i DuckDB, hk/olap.py), pa oba izvora
+    statistike za isti filtar vraćaju iste retke.
+    """
+    return None if value is None else str(value).casefold()
+
+
+def get_conn(db_path: Optional[str] = None):
+    # uz aktivan profil (hk/profiler.py) konekcija mjeri svaku naredbu
+    conn = sqlite3.connect(db_path or DB_PATH, check_same_thread=False, factory=connection_factory())
+    conn.create_function("hk_fold", 1, fold, deterministic=True)
+    conn.execute("PRAGMA foreign_keys = ON")
+    # čekaj na tuđi upis umjesto trenutnog "database is locked"
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return conn
+
+def get_read_conn(db_path: Optional[str] = None):
+    """Konekcija za izvještaje, statistiku i izvoze: file: URI s mode=ro i query_only.
+
+    U WAL načinu čitanje ne čeka upise, a ova konekcija nikad ne uzima zaključavanje
+    za pisanje. S HK_REPORT_RO=0 vraća običnu konekciju (usporedba u hk.loadtest).
+    """
+    if not REPORT_READONLY:
+        return get_conn(db_path)
+    uri = "file:" + pathname2url(os.path.abspath(db_path or DB_PATH)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=connection_factory())
+    conn.create_function("hk_fold", 1, fold, deterministic=True)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return conn
+
+@contextmanager
+def read_snapshot(conn):
+    """Svi upiti unutar bloka vide isto stanje baze (jedna WAL transakcija čitanja)."""
+    conn.execute("BEGIN")
+    try:
+        # snimka se fiksira prvim čitanjem, ne naredbom BEGIN
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        yield conn
+    finally:
+        conn.rollback()
+
+def init_db(db_path: Optional[str] = None):
+    conn = get_conn(db_path)
+    # nova baza odmah s incremental auto_vacuum (postojeće prebacuje hk/maintenance.py)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # WAL: čitanja ne blokiraju upis i obrnuto (postavka ostaje zapisana u datoteci)
+    conn.execute("PRAGMA journal_mode = WAL")
+    cur = conn.cursor()
+
+    # Osnovni podaci o klubu
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS club_info (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            name TEXT, street TEXT, city_zip TEXT,
+            email TEXT, address TEXT, oib TEXT, web TEXT, iban TEXT,
+            president TEXT, secretary TEXT,
+            instagram TEXT, facebook TEXT, tiktok TEXT,
+            created_at TEXT, updated_at TEXT
+        )
+    """)
+
+    # Članovi tijela (predsjedništvo & nadzorni)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS board_members (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT CHECK(kind IN ('board','supervisory')),
+            full_name TEXT, phone TEXT, email TEXT
+        )
+    """)
+
+    # Dokumenti kluba
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS club_docs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT,             -- npr. 'statut', 'pravilnik', 'ostalo'
+            filename TEXT,
+            path TEXT,
+            uploaded_at TEXT
+        )
+    """)
+
+    # Grupe
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE
+        )
+    """)
+
+    # Članovi
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            dob TEXT,
+            gender TEXT CHECK (gender IN ('M','Ž','')),
+            oib TEXT,
+            street TEXT,
+            city TEXT,
+            postal_code TEXT,
+            residence TEXT,
+            athlete_email TEXT,
+            parent_email TEXT,
+            athlete_phone TEXT,
+            parent_phone TEXT,
+            id_card_number TEXT, id_card_issuer TEXT, id_card_valid_until TEXT,
+            passport_number TEXT, passport_issuer TEXT, passport_valid_until TEXT,
+            active_competitor INTEGER DEFAULT 0,
+            veteran INTEGER DEFAULT 0,
+            other_flag INTEGER DEFAULT 0,
+            membership_fee_eur REAL DEFAULT 0,
+            group_id INTEGER,
+            photo_path TEXT,
+            consent_path TEXT,       -- privola
+            application_path TEXT,   -- pristupnica ili dodatni dokument
+            medical_path TEXT,
+            medical_valid_until TEXT,
+            FOREIGN KEY(group_id) REFERENCES groups(id) ON DELETE SET NULL
+        )
+    """)
+    # Backward compatible ALTERs
+    def ensure_column(table: str, col: str, ddl: str):
+        have = cur.execute(f"PRAGMA table_info({table})").fetchall()
+        names = [r[1] for r in have]
+        if col not in names:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {ddl}")
+
+    ensure_column("club_info","logo_path","TEXT")   # logo učitan u odjeljku Klub
+    ensure_column("members","first_name","TEXT")
+    ensure_column("members","last_name","TEXT")
+    ensure_column("members","street","TEXT")
+    ensure_column("members","city","TEXT")
+    ensure_column("members","postal_code","TEXT")
+    ensure_column("members","athlete_phone","TEXT")
+    ensure_column("members","parent_phone","TEXT")
+    ensure_column("members","parent_name","TEXT")
+    # indeksi isteka liječničke, osobne i putovnice (hk/expiry.py)
+    ensure_expiry_indexes(conn)
+
+    # Treneri
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS coaches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            dob TEXT,
+            oib TEXT,
+            email TEXT,
+            iban TEXT,
+            photo_path TEXT
+        )
+    """)
+    ensure_column("coaches","first_name","TEXT")
+    ensure_column("coaches","last_name","TEXT")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS coach_docs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            coach_id INTEGER,
+            kind TEXT, filename TEXT, path TEXT, uploaded_at TEXT,
+            FOREIGN KEY(coach_id) REFERENCES coaches(id) ON DELETE CASCADE
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS coach_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            coach_id INTEGER,
+            group_id INTEGER,
+            assigned_at TEXT,
+            FOREIGN KEY(coach_id) REFERENCES coaches(id) ON DELETE CASCADE,
+            FOREIGN KEY(group_id) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Natjecanja
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS competitions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT,          -- kategorija natjecanja
+            custom_kind TEXT,   -- ili podvrsta repre.
+            name TEXT,          -- ime natjecanja
+            date_from TEXT,
+            date_to TEXT,
+            place TEXT,
+            style TEXT,         -- GR, FS, WW, BW, MODIFICIRANO
+            age_group TEXT,     -- POČETNICI, U11, U13, U15, U17, U20, U23, SENIORI
+            country TEXT,       -- puna država
+            country_code TEXT,  -- ISO3
+            team_rank TEXT,
+            club_competitors INTEGER,     -- broj nastupajućih iz kluba
+            total_competitors INTEGER,    -- ukupan broj natjecatelja
+            total_clubs INTEGER,
+            total_countries INTEGER,
+            coaches_text TEXT,
+            notes TEXT,         -- zapažanja trenera (za objave)
+            bulletin_link TEXT,
+            results_link TEXT,
+            gallery_link TEXT,
+            bulletin_file TEXT,
+            results_file TEXT
+        )
+    """)
+    ensure_column("competitions","bulletin_file","TEXT")
+    ensure_column("competitions","results_file","TEXT")
+    # Redni broj iz arhive Knjiga1 (NULL za natjecanja bez rednog broja)
+    ensure_column("competitions","redni_broj","INTEGER")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_competitions_redni_broj ON competitions(redni_broj)")
+
+    # Rezultati natjecanja po sportašu
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS competition_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            competition_id INTEGER,
+            member_id INTEGER,
+            weight_category TEXT,
+            style TEXT,
+            bouts_total INTEGER,
+            wins INTEGER,
+            losses INTEGER,
+            placement INTEGER,
+            opponent_list TEXT,    -- JSON: [{name,club,win/lose}...]
+            notes TEXT,
+            FOREIGN KEY(competition_id) REFERENCES competitions(id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES members(id) ON DELETE SET NULL
+        )
+    """)
+    ensure_column("competition_results","age_group","TEXT")
+    ensure_column("competition_results","legacy_result_id","INTEGER")
+    # 1 = natjecanje iz arhive Knjiga1; ponovni uvoz arhive mijenja samo takva natjecanja
+    had_legacy = "legacy" in [r[1] for r in cur.execute("PRAGMA table_info(competitions)").fetchall()]
+    ensure_column("competitions","legacy","INTEGER NOT NULL DEFAULT 0")
+    if not had_legacy:
+        cur.execute("""UPDATE competitions SET legacy=1 WHERE id IN
+                       (SELECT competition_id FROM competition_results WHERE legacy_result_id IS NOT NULL)""")
+
+    # Slike s natjecanja (više datoteka)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS competition_photos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            competition_id INTEGER,
+            filename TEXT, path TEXT, uploaded_at TEXT,
+            FOREIGN KEY(competition_id) REFERENCES competitions(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Prisustvo: treneri (sesije) i članovi (dolazak)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            coach_id INTEGER,
+            group_id INTEGER,
+            start_ts TEXT,
+            end_ts TEXT,
+            location TEXT,
+            remark TEXT,
+            FOREIGN KEY(coach_id) REFERENCES coaches(id) ON DELETE SET NULL,
+            FOREIGN KEY(group_id) REFERENCES groups(id) ON DELETE SET NULL
+        )
+    """)
+    ensure_column("sessions","slot_id","INTEGER")   # termin iz tjednog rasporeda
+    # Kanonsko vrijeme "YYYY-MM-DD HH:MM" + indeksi (mjesečna statistika, odabir sesije)
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ix_sessions_start_ts'").fetchone():
+        normalize_session_timestamps(conn)
+        cur.execute("CREATE INDEX ix_sessions_start_ts ON sessions(start_ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_sessions_group_start ON sessions(group_id, start_ts)")
+
+    # Tjedni raspored treninga – vidi hk/schedule.py
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schedule_slots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER,
+            coach_id INTEGER,
+            weekday INTEGER CHECK (weekday BETWEEN 0 AND 6),   -- 0 = ponedjeljak
+            start_time TEXT,                                   -- HH:MM
+            duration_min INTEGER DEFAULT 90,
+            location TEXT,
+            active INTEGER DEFAULT 1,
+            FOREIGN KEY(group_id) REFERENCES groups(id) ON DELETE CASCADE,
+            FOREIGN KEY(coach_id) REFERENCES coaches(id) ON DELETE SET NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS attendance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            member_id INTEGER,
+            present INTEGER DEFAULT 1,
+            minutes INTEGER DEFAULT 0,
+            FOREIGN KEY(session_id) REFERENCES sessions(id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES members(id) ON DELETE CASCADE
+        )
+    """)
+    # Jedan zapis po (sesija, sportaš) – upis je UPSERT; stare duplikate (dvostruki klik)
+    # svedi na zadnji zapis prije stvaranja indeksa
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_attendance_session_member'").fetchone():
+        cur.execute("""DELETE FROM attendance WHERE member_id IS NOT NULL AND id NOT IN
+                       (SELECT MAX(id) FROM attendance GROUP BY session_id, member_id)""")
+        cur.execute("CREATE UNIQUE INDEX ux_attendance_session_member ON attendance(session_id, member_id)")
+    # pokrivajući indeks za analitiku (hk/analytics.py) – čita bez skokova u tablicu
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_attendance_session_cover ON attendance(session_id, present, member_id, minutes)")
+
+    # Pripreme reprezentacije
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS camps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            place TEXT,
+            coach TEXT,
+            start_date TEXT,
+            end_date TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS camp_attendance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            camp_id INTEGER,
+            member_id INTEGER,
+            trainings INTEGER DEFAULT 0,
+            hours REAL DEFAULT 0.0,
+            FOREIGN KEY(camp_id) REFERENCES camps(id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES members(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Jedno sudjelovanje po (pripreme, sportaš) – upis je UPSERT (hk/camps.py)
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_camp_attendance_camp_member'").fetchone():
+        cur.execute("""DELETE FROM camp_attendance WHERE member_id IS NOT NULL AND id NOT IN
+                       (SELECT MAX(id) FROM camp_attendance GROUP BY camp_id, member_id)""")
+        cur.execute("CREATE UNIQUE INDEX ux_camp_attendance_camp_member ON camp_attendance(camp_id, member_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_camps_start_date ON camps(start_date)")
+
+    # Brojači (npr. redni broj natjecanja) – vidi hk/sequence.py
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sequences (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+
+    # Borbe po protivniku iz opponent_list (hk/bouts.py)
+    ensure_bouts(conn)
+    # Elo rejting po stilu iz borbi (hk/ratings.py)
+    ensure_ratings(conn)
+
+    # Povijest održavanja baze – vidi hk/maintenance.py
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            trigger TEXT,
+            ms REAL,
+            integrity TEXT,
+            auto_vacuum TEXT,
+            pages_after INTEGER,
+            file_bytes_before INTEGER,
+            file_bytes_after INTEGER,
+            free_pages_before INTEGER,
+            free_pages_after INTEGER,
+            unused_pct_before REAL,
+            unused_pct_after REAL,
+            notes TEXT
+        )
+    """)
+
+    # Zadani zapis o klubu
+    cur.execute("SELECT COUNT(*) FROM club_info WHERE id=1")
+    if cur.fetchone()[0] == 0:
+        cur.execute("""
+            INSERT INTO club_info(id,name,street,city_zip,email,address,oib,web,iban,
+                                  president,secretary,instagram,facebook,tiktok,created_at,updated_at)
+            VALUES (1,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """, (KLUB_NAZIV, "Miklinovec 6a", "48000 Koprivnica",
+              KLUB_EMAIL, KLUB_ADRESA, KLUB_OIB, KLUB_WEB, KLUB_IBAN,
+              "", "", "", "", "", datetime.now().isoformat(), datetime.now().isoformat()))
+    conn.commit()
+    conn.close()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Istek dokumenata članova: liječnička potvrda, osobna iskaznica, putovnica.
+
+Datumi se spremaju kao YYYY-MM-DD, a za svaki stupac postoji djelomični
+(partial) indeks samo nad ispravnim datumima, pa je upit "istječe u
+sljedećih N dana" pretraga raspona po indeksu (O(log n) + broj pogodaka),
+bez formatiranja cijelog popisa članova.
+
+Dnevni pregled za tajništvo radi bez web sučelja, kao CSV ili .eml
+(poruka s CSV prilogom za lokalni mail klijent / spool mapu):
+    python -m hk.expiry --days 30 --out izvjestaji --format eml
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from email.message import EmailMessage
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from hk.config import KLUB_EMAIL, KLUB_NAZIV
+
+ISO_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+# vrsta → (stupac u members, naziv)
+DOCS: Dict[str, Tuple[str, str]] = {
+    "medical": ("medical_valid_until", "Liječnička potvrda"),
+    "id_card": ("id_card_valid_until", "Osobna iskaznica"),
+    "passport": ("passport_valid_until", "Putovnica"),
+}
+
+
+def to_iso_date(value) -> str:
+    """Datum (date, Timestamp, ISO, dd.mm.yyyy., Excel broj) kao YYYY-MM-DD; nepoznato ostaje kako je."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float)):
+        return (date(1899, 12, 30) + timedelta(days=int(value))).isoformat()
+    s = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y.", "%d.%m.%Y", "%d. %m. %Y.", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return s
+
+
+def ensure_expiry_indexes(conn: sqlite3.Connection):
+    """Djelomični indeksi po datumu isteka; prvi put se postojeći datumi svode na ISO."""
+    for kind, (col, _) in DOCS.items():
+        name = f"ix_members_{kind}_until"
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (name,)).fetchone():
+            continue
+        fixed = [(to_iso_date(v), mid) for mid, v in conn.execute(
+            f"SELECT id, {col} FROM members WHERE {col} <> '' AND {col} NOT GLOB '{ISO_GLOB}'").fetchall()]
+        conn.executemany(f"UPDATE members SET {col}=? WHERE id=?", [f for f in fixed if f[0]])
+        conn.execute(f"CREATE INDEX {name} ON members({col}) WHERE {col} GLOB '{ISO_GLOB}'")
+
+
+def expiring(conn: sqlite3.Connection, days: int = 30, today: Optional[date] = None,
+             kinds: Optional[Iterable[str]] = None, overdue_days: Optional[int] = 60) -> pd.DataFrame:
+    """Dokumenti koji istječu do today+days, uključujući one istekle u zadnjih
+    overdue_days dana (None = svi istekli, 0 = samo budući)."""
+    today = today or date.today()
+    hi = (today + timedelta(days=int(days))).isoformat()
+    lo = "0000-00-00" if overdue_days is None else (today - timedelta(days=int(overdue_days))).isoformat()
+    parts, params = [], []
+    for kind in (kinds or DOCS):
+        col, label = DOCS[kind]
+        # isti uvjet kao u indeksu → planer koristi djelomični indeks
+        parts.append(f"""
+            SELECT m.id AS member_id, m.full_name AS ime_prezime, g.name AS grupa, ? AS dokument,
+                   m.{col} AS vrijedi_do, CAST(julianday(m.{col}) - julianday(?) AS INTEGER) AS dana,
+                   m.active_competitor AS aktivni, m.athlete_email, m.parent_email
+            FROM members m LEFT JOIN groups g ON g.id = m.group_id
+            WHERE m.{col} GLOB '{ISO_GLOB}' AND m.{col} >= ? AND m.{col} <= ?""")
+        params += [label, today.isoformat(), lo, hi]
+    if not parts:
+        return pd.DataFrame()
+    return pd.read_sql_query(" UNION ALL ".join(parts) + " ORDER BY vrijedi_do, ime_prezime", conn, params=params)
+
+
+def digest_text(df: pd.DataFrame, days: int, today: date) -> str:
+    if df.empty:
+        return f"Nema dokumenata koji istječu u sljedećih {days} dana ({today:%d.%m.%Y.})."
+    lines = [f"Dokumenti koji istječu u sljedećih {days} dana ili su nedavno istekli ({today:%d.%m.%Y.}):", ""]
+    for r in df.itertuples(index=False):
+        state = f"istekao prije {-r.dana} dana" if r.dana < 0 else f"još {r.dana} dana"
+        lines.append(f"- {r.ime_prezime} ({r.grupa or 'bez grupe'}): {r.dokument} do {r.vrijedi_do} – {state}")
+    return "\n".join(lines)
+
+
+def write_digest(conn: sqlite3.Connection, out_dir: str, days: int = 30, fmt: str = "csv",
+                 today: Optional[date] = None, to_addr: Optional[str] = None,
+                 overdue_days: Optional[int] = 60) -> str:
+    """Zapiši dnevni pregled isteka u out_dir; vraća putanju datoteke."""
+    today = today or date.today()
+    df = expiring(conn, days, today, overdue_days=overdue_days)
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"istek_dokumenata_{today.isoformat()}")
+    csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
+    if fmt == "csv":
+        path = base + ".csv"
+        with open(path, "wb") as f:
+            f.write(csv_bytes)
+        return path
+    msg = EmailMessage()
+    msg["From"] = KLUB_EMAIL
+    msg["To"] = to_addr or KLUB_EMAIL
+    msg["Subject"] = f"{KLUB_NAZIV}: istek dokumenata ({len(df)}) – {today:%d.%m.%Y.}"
+    msg["Date"] = datetime.now().astimezone().strftime("%a, %d %b %Y %H:%M:%S %z")
+    msg.set_content(digest_text(df, days, today))
+    msg.add_attachment(csv_bytes, maintype="text", subtype="csv", filename=os.path.basename(base) + ".csv")
+    path = base + ".eml"
+    with open(path, "wb") as f:
+        f.write(bytes(msg))
+    return path
+
+
+def main(argv=None):
+    from hk.db import get_conn, init_db
+
+    ap = argparse.ArgumentParser(description="Dnevni pregled isteka liječničkih, osobnih i putovnica.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--out", default="izvjestaji", help="mapa za datoteku pregleda")
+    ap.add_argument("--format", choices=["csv", "eml"], default="csv")
+    ap.add_argument("--overdue-days", type=int, default=60, help="uključi istekle u zadnjih N dana")
+    ap.add_argument("--to", help="primatelj .eml poruke (zadano e-mail kluba)")
+    ap.add_argument("--today", help="datum YYYY-MM-DD (zadano: danas)")
+    args = ap.parse_args(argv)
+    init_db(args.db)
+    conn = get_conn(args.db)
+    path = write_digest(conn, args.out, args.days, args.format,
+                        date.fromisoformat(args.today) if args.today else None, args.to, args.overdue_days)
+    conn.close()
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
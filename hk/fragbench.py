@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Trajanje reruna pri interakciji u panelu – prije i poslije st.fragment (AppTest).
+
+Prije: svaka interakcija ponovno izvodi cijelu skriptu (bočna traka,
+init_db, cijeli odjeljak s Excel izvozima i predlošcima) – mjeri se puni
+rerun aplikacije s odabranim odjeljkom.
+Poslije: Streamlit ponovno izvodi samo fragment. AppTest uvijek izvodi
+cijelu skriptu, pa se fragment mjeri kao samostalna skripta
+(AppTest.from_function) – to je upravo posao koji preglednik čeka.
+
+▶ Pokretanje:
+    python -m hk.fragbench --scale medium --repeat 5
+    python -m hk.fragbench --db hk_podravka.db --save fragbench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from hk.loadtest import APP_PATH
+from hk.views import page_path
+
+# (panel, odjeljak u navigaciji, modul, fragment, gumb koji interakcija klikne)
+PANELS = [
+    ("Unos rezultata", "Natjecanja i rezultati", "hk.views.natjecanja", "results_entry", None),
+    ("Uređivanje rezultata", "Natjecanja i rezultati", "hk.views.natjecanja", "results_editor", None),
+    ("Prozivka (prisustvo)", "Prisustvo", "hk.views.prisustvo", "attendance_checkin", None),
+    ("Statistika i grafovi", "Statistika", "hk.views.statistika", "stats_panel", "Izračunaj"),
+    ("Popis grupe", "Grupe", "hk.views.grupe", "group_roster", None),
+]
+
+
+def _panel_script(root: str, module: str, func: str):
+    """Samostalna skripta za AppTest.from_function – izvodi samo jedan fragment."""
+    import importlib
+    import sys
+    sys.path.insert(0, root)
+    fn = getattr(importlib.import_module(module), func)
+    if func == "group_roster":
+        # popis prve grupe; upiti za grupe/članove su dodatak kojeg u pravom rerunu fragmenta nema
+        from hk import queries as q
+        from hk.db import get_conn
+        from hk.lookup import Lookup
+        from hk.repos import MembersRepo
+        conn = get_conn()
+        gid, gname = q.groups(conn)[0]
+        mems = Lookup.from_rows(MembersRepo(conn).names(), "{} – {}".format)
+        conn.close()
+        fn(gid, gname, mems)
+    else:
+        fn()
+
+
+def _interact(at, button: Optional[str]) -> List[str]:
+    """Jedna interakcija: klik na gumb (ako ga panel ima) ili običan rerun; vraća greške."""
+    btns = [b for b in at.button if b.label == button] if button else []
+    if btns:
+        btns[0].click().run()
+    else:
+        at.run()
+    return [str(e.value) for e in at.exception]
+
+
+def _timed(at, button: Optional[str], repeat: int):
+    _interact(at, button)   # zagrijavanje (cache, uvoz modula)
+    samples, errors = [], []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        errors += _interact(at, button)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples, errors
+
+
+def run_fragbench(repeat: int = 5) -> dict:
+    """Mjeri sve panele nad bazom iz HK_DB_PATH (postavlja se prije poziva)."""
+    from streamlit.testing.v1 import AppTest
+    root = os.path.dirname(APP_PATH)
+    sys.path.insert(0, root)
+
+    report = {}
+    for label, section, module, func, button in PANELS:
+        full = AppTest.from_file(APP_PATH, default_timeout=300)
+        full.run()
+        full.switch_page(page_path(section)).run()
+        before, err_b = _timed(full, button, repeat)
+
+        frag = AppTest.from_function(_panel_script, args=(root, module, func), default_timeout=300)
+        frag.run()
+        after, err_a = _timed(frag, button, repeat)
+
+        p50_b, p50_a = statistics.median(before), statistics.median(after)
+        report[label] = {
+            "odjeljak": section,
+            "prije_p50_ms": round(p50_b, 1), "poslije_p50_ms": round(p50_a, 1),
+            "ubrzanje": round(p50_b / p50_a, 1) if p50_a else None,
+            "greške": sorted(set(e[:200] for e in err_b + err_a))[:3],
+        }
+    return {"meta": {"created": datetime.now().isoformat(timespec="seconds"), "repeat": repeat},
+            "panels": report}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rerun panela prije/poslije st.fragment (AppTest).")
+    ap.add_argument("--scale", choices=["small", "medium", "large"], default="small",
+                    help="veličina sintetičke baze (hk.synth)")
+    ap.add_argument("--db", help="postojeća baza (zadano: nova sintetička u privremenoj mapi)")
+    ap.add_argument("--repeat", type=int, default=5, help="broj mjerenih interakcija po panelu")
+    ap.add_argument("--save", help="spremi rezultat kao JSON")
+    args = ap.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix="hk_frag_")
+    db_path = os.path.abspath(args.db) if args.db else os.path.join(tmp_dir, "frag.db")
+    if not args.db:
+        from hk.synth import generate
+        generate(db_path, scale=args.scale)
+    # hk.config čita okolinu pri uvozu – postaviti prije prvog AppTest izvođenja
+    os.environ["HK_DB_PATH"] = db_path
+    os.environ["HK_UPLOAD_DIR"] = os.path.join(tmp_dir, "uploads")
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    try:
+        rep = run_fragbench(args.repeat)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    rep["meta"]["db"] = "sintetička" if not args.db else args.db
+    rep["meta"]["scale"] = args.scale if not args.db else None
+
+    print(f"{'panel':24} {'odjeljak':24} {'prije p50':>10} {'poslije p50':>12} {'ubrzanje':>9}")
+    for label, r in rep["panels"].items():
+        print(f"{label:24} {r['odjeljak']:24} {r['prije_p50_ms']:>10} {r['poslije_p50_ms']:>12} {r['ubrzanje']:>8}x")
+        for e in r["greške"]:
+            print(f"  greška: {e}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+        print(f"Rezultat spremljen u {args.save}")
+
+
+if __name__ == "__main__":
+    main()
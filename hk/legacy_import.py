@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Uvoz arhive rezultata (rezultati_knjiga1.sqlite / Knjiga1.xlsx) u glavnu bazu.
+
+Stara baza se priključi s ATTACH i prepisuje skupnim INSERT … SELECT upitima:
+natjecanja se ključaju po redni_broj (ponovljeni uvoz ažurira, ne duplicira),
+a sportaši se povezuju s članovima po normaliziranom imenu. Uvezena natjecanja
+imaju legacy=1; broj iz arhive koji već nosi natjecanje uneseno u aplikaciji
+(brojač, hk/sequence.py) javlja se kao sudar i preskače.
+
+▶ Pokretanje:
+    python -m hk.legacy_import rezultati_knjiga1.sqlite
+    python -m hk.legacy_import Knjiga1.xlsx --db hk_podravka.db
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from hk.config import DB_PATH
+from hk.db import get_conn, init_db
+from hk.sequence import sync_redni_broj
+
+# Shema stare baze (ista kao u rezultati_knjiga1.sqlite)
+LEGACY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS competitions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        redni_broj INTEGER UNIQUE,
+        godina INTEGER,
+        datum TEXT,
+        datum_kraj TEXT,
+        natjecanje TEXT,
+        ime_natjecanja TEXT NOT NULL,
+        stil_hrvanja TEXT,
+        mjesto TEXT,
+        drzava TEXT,
+        kratica_drzave TEXT,
+        nastupilo_podravke INTEGER,
+        ekipno TEXT,
+        trener TEXT,
+        created_at TEXT DEFAULT (datetime('now'))
+    );
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        competition_id INTEGER NOT NULL REFERENCES competitions(id) ON DELETE CASCADE,
+        ime_prezime TEXT,
+        spol TEXT,
+        plasman TEXT,
+        kategorija TEXT,
+        uzrast TEXT,
+        borbi INTEGER,
+        pobjeda INTEGER,
+        izgubljenih INTEGER,
+        created_at TEXT DEFAULT (datetime('now'))
+    );
+"""
+
+LEGACY_COMP_COLS = ["redni_broj", "godina", "datum", "datum_kraj", "natjecanje", "ime_natjecanja",
+                    "stil_hrvanja", "mjesto", "drzava", "kratica_drzave", "nastupilo_podravke",
+                    "ekipno", "trener"]
+LEGACY_RESULT_COLS = ["ime_prezime", "spol", "plasman", "kategorija", "uzrast",
+                      "borbi", "pobjeda", "izgubljenih"]
+
+# Zaglavlja iz Knjiga1.xlsx koja se razlikuju od naziva kolona stare baze
+HEADER_ALIASES = {
+    "rb": "redni_broj", "r_br": "redni_broj", "redni_br": "redni_broj",
+    "stil": "stil_hrvanja", "datum_od": "datum", "datum_do": "datum_kraj",
+    "pobjede": "pobjeda", "porazi": "izgubljenih", "sportas": "ime_prezime",
+}
+
+
+# ==========================
+# NORMALIZACIJA VRIJEDNOSTI
+# ==========================
+def _ascii_fold(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s.replace("đ", "d").replace("Đ", "D"))
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+
+def normalize_name(name) -> str:
+    """Ključ za usporedbu imena: mala slova, bez dijakritika, riječi abecedno
+    (pa se 'Ivan Horvat' i 'HORVAT  Ivan' smatraju istom osobom)."""
+    if name is None:
+        return ""
+    tokens = re.findall(r"[a-z0-9]+", _ascii_fold(str(name)).lower())
+    return " ".join(sorted(tokens))
+
+
+def iso_date(value) -> Optional[str]:
+    """Datum iz arhive (ISO, dd.mm.yyyy., Excel serijski broj) u YYYY-MM-DD.
+
+    Bez datuma ili u neprepoznatom obliku ("ožujak 2009") → None: izmišljen datum
+    ili slobodan tekst u date_from poremetio bi redoslijed natjecanja (rejting, statistika).
+    """
+    if value is None or str(value).strip() == "":
+        return None
+    s = str(value).strip().rstrip(".")
+    if isinstance(value, (int, float)) or re.fullmatch(r"\d{5}(\.\d+)?", s):
+        # Excel serijski broj (u TEXT stupcu stare baze stiže kao tekst); sama godina nije datum
+        return (date(1899, 12, 30) + timedelta(days=int(float(s)))).isoformat()
+    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y", "%d. %m. %Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def placement_int(value) -> Optional[int]:
+    """'1.', '3', '5-8' → 1, 3, 5; bez broja → NULL."""
+    m = re.match(r"\s*(\d+)", str(value or ""))
+    return int(m.group(1)) if m else None
+
+
+def gender_code(value) -> str:
+    s = _ascii_fold(str(value or "")).strip().upper()
+    return {"M": "M", "Z": "Ž", "MUSKO": "M", "ZENSKO": "Ž"}.get(s, "")
+
+
+def _register_functions(conn: sqlite3.Connection):
+    conn.create_function("hk_norm", 1, normalize_name, deterministic=True)
+    conn.create_function("hk_iso_date", 1, iso_date, deterministic=True)
+    conn.create_function("hk_placement", 1, placement_int, deterministic=True)
+    conn.create_function("hk_gender", 1, gender_code, deterministic=True)
+
+
+# ==========================
+# ETL
+# ==========================
+def _build_member_keys(conn: sqlite3.Connection):
+    conn.execute("DROP TABLE IF EXISTS temp.member_keys")
+    conn.execute("""
+        CREATE TEMP TABLE member_keys AS
+        SELECT hk_norm(full_name) AS norm, MIN(id) AS member_id
+        FROM members WHERE TRIM(COALESCE(full_name,'')) <> ''
+        GROUP BY 1
+    """)
+    conn.execute("CREATE UNIQUE INDEX temp.ix_member_keys ON member_keys(norm)")
+
+
+def import_legacy_db(conn: sqlite3.Connection, legacy_path: str,
+                     create_members: bool = True) -> Dict[str, int]:
+    """Prenese natjecanja i rezultate iz stare baze u glavnu.
+
+    Idempotentno: uvezena natjecanja (legacy=1) ažuriraju se po redni_broj, a
+    prethodno uvezeni rezultati tih natjecanja (legacy_result_id IS NOT NULL)
+    zamjenjuju se novima; ručno uneseni rezultati ostaju netaknuti. Natjecanja
+    unesena u aplikaciji s istim rednim brojem ne diraju se (sudari_redni_broj).
+    """
+    _register_functions(conn)
+    conn.execute("ATTACH DATABASE ? AS legacy", (legacy_path,))
+    try:
+        stats: Dict[str, int] = {}
+        with conn:
+            stats["preskočeno_bez_rednog_broja"] = conn.execute(
+                "SELECT COUNT(*) FROM legacy.competitions WHERE redni_broj IS NULL").fetchone()[0]
+            stats["sudari_redni_broj"] = conn.execute("""
+                SELECT COUNT(*) FROM legacy.competitions lc
+                JOIN competitions c ON c.redni_broj = lc.redni_broj
+                WHERE c.legacy = 0
+            """).fetchone()[0]
+            # natjecanja bez datuma ili s neprepoznatim datumom dobivaju date_from NULL
+            stats["bez_datuma"], stats["neprepoznat_datum"] = conn.execute("""
+                SELECT COALESCE(SUM(TRIM(COALESCE(datum, '')) = ''), 0),
+                       COALESCE(SUM(TRIM(COALESCE(datum, '')) <> '' AND hk_iso_date(datum) IS NULL), 0)
+                FROM legacy.competitions WHERE redni_broj IS NOT NULL
+            """).fetchone()
+
+            cur = conn.execute("""
+                INSERT INTO competitions
+                    (redni_broj, kind, name, date_from, date_to, place, style,
+                     country, country_code, club_competitors, team_rank, coaches_text, legacy)
+                SELECT lc.redni_broj, lc.natjecanje, lc.ime_natjecanja,
+                       hk_iso_date(lc.datum),
+                       COALESCE(hk_iso_date(lc.datum_kraj), hk_iso_date(lc.datum)),
+                       lc.mjesto, lc.stil_hrvanja, lc.drzava, lc.kratica_drzave,
+                       lc.nastupilo_podravke, lc.ekipno, lc.trener, 1
+                FROM legacy.competitions lc
+                WHERE lc.redni_broj IS NOT NULL
+                ON CONFLICT(redni_broj) DO UPDATE SET
+                    kind=excluded.kind, name=excluded.name,
+                    date_from=excluded.date_from, date_to=excluded.date_to,
+                    place=excluded.place, style=excluded.style,
+                    country=excluded.country, country_code=excluded.country_code,
+                    club_competitors=excluded.club_competitors,
+                    team_rank=excluded.team_rank, coaches_text=excluded.coaches_text
+                WHERE competitions.legacy = 1
+            """)
+            stats["natjecanja"] = cur.rowcount
+            sync_redni_broj(conn)
+
+            _build_member_keys(conn)
+            if create_members:
+                cur = conn.execute("""
+                    INSERT INTO members (full_name, gender, active_competitor)
+                    SELECT n.name, n.gender, 0
+                    FROM (SELECT hk_norm(ime_prezime) AS norm, MIN(TRIM(ime_prezime)) AS name,
+                                 MAX(hk_gender(spol)) AS gender
+                          FROM legacy.results
+                          WHERE TRIM(COALESCE(ime_prezime,'')) <> ''
+                          GROUP BY 1) n
+                    WHERE n.norm <> '' AND n.norm NOT IN (SELECT norm FROM member_keys)
+                """)
+                stats["novi_članovi"] = cur.rowcount
+                if cur.rowcount:
+                    _build_member_keys(conn)
+
+            conn.execute("""
+                DELETE FROM competition_results
+                WHERE legacy_result_id IS NOT NULL
+                  AND competition_id IN (SELECT c.id FROM competitions c
+                                         JOIN legacy.competitions lc ON lc.redni_broj = c.redni_broj
+                                         WHERE c.legacy = 1)
+            """)
+            cur = conn.execute("""
+                INSERT INTO competition_results
+                    (competition_id, member_id, weight_category, style, age_group,
+                     bouts_total, wins, losses, placement, legacy_result_id)
+                SELECT c.id, mk.member_id, lr.kategorija, lc.stil_hrvanja, lr.uzrast,
+                       lr.borbi, lr.pobjeda, lr.izgubljenih, hk_placement(lr.plasman), lr.id
+                FROM legacy.results lr
+                JOIN legacy.competitions lc ON lc.id = lr.competition_id
+                JOIN competitions c ON c.redni_broj = lc.redni_broj AND c.legacy = 1
+                LEFT JOIN member_keys mk ON mk.norm = hk_norm(lr.ime_prezime)
+            """)
+            stats["rezultati"] = cur.rowcount
+            stats["nepovezani_rezultati"] = conn.execute("""
+                SELECT COUNT(*) FROM competition_results
+                WHERE legacy_result_id IS NOT NULL AND member_id IS NULL
+            """).fetchone()[0]
+            conn.execute("DROP TABLE temp.member_keys")
+    finally:
+        conn.execute("DETACH DATABASE legacy")
+    return stats
+
+
+def legacy_db_from_excel(xlsx_path: str, out_path: str) -> str:
+    """Knjiga1.xlsx (ravna tablica: jedan redak = jedan rezultat, s podacima
+    natjecanja u istom retku) pretvori u bazu sa shemom stare arhive."""
+    import pandas as pd
+
+    sheets = pd.read_excel(xlsx_path, sheet_name=None)
+    frames = []
+    for df in sheets.values():
+        cols = {}
+        for c in df.columns:
+            key = re.sub(r"[^a-z0-9]+", "_", _ascii_fold(str(c)).lower()).strip("_")
+            cols[c] = HEADER_ALIASES.get(key, key)
+        df = df.rename(columns=cols)
+        if "redni_broj" in df.columns:
+            frames.append(df)
+    if not frames:
+        raise ValueError("U Excelu nema kolone 'redni_broj'.")
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["redni_broj"].notna()]
+    df = df.astype(object).where(df.notna(), None)
+    for c in LEGACY_COMP_COLS + LEGACY_RESULT_COLS:
+        if c not in df.columns:
+            df[c] = None
+    df["redni_broj"] = df["redni_broj"].map(int)
+    df["ime_natjecanja"] = df["ime_natjecanja"].fillna(df["natjecanje"]).fillna("")
+
+    comps = df.drop_duplicates("redni_broj")
+    res = df[df["ime_prezime"].notna()]
+    conn = sqlite3.connect(out_path)
+    with conn:
+        conn.executescript(LEGACY_SCHEMA)
+        # id natjecanja = redni_broj, da rezultati ne trebaju dodatno mapiranje
+        conn.executemany(
+            f"INSERT OR REPLACE INTO competitions (id, {', '.join(LEGACY_COMP_COLS)}) "
+            f"VALUES ({', '.join('?' * (len(LEGACY_COMP_COLS) + 1))})",
+            [(r["redni_broj"], *[r[c] for c in LEGACY_COMP_COLS]) for _, r in comps.iterrows()])
+        conn.executemany(
+            f"INSERT INTO results (competition_id, {', '.join(LEGACY_RESULT_COLS)}) "
+            f"VALUES ({', '.join('?' * (len(LEGACY_RESULT_COLS) + 1))})",
+            [(r["redni_broj"], *[r[c] for c in LEGACY_RESULT_COLS]) for _, r in res.iterrows()])
+    conn.close()
+    return out_path
+
+
+def import_legacy(source: str, db_path: Optional[str] = None,
+                  create_members: bool = True) -> Dict[str, int]:
+    """Uvoz iz .sqlite arhive ili Knjiga1.xlsx u bazu db_path."""
+    init_db(db_path)
+    conn = get_conn(db_path)
+    tmp_dir = None
+    try:
+        if source.lower().endswith((".xlsx", ".xls")):
+            tmp_dir = tempfile.mkdtemp(prefix="hk_knjiga1_")
+            source = legacy_db_from_excel(source, os.path.join(tmp_dir, "knjiga1.sqlite"))
+        return import_legacy_db(conn, source, create_members=create_members)
+    finally:
+        conn.close()
+        if tmp_dir:
+            for fn in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, fn))
+            os.rmdir(tmp_dir)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Uvoz arhive rezultata Knjiga1 u bazu kluba.")
+    ap.add_argument("source", help="rezultati_knjiga1.sqlite ili Knjiga1.xlsx")
+    ap.add_argument("--db", default=DB_PATH, help=f"odredišna baza (zadano: {DB_PATH})")
+    ap.add_argument("--no-create-members", action="store_true",
+                    help="ne dodaji nepoznate sportaše kao nove članove")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    stats = import_legacy(args.source, args.db, create_members=not args.no_create_members)
+    for k, v in stats.items():
+        print(f"{k}: {v}")
+    if stats.get("sudari_redni_broj"):
+        print("Upozorenje: dio rednih brojeva iz arhive već imaju natjecanja unesena u aplikaciji – "
+              "ta natjecanja nisu mijenjana, a rezultati iz arhive za te brojeve nisu uvezeni.")
+    if stats.get("bez_datuma") or stats.get("neprepoznat_datum"):
+        print("Upozorenje: natjecanja bez datuma ili s neprepoznatim datumom uvezena su bez datuma "
+              "(date_from prazan) – upišite datum u aplikaciji da uđu u rejting i statistiku po godini.")
+    print(f"Trajanje: {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
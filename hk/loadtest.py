@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Test opterećenja web aplikacije (streamlit.testing.v1.AppTest).
+
+N simuliranih korisnika (svaki sa svojom AppTest sesijom u zasebnom procesu)
+prolazi kroz sve odjeljke iz bočne navigacije nad sintetičkom bazom.
+Za svaki odjeljak bilježi se p50/p95 trajanje ponovnog izvođenja (rerun),
+greške zaključane baze i ostale iznimke. Rezultat se sprema kao JSON
+osnovica s kojom se uspoređuju kasnije izmjene.
+
+Sukob izvještaja i unosa: --reporters M dodaje M sesija koje stalno
+računaju Statistiku (čitanje preko get_read_conn) dok korisnici spremaju
+prisustvo; --report-conn rw iste izvještaje vodi kroz običnu konekciju.
+
+▶ Pokretanje:
+    python -m hk.loadtest --sessions 4 --rounds 3 --save loadtest_baseline.json
+    python -m hk.loadtest --sessions 4 --rounds 3 --compare loadtest_baseline.json
+    python -m hk.loadtest --sessions 4 --reporters 2 --report-conn rw --save rw.json
+    python -m hk.loadtest --sessions 4 --reporters 2 --compare rw.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+SECTIONS = ["Klub", "Članovi", "Treneri", "Natjecanja i rezultati",
+            "Statistika", "Protivnici", "Rejting", "Grupe", "Veterani", "Prisustvo"]   # ključevi hk.views.SECTIONS
+
+# Oznaka za mjerenje spremanja prisustva (upis) uz čitanja odjeljaka
+WRITE_LABEL = "Prisustvo (spremanje)"
+# Oznaka za izračun statistike u sesijama izvještaja (--reporters)
+REPORT_LABEL = "Statistika (izračun)"
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    vals = sorted(values)
+    return vals[min(len(vals) - 1, int(round(q * (len(vals) - 1))))]
+
+
+def _errors(at) -> List[str]:
+    return [str(getattr(e, "message", "") or getattr(e, "value", "")) for e in list(at.exception) + list(at.error)]
+
+
+def _drive_session(n: int, rounds: int, sections: List[str], write: bool,
+                   env: Dict[str, str], barrier, out_q, reporter: bool = False):
+    """Jedan simulirani korisnik (ili sesija izvještaja); izvodi se u zasebnom
+    procesu jer AppTest dijeli stanje widgeta među nitima istog procesa."""
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+    from streamlit.testing.v1 import AppTest
+    from hk.views import page_path
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, List[str]] = defaultdict(list)
+    crash = None
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=300)
+        at.run()
+        barrier.wait()  # mjerenje kreće istovremeno u svim sesijama
+
+        def record(label, t0):
+            samples[label].append((time.perf_counter() - t0) * 1000)
+            errors[label].extend(_errors(at))
+
+        if reporter:
+            # isto trajanje kao korisnici: jedan izračun po odjeljku po prolazu
+            at.switch_page(page_path("Statistika")).run()
+            for _ in range(rounds * len(sections)):
+                t0 = time.perf_counter()
+                at.button(key="stats_run").click().run()
+                record(REPORT_LABEL, t0)
+        else:
+            for r in range(rounds):
+                order = sections[n % len(sections):] + sections[:n % len(sections)]  # korisnici ne idu u koraku
+                for sec in order:
+                    t0 = time.perf_counter()
+                    at.switch_page(page_path(sec)).run()
+                    record(sec, t0)
+
+                    if write and sec == "Prisustvo":
+                        # prozivka je zadano cijela grupa; spremanje je UPSERT pa ponavljanje ne duplicira
+                        btns = [b for b in at.button if b.label == "Spremi prisustvo"]
+                        if btns:
+                            t0 = time.perf_counter()
+                            btns[0].click().run()
+                            record(WRITE_LABEL, t0)
+    except Exception as e:
+        crash = f"sesija {n}: {e!r}"
+    out_q.put((dict(samples), dict(errors), crash))
+
+
+def run_loadtest(db_path: str, sessions: int = 4, rounds: int = 3,
+                 sections: Optional[List[str]] = None, write: bool = True,
+                 upload_dir: Optional[str] = None, reporters: int = 0,
+                 report_conn: str = "ro") -> dict:
+    """Pokreni `sessions` istovremenih korisnika (i `reporters` sesija izvještaja)
+    nad postojećom bazom db_path."""
+    sections = sections or SECTIONS
+    env = {"HK_DB_PATH": os.path.abspath(db_path),
+           "HK_UPLOAD_DIR": upload_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), "uploads"),
+           "HK_REPORT_RO": "1" if report_conn == "ro" else "0"}
+    # shema jednom prije sesija – inače se istovremene migracije pri pokretanju sudaraju
+    from hk.db import init_db
+    init_db(env["HK_DB_PATH"])
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(sessions + reporters)
+    out_q = ctx.Queue()
+    procs = [ctx.Process(target=_drive_session,
+                         args=(n, rounds, sections, write, env, barrier, out_q, n >= sessions),
+                         name=f"hk-loadtest-{n}") for n in range(sessions + reporters)]
+
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, List[str]] = defaultdict(list)
+    crashes: List[str] = []
+    for _ in procs:
+        s, e, crash = out_q.get()
+        for k, v in s.items():
+            samples[k].extend(v)
+        for k, v in e.items():
+            errors[k].extend(v)
+        if crash:
+            crashes.append(crash)
+    for p in procs:
+        p.join()
+    wall = time.perf_counter() - t0
+
+    report = {}
+    for label in sections + ([WRITE_LABEL] if write else []) + ([REPORT_LABEL] if reporters else []):
+        vals = samples.get(label, [])
+        errs = errors.get(label, [])
+        locks = [e for e in errs if "locked" in e.lower() or "busy" in e.lower()]
+        report[label] = {
+            "n": len(vals),
+            "p50_ms": round(statistics.median(vals), 1) if vals else None,
+            "p95_ms": round(_percentile(vals, 0.95), 1) if vals else None,
+            "max_ms": round(max(vals), 1) if vals else None,
+            "lock_errors": len(locks),
+            "errors": len(errs) - len(locks),
+            "error_samples": sorted(set(e[:200] for e in errs))[:3],
+        }
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "sessions": sessions, "reporters": reporters, "report_conn": report_conn,
+            "rounds": rounds, "wall_s": round(wall, 2),
+            "python": platform.python_version(), "crashes": crashes,
+        },
+        "sections": report,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 1.25) -> List[str]:
+    """Vrati popis odjeljaka čiji je p95 porastao više od `tolerance` puta
+    ili koji imaju više grešaka zaključavanja nego u osnovici."""
+    regressions = []
+    print(f"{'odjeljak':28} {'p95 osnovica':>13} {'p95 sada':>10} {'omjer':>7} {'lock':>6}")
+    for label, cur in current["sections"].items():
+        base = baseline.get("sections", {}).get(label)
+        if not base or not base.get("p95_ms") or cur.get("p95_ms") is None:
+            continue
+        ratio = cur["p95_ms"] / base["p95_ms"]
+        print(f"{label:28} {base['p95_ms']:>13} {cur['p95_ms']:>10} {ratio:>7.2f} {cur['lock_errors']:>6}")
+        if ratio > tolerance or cur["lock_errors"] > base.get("lock_errors", 0):
+            regressions.append(label)
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Test opterećenja aplikacije (AppTest).")
+    ap.add_argument("--sessions", type=int, default=4, help="broj istovremenih korisnika")
+    ap.add_argument("--rounds", type=int, default=3, help="broj prolaza kroz sve odjeljke")
+    ap.add_argument("--scale", choices=["small", "medium", "large"], default="small",
+                    help="veličina sintetičke baze (hk.synth)")
+    ap.add_argument("--db", help="postojeća baza (zadano: nova sintetička u privremenoj mapi)")
+    ap.add_argument("--no-write", action="store_true", help="bez spremanja prisustva")
+    ap.add_argument("--reporters", type=int, default=0, help="sesije koje stalno računaju statistiku")
+    ap.add_argument("--report-conn", choices=["ro", "rw"], default="ro",
+                    help="konekcija izvještaja: samo za čitanje (zadano) ili ista kao obrasci")
+    ap.add_argument("--save", help="spremi rezultat kao JSON osnovicu")
+    ap.add_argument("--compare", help="usporedi s JSON osnovicom (izlaz 1 kod regresije)")
+    ap.add_argument("--tolerance", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix="hk_load_")
+    db_path = os.path.abspath(args.db) if args.db else os.path.join(tmp_dir, "load.db")
+    if not args.db:
+        from hk.synth import generate
+        generate(db_path, scale=args.scale)
+    try:
+        rep = run_loadtest(db_path, args.sessions, args.rounds, write=not args.no_write,
+                           upload_dir=os.path.join(tmp_dir, "uploads"),
+                           reporters=args.reporters, report_conn=args.report_conn)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    rep["meta"]["db"] = "sintetička" if not args.db else args.db
+    rep["meta"]["scale"] = args.scale if not args.db else None
+
+    for label, r in rep["sections"].items():
+        print(f"{label:28} n={r['n']:<4} p50={r['p50_ms']} ms  p95={r['p95_ms']} ms  "
+              f"lock={r['lock_errors']} greške={r['errors']}")
+    if rep["meta"]["crashes"]:
+        print("Prekinute sesije:", *rep["meta"]["crashes"], sep="\n  ")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+        print(f"Osnovica spremljena u {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(rep, baseline, args.tolerance)
+        if regressions:
+            print("Regresija:", ", ".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
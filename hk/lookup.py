@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Šifrarnik id → naziv za padajuće izbornike (selectbox/multiselect).
+
+Umjesto DataFrame-a za svaki izbornik: id-jevi u array('q'), nazivi u
+n-torci, a položaj i obratni pregled (naziv → id) u rječnicima – O(1)
+umjesto df.loc[df["naziv"] == x] po widgetu. Izbornik radi nad
+id-jevima, a naziv se prikazuje kroz format_func=lookup.label.
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class Lookup:
+    __slots__ = ("ids", "labels", "_pos", "_by_label")
+
+    def __init__(self, pairs: Iterable[Tuple[int, str]] = ()):
+        ids, labels = array("q"), []
+        for i, label in pairs:
+            ids.append(int(i))
+            labels.append("" if label is None else str(label))
+        self.ids = ids
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self._pos: Dict[int, int] = {i: n for n, i in enumerate(ids)}
+        self._by_label: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], fmt: Optional[Callable[..., str]] = None) -> "Lookup":
+        """Redci (id, naziv, ...) iz fetchall(); fmt(*redak) sastavlja prikaz iz više stupaca."""
+        if fmt is None:
+            return cls((r[0], r[1]) for r in rows)
+        return cls((r[0], fmt(*r)) for r in rows)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __bool__(self) -> bool:
+        return len(self.ids) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __contains__(self, row_id) -> bool:
+        return row_id in self._pos
+
+    def options(self) -> List[int]:
+        return self.ids.tolist()
+
+    def label(self, row_id: int) -> str:
+        """Naziv za id; nepoznati id diže KeyError (kao dict[...] prije)."""
+        return self.labels[self._pos[row_id]]
+
+    def index(self, row_id: Optional[int], default: int = 0) -> int:
+        return self._pos.get(row_id, default)
+
+    def id_of(self, label: str) -> Optional[int]:
+        """Obratni pregled po nazivu (rječnik se gradi pri prvom pozivu)."""
+        if self._by_label is None:
+            self._by_label = {lab: i for i, lab in zip(self.ids, self.labels)}
+        return self._by_label.get(label)
+
+    def __repr__(self):
+        return f"Lookup({len(self)} stavki)"
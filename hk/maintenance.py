@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Održavanje baze: ANALYZE, PRAGMA optimize, incremental_vacuum i provjera.
+
+Članovi, rezultati i prisustvo stalno se brišu i ponovno upisuju (tijela
+upravljanja npr. pri svakom spremanju kluba), pa statistike planera
+zastarijevaju, a slobodne stranice ostaju u datoteci. Posao:
+  - ANALYZE + PRAGMA optimize (svježe statistike za planer upita),
+  - auto_vacuum=INCREMENTAL (nove baze odmah; postojeće jednom kroz VACUUM
+    iz naredbenog retka) i PRAGMA incremental_vacuum,
+  - PRAGMA quick_check (ili integrity_check) i checkpoint WAL-a,
+  - veličina datoteke, slobodne stranice i neiskorišteni prostor u
+    stranicama (dbstat) prije i poslije, zapisani u maintenance_log.
+
+Aplikacija pri pokretanju posao pokreće u pozadini kad je zadnji stariji
+od MAINTENANCE_DAYS dana (jedan proces ga preuzme, ostali preskoče).
+
+▶ Pokretanje:
+    python -m hk.maintenance run                 # + --full-check za integrity_check
+    python -m hk.maintenance history
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from hk.config import DB_PATH, MAINTENANCE_DAYS
+from hk.db import get_conn
+from hk.sequence import run_immediate
+
+log = logging.getLogger(__name__)
+
+AUTO_VACUUM = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+APP_ANALYSIS_LIMIT = 1000   # pri pokretanju aplikacije ANALYZE ne drži bazu predugo
+CLAIM_TIMEOUT = timedelta(hours=1)   # nezavršen prolaz stariji od toga smatra se prekinutim
+
+
+def metrics(conn: sqlite3.Connection, db_path: Optional[str] = None) -> dict:
+    """Veličina datoteke, slobodne stranice i neiskorišteni prostor u stranicama."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    try:
+        # dbstat: bajtovi u stranicama koji ne nose podatke (fragmentacija unutar stranica)
+        used, unused = conn.execute("SELECT SUM(pgsize), SUM(unused) FROM dbstat").fetchone()
+        unused_pct = round(100.0 * unused / used, 1) if used else 0.0
+    except sqlite3.OperationalError:
+        unused_pct = None
+    path = db_path or DB_PATH
+    return {"pages": pages, "free_pages": free, "free_pct": round(100.0 * free / pages, 1) if pages else 0.0,
+            "unused_pct": unused_pct, "file_bytes": page_size * pages,
+            "wal_bytes": os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0,
+            "auto_vacuum": AUTO_VACUUM.get(conn.execute("PRAGMA auto_vacuum").fetchone()[0], "?")}
+
+
+def last_run(conn: sqlite3.Connection, now: Optional[datetime] = None) -> Optional[str]:
+    """Početak zadnjeg završenog prolaza ili prolaza u tijeku (nezavršen i mlađi od CLAIM_TIMEOUT).
+
+    Prolaz prekinut rušenjem ili gašenjem procesa nikad ne dobije finished_at; nakon
+    CLAIM_TIMEOUT više se ne broji, pa ne blokira održavanje MAINTENANCE_DAYS dana.
+    """
+    stale = ((now or datetime.now()) - CLAIM_TIMEOUT).isoformat(timespec="seconds")
+    row = conn.execute("""SELECT MAX(started_at) FROM maintenance_log
+                          WHERE finished_at IS NOT NULL OR started_at > ?""", (stale,)).fetchone()
+    return row[0] if row else None
+
+
+def _claim(conn: sqlite3.Connection, trigger: str, due_days: Optional[float]) -> Optional[int]:
+    """Zapis o početku posla; s due_days samo ako je zadnji stariji (jedan proces preuzima)."""
+    def work(c):
+        now = datetime.now()
+        if due_days is not None:
+            last = last_run(c, now)
+            if last and datetime.fromisoformat(last) > now - timedelta(days=due_days):
+                return None
+        return c.execute("INSERT INTO maintenance_log(started_at, trigger) VALUES (?,?)",
+                         (now.isoformat(timespec="seconds"), trigger)).lastrowid
+    return run_immediate(conn, work)
+
+
+def run(db_path: Optional[str] = None, full_check: bool = False, convert: bool = True,
+        analysis_limit: int = 0, trigger: str = "cli", due_days: Optional[float] = None) -> Optional[dict]:
+    """Jedan prolaz održavanja; vraća zapis iz maintenance_log (None ako još nije na redu).
+
+    convert: postojeću bazu prebaci na auto_vacuum=INCREMENTAL (puni VACUUM, drži bazu
+    zaključanom dok traje) – iz naredbenog retka da, pri pokretanju aplikacije ne.
+    """
+    path = db_path or DB_PATH
+    conn = get_conn(path)
+    try:
+        run_id = _claim(conn, trigger, due_days)
+        if run_id is None:
+            return None
+        t0 = time.perf_counter()
+        before = metrics(conn, path)
+        notes = []
+        try:
+            if before["auto_vacuum"] != "INCREMENTAL":
+                if convert:
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
+                    notes.append("auto_vacuum=INCREMENTAL (VACUUM)")
+                else:
+                    notes.append("auto_vacuum nije INCREMENTAL – pokreni python -m hk.maintenance run")
+            if analysis_limit:
+                conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+            check = "; ".join(r[0] for r in conn.execute(
+                "PRAGMA integrity_check" if full_check else "PRAGMA quick_check").fetchall()[:5])
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        except sqlite3.Error as e:
+            check = None
+            notes.append(f"greška: {e}")
+        after = metrics(conn, path)
+        conn.execute(
+            """UPDATE maintenance_log SET finished_at=?, ms=?, integrity=?, auto_vacuum=?,
+                   file_bytes_before=?, free_pages_before=?, unused_pct_before=?,
+                   file_bytes_after=?, free_pages_after=?, unused_pct_after=?, pages_after=?, notes=?
+               WHERE id=?""",
+            (datetime.now().isoformat(timespec="seconds"), round((time.perf_counter() - t0) * 1000, 1),
+             check, after["auto_vacuum"], before["file_bytes"], before["free_pages"], before["unused_pct"],
+             after["file_bytes"], after["free_pages"], after["unused_pct"], after["pages"],
+             "; ".join(notes), run_id))
+        conn.commit()
+        return history(conn, 1).iloc[0].to_dict()
+    finally:
+        conn.close()
+
+
+def start_if_due(db_path: Optional[str] = None, due_days: float = MAINTENANCE_DAYS) -> threading.Thread:
+    """Održavanje u pozadinskoj niti ako je zadnje starije od due_days (pokretanje aplikacije)."""
+    def work():
+        try:
+            run(db_path, convert=False, analysis_limit=APP_ANALYSIS_LIMIT, trigger="app", due_days=due_days)
+        except Exception:
+            log.exception("Održavanje baze nije uspjelo")
+    t = threading.Thread(target=work, name="hk-maintenance", daemon=True)
+    t.start()
+    return t
+
+
+def history(conn: sqlite3.Connection, limit: int = 30) -> pd.DataFrame:
+    """Zadnji prolazi održavanja, od najnovijeg (veličine u MB)."""
+    return pd.read_sql_query(
+        """SELECT started_at AS početak, trigger AS pokrenuto, ms, integrity AS provjera, auto_vacuum,
+                  ROUND(file_bytes_before/1048576.0, 2) AS mb_prije, ROUND(file_bytes_after/1048576.0, 2) AS mb_poslije,
+                  free_pages_before AS slobodne_prije, free_pages_after AS slobodne_poslije,
+                  ROUND(100.0*free_pages_after/pages_after, 1) AS slobodne_pct,
+                  unused_pct_before AS neiskorišteno_pct_prije, unused_pct_after AS neiskorišteno_pct_poslije,
+                  notes AS napomena
+           FROM maintenance_log WHERE finished_at IS NOT NULL
+           ORDER BY id DESC LIMIT ?""", conn, params=(limit,))
+
+
+def main(argv=None):
+    from hk.db import init_db
+
+    ap = argparse.ArgumentParser(description="Održavanje baze: ANALYZE, optimize, incremental_vacuum, provjera.")
+    ap.add_argument("--db", default=DB_PATH, help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("run", help="jedan prolaz održavanja")
+    rp.add_argument("--full-check", action="store_true", help="PRAGMA integrity_check umjesto quick_check")
+    rp.add_argument("--if-due", action="store_true", help=f"samo ako je zadnje starije od {MAINTENANCE_DAYS} dana")
+    hp = sub.add_parser("history", help="povijest veličine i fragmentacije")
+    hp.add_argument("--limit", type=int, default=30)
+    args = ap.parse_args(argv)
+
+    init_db(args.db)
+    if args.cmd == "run":
+        r = run(args.db, args.full_check, due_days=MAINTENANCE_DAYS if args.if_due else None)
+        if r is None:
+            print("Održavanje još nije na redu.")
+            return
+        print(f"Održavanje: {r['ms']} ms, provjera {r['provjera']}, {r['mb_prije']} → {r['mb_poslije']} MB, "
+              f"slobodne stranice {r['slobodne_prije']} → {r['slobodne_poslije']}, auto_vacuum {r['auto_vacuum']}")
+        if r["napomena"]:
+            print(r["napomena"])
+    else:
+        conn = get_conn(args.db)
+        print(history(conn, args.limit).to_string(index=False))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Analitika statistike u DuckDB-u (opcionalno; pip install duckdb).
+
+SQLite datoteka se u DuckDB priključuje samo za čitanje (ATTACH … READ_ONLY),
+ili se upiti izvode nad Parquet snimkom koja se osvježava kad je baza
+promijenjena, a snimka starija od max_age_s. Upiti (sažetak za tablicu i
+grafove, medalje po sezoni i stilu, percentil plasmana) vraćaju iste
+stupce kao hk/queries.py, pa Statistika samo bira izvor.
+
+Uključuje se s HK_STATS_ENGINE=duckdb (i HK_STATS_SNAPSHOT_DIR za Parquet);
+bez paketa duckdb ili kad DuckDB ne uspije (proširenje, ATTACH, snimka)
+ostaje SQLite.
+
+▶ Snimka i usporedba sa SQLite putem:
+    python -m hk.olap snapshot --db hk_podravka.db --out snapshot/
+    python -m hk.olap bench --db bench.db --repeat 5
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from hk.config import DB_PATH, STATS_ENGINE, STATS_SNAPSHOT_DIR
+from hk.db import fold
+
+try:
+    import duckdb
+except Exception:
+    duckdb = None
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_MAX_AGE_S = 600
+
+# Tipizirani pogledi nad SQLite tablicama (sqlite_all_varchar: stupci s miješanim
+# tipovima ne ruše čitanje, brojevi se pretvaraju s TRY_CAST)
+TABLES: Dict[str, str] = {
+    "competitions": """
+        SELECT TRY_CAST(id AS BIGINT) AS id, kind, age_group, style, date_from,
+               TRY_CAST(total_competitors AS BIGINT) AS total_competitors
+        FROM hk.competitions""",
+    "competition_results": """
+        SELECT TRY_CAST(id AS BIGINT) AS id, TRY_CAST(competition_id AS BIGINT) AS competition_id,
+               TRY_CAST(member_id AS BIGINT) AS member_id, style,
+               TRY_CAST(wins AS BIGINT) AS wins, TRY_CAST(losses AS BIGINT) AS losses,
+               TRY_CAST(bouts_total AS BIGINT) AS bouts_total, TRY_CAST(placement AS BIGINT) AS placement
+        FROM hk.competition_results""",
+    "members": """
+        SELECT TRY_CAST(id AS BIGINT) AS id, full_name
+        FROM hk.members""",
+}
+
+# Filtri po imenu i vrsti uspoređuju hk_fold(stupac) s hk_fold(upis) – ista Python funkcija
+# kao u SQLite-u (hk.db.fold), pa oba izvora vraćaju iste retke i za Š/Ž/Đ
+SUMMARY_SQL = """
+    SELECT c.kind, c.age_group, c.style,
+           COUNT(DISTINCT c.id) AS broj_natjecanja,
+           CAST(SUM(COALESCE(cr.wins,0)) AS BIGINT) AS pobjede,
+           CAST(SUM(COALESCE(cr.losses,0)) AS BIGINT) AS porazi,
+           CAST(SUM(COALESCE(cr.bouts_total,0)) AS BIGINT) AS ukupno_borbi,
+           COUNT(*) FILTER (WHERE cr.placement=1) AS zlato,
+           COUNT(*) FILTER (WHERE cr.placement=2) AS srebro,
+           COUNT(*) FILTER (WHERE cr.placement=3) AS bronca
+    FROM competitions c
+    LEFT JOIN competition_results cr ON c.id=cr.competition_id
+    LEFT JOIN members m ON m.id=cr.member_id
+    WHERE 1=1{where}
+    GROUP BY c.kind, c.age_group, c.style
+    ORDER BY broj_natjecanja DESC"""
+
+MEDALS_SQL = """
+    SELECT any_value(m.full_name) AS sportaš, substr(c.date_from,1,4) AS sezona,
+           COALESCE(NULLIF(cr.style,''), c.style) AS stil, COUNT(*) AS nastupa,
+           COUNT(*) FILTER (WHERE cr.placement=1) AS zlato,
+           COUNT(*) FILTER (WHERE cr.placement=2) AS srebro,
+           COUNT(*) FILTER (WHERE cr.placement=3) AS bronca,
+           COUNT(*) FILTER (WHERE cr.placement BETWEEN 1 AND 3) AS medalje
+    FROM competition_results cr
+    JOIN competitions c ON c.id=cr.competition_id
+    JOIN members m ON m.id=cr.member_id
+    WHERE c.date_from <> ''{where}
+    GROUP BY m.id, 2, 3
+    ORDER BY sezona DESC, medalje DESC, sportaš"""
+
+PERCENTILE_SQL = """
+    SELECT any_value(m.full_name) AS sportaš, COUNT(*) AS nastupa,
+           avg(p) AS prosjek, median(p) AS medijan, max(p) AS najbolji
+    FROM (SELECT cr.member_id,
+                 100.0 * (c.total_competitors - cr.placement) / (c.total_competitors - 1) AS p
+          FROM competition_results cr
+          JOIN competitions c ON c.id=cr.competition_id
+          JOIN members m ON m.id=cr.member_id
+          WHERE c.total_competitors > 1 AND cr.placement BETWEEN 1 AND c.total_competitors{where}) r
+    JOIN members m ON m.id=r.member_id
+    GROUP BY m.id
+    ORDER BY medijan DESC, nastupa DESC, m.id"""
+
+
+def _lit(s: str) -> str:
+    return "'" + s.replace("'", "''") + "'"
+
+
+def _filters(year: Optional[str], member: str, kind: str) -> Tuple[str, List[str]]:
+    where, params = "", []
+    if year:
+        where += " AND c.date_from LIKE ?"; params.append(f"{year}%")
+    if member.strip():
+        where += " AND hk_fold(m.full_name) LIKE ?"; params.append(f"%{fold(member)}%")
+    if kind.strip():
+        where += " AND hk_fold(c.kind) LIKE ?"; params.append(f"%{fold(kind)}%")
+    return where, params
+
+
+def _source_mtime(db_path: str) -> float:
+    return max(os.path.getmtime(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))
+
+
+class DuckStats:
+    """DuckDB nad SQLite bazom (ATTACH READ_ONLY) ili nad njezinom Parquet snimkom."""
+
+    def __init__(self, db_path: str, snapshot_dir: Optional[str] = None, max_age_s: int = SNAPSHOT_MAX_AGE_S):
+        if duckdb is None:
+            raise RuntimeError("DuckDB nije instaliran (pip install duckdb)")
+        self.db_path = os.path.abspath(db_path)
+        self.snapshot_dir = os.path.abspath(snapshot_dir) if snapshot_dir else None
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self.con = duckdb.connect()
+        self.con.create_function("hk_fold", fold, ["VARCHAR"], "VARCHAR", side_effects=False)
+        self.con.execute("INSTALL sqlite")
+        self.con.execute("LOAD sqlite")
+        self.con.execute("SET sqlite_all_varchar = true")
+        self.con.execute(f"ATTACH {_lit(self.db_path)} AS hk (TYPE SQLITE, READ_ONLY)")
+        if self.snapshot_dir:
+            if self.snapshot_stale():
+                self.refresh_snapshot()
+            for t in TABLES:
+                self.con.execute(f"CREATE OR REPLACE VIEW {t} AS "
+                                 f"SELECT * FROM read_parquet({_lit(self._parquet(t))})")
+        else:
+            for t, sql in TABLES.items():
+                self.con.execute(f"CREATE OR REPLACE VIEW {t} AS {sql}")
+
+    @property
+    def source(self) -> str:
+        return "duckdb (parquet)" if self.snapshot_dir else "duckdb (sqlite)"
+
+    def _parquet(self, table: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{table}.parquet")
+
+    def snapshot_stale(self) -> bool:
+        """Nema snimke, ili je baza promijenjena nakon nje, a snimka je starija od max_age_s."""
+        marker = self._parquet("competitions")
+        if not os.path.exists(marker):
+            return True
+        snap_t = os.path.getmtime(marker)
+        return _source_mtime(self.db_path) > snap_t and time.time() - snap_t > self.max_age_s
+
+    def refresh_snapshot(self):
+        """Tipizirane tablice u Parquet (ZSTD); svaka datoteka se zamjenjuje atomarno."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with self._lock:
+            cur = self.con.cursor()
+            for t, sql in TABLES.items():
+                tmp = self._parquet(t) + ".tmp"
+                cur.execute(f"COPY ({sql}) TO {_lit(tmp)} (FORMAT PARQUET, COMPRESSION ZSTD)")
+                os.replace(tmp, self._parquet(t))
+            cur.close()
+
+    def _query(self, sql: str, year: Optional[str], member: str, kind: str) -> pd.DataFrame:
+        if self.snapshot_dir and self.snapshot_stale():
+            self.refresh_snapshot()
+        where, params = _filters(year, member, kind)
+        # cursor() = zasebna konekcija na istu bazu; sigurno iz više Streamlit niti
+        cur = self.con.cursor()
+        try:
+            return cur.execute(sql.format(where=where), params).df()
+        finally:
+            cur.close()
+
+    def summary(self, year: Optional[str] = None, member: str = "", kind: str = "") -> pd.DataFrame:
+        return self._query(SUMMARY_SQL, year, member, kind)
+
+    def medals_by_season(self, year: Optional[str] = None, member: str = "", kind: str = "") -> pd.DataFrame:
+        return self._query(MEDALS_SQL, year, member, kind)
+
+    def placement_percentiles(self, year: Optional[str] = None, member: str = "", kind: str = "") -> pd.DataFrame:
+        # zaokruživanje u pandasu kao u hk/queries.py (DuckDB round: x.x5 prema gore, pandas: na parnu)
+        out = self._query(PERCENTILE_SQL, year, member, kind)
+        out[["prosjek", "medijan", "najbolji"]] = out[["prosjek", "medijan", "najbolji"]].round(1)
+        return out
+
+
+_engine: Optional[DuckStats] = None
+_engine_error: Optional[str] = None
+_engine_lock = threading.Lock()
+
+
+def engine() -> Optional[DuckStats]:
+    """DuckDB izvor za Statistiku ako je uključen (HK_STATS_ENGINE=duckdb) i dostupan, inače None.
+
+    Neuspjelo pokretanje (INSTALL sqlite bez mreže, ATTACH, snimka) zapisuje se jednom
+    u log i u engine_error(); do ponovnog pokretanja aplikacije ostaje SQLite.
+    """
+    global _engine, _engine_error
+    if STATS_ENGINE != "duckdb":
+        return None
+    if duckdb is None:
+        _engine_error = "paket duckdb nije instaliran"
+        return None
+    with _engine_lock:
+        if _engine is None and _engine_error is None:
+            try:
+                _engine = DuckStats(DB_PATH, STATS_SNAPSHOT_DIR or None)
+            except Exception as e:
+                log.exception("DuckDB za statistiku nije dostupan")
+                _engine_error = str(e) or type(e).__name__
+        return _engine
+
+
+def engine_error() -> Optional[str]:
+    """Zašto DuckDB nije dostupan (None ako jest ili nije uključen)."""
+    return _engine_error
+
+
+# ==========================
+# MJERENJE
+# ==========================
+def bench(db_path: str, repeat: int = 5, snapshot_dir: Optional[str] = None) -> List[dict]:
+    """p50 trajanja svakog upita: SQLite (hk.queries) prema DuckDB-u; provjerava i jednakost rezultata."""
+    from hk import queries as q
+    from hk.db import get_conn
+
+    cases = [("sažetak (sve)", "summary", "stats_summary", (None, "", "")),
+             ("sažetak (godina)", "summary", "stats_summary", (_latest_year(db_path), "", "")),
+             ("medalje po sezoni i stilu", "medals_by_season", "medals_by_season", (None, "", "")),
+             ("medalje (filtar \"ž\")", "medals_by_season", "medals_by_season", (None, "ž", "")),
+             ("percentil plasmana", "placement_percentiles", "placement_percentiles", (None, "", ""))]
+    engines = []
+    if duckdb is not None:
+        engines.append(DuckStats(db_path))
+        if snapshot_dir:
+            engines.append(DuckStats(db_path, snapshot_dir, max_age_s=0))
+    conn = get_conn(db_path)
+
+    def timed(fn):
+        fn()  # zagrijavanje
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return round(statistics.median(samples), 1), out
+
+    rows = []
+    for label, duck_fn, sql_fn, args in cases:
+        ms, ref = timed(lambda: getattr(q, sql_fn)(conn, *args))
+        row = {"upit": label, "sqlite_ms": ms, "redaka": len(ref)}
+        for eng in engines:
+            ms, out = timed(lambda: getattr(eng, duck_fn)(*args))
+            row[f"{eng.source}_ms"] = ms
+            row[f"{eng.source}_isto"] = _same(ref, out)
+        rows.append(row)
+    conn.close()
+    return rows
+
+
+def _latest_year(db_path: str) -> Optional[str]:
+    from hk import queries as q
+    from hk.db import get_conn
+    conn = get_conn(db_path)
+    years = q.competition_years(conn)
+    conn.close()
+    return years[-1] if years else None
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Isti skup redaka (redoslijed jednakih ključeva sortiranja smije se razlikovati)."""
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    key = list(a.columns)
+    norm = lambda df: df.astype(str).sort_values(key).reset_index(drop=True)
+    return norm(a).equals(norm(b))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="DuckDB analitika statistike: Parquet snimka i mjerenje.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("snapshot", help="osvježi Parquet snimku")
+    sp.add_argument("--db", default=DB_PATH)
+    sp.add_argument("--out", default=STATS_SNAPSHOT_DIR or "snapshot")
+    bp = sub.add_parser("bench", help="SQLite prema DuckDB-u nad istom bazom")
+    bp.add_argument("--db", default=DB_PATH)
+    bp.add_argument("--repeat", type=int, default=5)
+    bp.add_argument("--snapshot", help="mapa za Parquet snimku (mjeri i Parquet izvor)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "snapshot":
+        eng = DuckStats(args.db, args.out, max_age_s=0)
+        eng.refresh_snapshot()
+        print(f"Snimka osvježena: {eng.snapshot_dir}")
+        return
+    if duckdb is None:
+        print("DuckDB nije instaliran (pip install duckdb) – mjeri se samo SQLite put.")
+    rows = bench(args.db, args.repeat, args.snapshot)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Profil ponovnog izvođenja (rerun): vrijeme po odjeljku i po SQL naredbi.
+
+Uključuje se po želji (HK_PROFILE=1 ili ?profile=1 u URL-u). Dok je profil
+aktivan za trenutnu nit, get_conn() vraća konekciju koja mjeri svaku
+naredbu (execute + dohvat redaka), trace callbackom broji sve izvedene
+naredbe, a progress callbackom broji korake SQLite VM-a po naredbi.
+Odjeljci i skupi koraci (init_db, Excel, grafovi) mjere se sa span().
+
+Rezultat se može spremiti kao JSON ili kao "folded stacks" (ulaz za
+flamegraph.pl / speedscope).
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+PROGRESS_STEPS = 1000   # progress callback svakih N VM instrukcija
+
+_local = threading.local()
+
+
+def current() -> Optional["Profiler"]:
+    """Profiler aktivan u ovoj niti (ili None)."""
+    return getattr(_local, "profiler", None)
+
+
+def normalize_sql(sql: str, limit: int = 240) -> str:
+    s = re.sub(r"\s+", " ", sql or "").strip()
+    return s if len(s) <= limit else s[: limit - 1] + "…"
+
+
+class Profiler:
+    def __init__(self):
+        self.reruns = 0
+        self.last_rerun_ms: Optional[float] = None
+        self.statements: Dict[str, Dict[str, float]] = {}
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.traced: Dict[str, int] = {}
+        self.folded: Dict[str, float] = {}   # putanja stoga → vlastito vrijeme (µs)
+        self._stack: List[list] = []          # [ime, t0, vrijeme_djece]
+        self._sql_key: Optional[str] = None
+
+    # --- aktivacija za nit ---
+    @contextmanager
+    def activate(self):
+        prev = current()
+        _local.profiler = self
+        try:
+            yield self
+        finally:
+            _local.profiler = prev
+
+    @contextmanager
+    def rerun(self):
+        self.reruns += 1
+        t0 = time.perf_counter()
+        with self.activate(), self.span("rerun"):
+            yield self
+        self.last_rerun_ms = (time.perf_counter() - t0) * 1000
+
+    # --- mjerenje ---
+    @contextmanager
+    def span(self, name: str, kind: str = "span"):
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - frame[1]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][2] += dt
+            path = ";".join(f[0].replace(";", ",") for f in self._stack + [frame])
+            self.folded[path] = self.folded.get(path, 0.0) + (dt - frame[2]) * 1e6
+            if kind == "span":
+                self._add(self.spans, name, dt)
+
+    @contextmanager
+    def sql(self, sql: str):
+        key = normalize_sql(sql)
+        self.statements.setdefault(key, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "vm_steps": 0})
+        prev, self._sql_key = self._sql_key, key
+        t0 = time.perf_counter()
+        try:
+            with self.span("sql: " + key[:80], kind="sql"):
+                yield key
+        finally:
+            self._add(self.statements, key, time.perf_counter() - t0)
+            self._sql_key = prev
+
+    def add_fetch(self, key: Optional[str], seconds: float):
+        """Vrijeme dohvata redaka pribroji naredbi koja ih je proizvela."""
+        if key and key in self.statements:
+            self.statements[key]["total_ms"] += seconds * 1000
+            self.statements[key]["fetch_ms"] = self.statements[key].get("fetch_ms", 0.0) + seconds * 1000
+            path = ";".join([f[0] for f in self._stack] + ["sql: " + key[:80]]).replace("\n", " ")
+            self.folded[path] = self.folded.get(path, 0.0) + seconds * 1e6
+
+    def on_trace(self, stmt: str):
+        key = normalize_sql(stmt, 120)
+        self.traced[key] = self.traced.get(key, 0) + 1
+
+    def on_progress(self) -> int:
+        # vraćanje 0 znači "nastavi"; koraci se pripisuju naredbi koja se izvodi
+        if self._sql_key is not None:
+            self.statements[self._sql_key]["vm_steps"] += PROGRESS_STEPS
+        return 0
+
+    @staticmethod
+    def _add(table: Dict[str, Dict[str, float]], key: str, seconds: float):
+        ms = seconds * 1000
+        row = table.setdefault(key, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        row["calls"] += 1
+        row["total_ms"] += ms
+        row["max_ms"] = max(row["max_ms"], ms)
+
+    # --- izvještaji ---
+    def top_statements(self, n: int = 15) -> List[dict]:
+        rows = [{"sql": k, **v} for k, v in self.statements.items()]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return [{k: (round(v, 2) if isinstance(v, float) else v) for k, v in r.items()} for r in rows[:n]]
+
+    def top_spans(self) -> List[dict]:
+        rows = [{"span": k, **v} for k, v in self.spans.items() if k != "rerun"]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return [{k: (round(v, 2) if isinstance(v, float) else v) for k, v in r.items()} for r in rows]
+
+    def to_dict(self) -> dict:
+        return {"reruns": self.reruns, "last_rerun_ms": self.last_rerun_ms,
+                "spans": self.top_spans(), "statements": self.top_statements(n=10**6),
+                "traced_statements": self.traced}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_folded(self) -> str:
+        return "\n".join(f"{path} {int(us)}" for path, us in sorted(self.folded.items()) if us >= 1) + "\n"
+
+    def dump(self, directory: str, prefix: str = "hk_profile"):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{prefix}.json"), "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        with open(os.path.join(directory, f"{prefix}.folded"), "w", encoding="utf-8") as f:
+            f.write(self.to_folded())
+
+
+@contextmanager
+def span(name: str):
+    """Izmjeri blok ako je profil aktivan; inače ne radi ništa."""
+    prof = current()
+    if prof is None:
+        yield
+        return
+    with prof.span(name):
+        yield
+
+
+def profiled(name: Optional[str] = None):
+    """Dekorator: cijeli poziv funkcije kao span."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ==========================
+# KONEKCIJA KOJA MJERI SQL
+# ==========================
+
+class ProfiledCursor(sqlite3.Cursor):
+    _key: Optional[str] = None
+
+    def execute(self, sql, parameters=()):
+        prof = current()
+        if prof is None:
+            return super().execute(sql, parameters)
+        with prof.sql(sql) as key:
+            self._key = key
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        prof = current()
+        if prof is None:
+            return super().executemany(sql, seq_of_parameters)
+        with prof.sql(sql) as key:
+            self._key = key
+            return super().executemany(sql, seq_of_parameters)
+
+    def _timed_fetch(self, fetch, *args):
+        prof = current()
+        if prof is None:
+            return fetch(*args)
+        t0 = time.perf_counter()
+        out = fetch(*args)
+        prof.add_fetch(self._key, time.perf_counter() - t0)
+        return out
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        prof = current()
+        if prof is not None:
+            self.set_trace_callback(prof.on_trace)
+            self.set_progress_handler(prof.on_progress, PROGRESS_STEPS)
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_factory():
+    """Tvornica za sqlite3.connect: mjerna konekcija samo dok je profil aktivan."""
+    return ProfiledConnection if current() is not None else sqlite3.Connection
+
+
+def enabled_by_env() -> bool:
+    return os.environ.get("HK_PROFILE", "").lower() in ("1", "true", "da", "yes")
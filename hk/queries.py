@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Pristup podacima za odjeljke web aplikacije – sav SQL ekrana na jednom mjestu.
+
+Odjeljci (hk/views/) ne pišu SQL nego zovu ove funkcije i repozitorije
+(hk/repos.py – članovi, natjecanja, rezultati, prisustvo), pa se indeksi,
+priručna memorija i konekcije mijenjaju samo ovdje. Funkcije potvrđuju
+transakciju gdje je navedeno; naredbe za pozadinskog pisača (hk/writer.py)
+izložene su kao konstante. Domenski moduli (analytics, camps, dataio,
+expiry, schedule) zadržavaju svoje upite.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from hk.db import fold
+
+# ==========================
+# KLUB
+# ==========================
+def club_info(conn: sqlite3.Connection) -> pd.DataFrame:
+    return pd.read_sql_query("SELECT * FROM club_info WHERE id=1", conn)
+
+
+def save_club(conn: sqlite3.Connection, info: Dict[str, str], board: Iterable[Tuple[str, str, str]],
+              supervisory: Iterable[Tuple[str, str, str]], docs: Iterable[Tuple[str, str, str]]):
+    """Podaci kluba, članovi tijela (zamjena cijelog popisa) i novi dokumenti; potvrđuje."""
+    now = datetime.now().isoformat()
+    conn.execute("""UPDATE club_info SET
+                    name=?, street=?, city_zip=?, email=?, address=?, oib=?, web=?, iban=?,
+                    president=?, secretary=?, instagram=?, facebook=?, tiktok=?, updated_at=?
+                    WHERE id=1""",
+                 (info["name"], info["street"], info["city_zip"], info["email"],
+                  f"{info['street']}, {info['city_zip']}", info["oib"], info["web"], info["iban"],
+                  info["president"], info["secretary"], info["instagram"], info["facebook"], info["tiktok"], now))
+    conn.execute("DELETE FROM board_members WHERE kind IN ('board','supervisory')")
+    conn.executemany("INSERT INTO board_members(kind,full_name,phone,email) VALUES ('board',?,?,?)", list(board))
+    conn.executemany("INSERT INTO board_members(kind,full_name,phone,email) VALUES ('supervisory',?,?,?)",
+                     list(supervisory))
+    conn.executemany("INSERT INTO club_docs(kind,filename,path,uploaded_at) VALUES (?,?,?,?)",
+                     [(kind, fname, path, now) for kind, fname, path in docs])
+    conn.commit()
+
+
+def club_logo(conn: sqlite3.Connection) -> str:
+    r = conn.execute("SELECT logo_path FROM club_info WHERE id=1").fetchone()
+    return (r[0] or "") if r else ""
+
+
+def set_club_logo(conn: sqlite3.Connection, path: str):
+    conn.execute("UPDATE club_info SET logo_path=?, updated_at=? WHERE id=1", (path, datetime.now().isoformat()))
+    conn.commit()
+
+
+def club_docs(conn: sqlite3.Connection) -> pd.DataFrame:
+    return pd.read_sql_query("SELECT id, kind AS vrsta, filename AS datoteka, uploaded_at AS datum "
+                             "FROM club_docs ORDER BY id DESC", conn)
+
+
+# ==========================
+# GRUPE
+# ==========================
+def groups(conn: sqlite3.Connection) -> List[Tuple[int, str]]:
+    return conn.execute("SELECT id, name FROM groups ORDER BY name").fetchall()
+
+
+def add_group(conn: sqlite3.Connection, name: str):
+    """Potvrđuje; postojeće ime diže sqlite3.IntegrityError."""
+    conn.execute("INSERT INTO groups(name) VALUES (?)", (name,))
+    conn.commit()
+
+
+def rename_group(conn: sqlite3.Connection, gid: int, name: str):
+    conn.execute("UPDATE groups SET name=? WHERE id=?", (name, int(gid)))
+    conn.commit()
+
+
+def delete_group(conn: sqlite3.Connection, gid: int):
+    conn.execute("DELETE FROM groups WHERE id=?", (int(gid),))
+    conn.commit()
+
+
+def group_roster(conn: sqlite3.Connection, gid: int) -> pd.DataFrame:
+    return pd.read_sql_query("""
+        SELECT m.id, m.full_name AS član, m.active_competitor AS aktivni, m.veteran
+        FROM members m WHERE m.group_id=? ORDER BY m.full_name
+    """, conn, params=(gid,))
+
+
+# ==========================
+# ČLANOVI
+# ==========================
+def member_results(conn: sqlite3.Connection, member_id: int) -> pd.DataFrame:
+    rdf = pd.read_sql_query("""
+        SELECT c.name AS natjecanje, c.date_from AS datum, cr.weight_category AS kategorija,
+               cr.style AS stil, cr.bouts_total AS borbi, cr.wins AS pobjede, cr.losses AS porazi, cr.placement AS plasman
+        FROM competition_results cr
+        JOIN competitions c ON c.id=cr.competition_id
+        WHERE cr.member_id=? ORDER BY c.date_from DESC
+    """, conn, params=(int(member_id),))
+    if not rdf.empty:
+        rdf["datum"] = pd.to_datetime(rdf["datum"]).dt.strftime("%d.%m.%Y.")
+    return rdf
+
+
+def veterans(conn: sqlite3.Connection) -> pd.DataFrame:
+    return pd.read_sql_query("""
+        SELECT id, full_name AS ime_prezime, athlete_email, parent_email, athlete_phone, parent_phone
+        FROM members WHERE veteran=1 ORDER BY full_name
+    """, conn)
+
+
+# ==========================
+# TRENERI
+# ==========================
+def coaches(conn: sqlite3.Connection) -> List[Tuple[int, str]]:
+    return conn.execute("SELECT id, full_name FROM coaches ORDER BY full_name").fetchall()
+
+
+def insert_coach(conn: sqlite3.Connection, values: Sequence, group_id: Optional[int] = None) -> int:
+    """values: full_name, first_name, last_name, dob, oib, email, iban, photo_path; potvrđuje."""
+    cur = conn.execute("""INSERT INTO coaches (full_name,first_name,last_name,dob,oib,email,iban,photo_path)
+                          VALUES (?,?,?,?,?,?,?,?)""", tuple(values))
+    if group_id:
+        conn.execute("INSERT INTO coach_groups (coach_id,group_id,assigned_at) VALUES (?,?,?)",
+                     (cur.lastrowid, group_id, datetime.now().isoformat()))
+    conn.commit()
+    return cur.lastrowid
+
+
+def assign_coach(conn: sqlite3.Connection, coach_id: int, gid: int):
+    conn.execute("INSERT INTO coach_groups (coach_id,group_id,assigned_at) VALUES (?,?,?)",
+                 (int(coach_id), int(gid), datetime.now().isoformat()))
+    conn.commit()
+
+
+def add_coach_docs(conn: sqlite3.Connection, coach_id: int, docs: Iterable[Tuple[str, str, str]]):
+    now = datetime.now().isoformat()
+    conn.executemany("INSERT INTO coach_docs (coach_id,kind,filename,path,uploaded_at) VALUES (?,?,?,?,?)",
+                     [(int(coach_id), kind, fname, path, now) for kind, fname, path in docs])
+    conn.commit()
+
+
+def ensure_coaches(conn: sqlite3.Connection, names: Iterable[str]):
+    """Upiši trenere koji još ne postoje (po imenu)."""
+    known = {r[0] for r in conn.execute("SELECT full_name FROM coaches").fetchall()}
+    new = [(n,) for n in dict.fromkeys(names) if n and n not in known]
+    if new:
+        conn.executemany("INSERT INTO coaches (full_name) VALUES (?)", new)
+        conn.commit()
+
+
+# ==========================
+# NATJECANJA I REZULTATI
+# ==========================
+def search_competitions(conn: sqlite3.Connection, kind: str = "", year: str = "", age: str = "",
+                        style: str = "", country: str = "", detailed: bool = False) -> pd.DataFrame:
+    """Pregled natjecanja; prazni filtri se preskaču, datumi dd.mm.yyyy., R.br. od 1."""
+    q = """
+        SELECT id, name AS ime, kind AS vrsta, age_group AS uzrast, style AS stil,
+               date_from AS od, date_to AS do, place AS mjesto, country AS država, country_code AS ISO3
+    """
+    if detailed:
+        q += """, team_rank AS ekipno, club_competitors AS naši, total_competitors AS natjecatelja,
+               total_clubs AS klubova, total_countries AS zemalja"""
+    q += " FROM competitions WHERE 1=1"
+    params: List[str] = []
+    for col, val, pattern in (("kind", kind, "%{}%"), ("date_from", year, "{}%"), ("age_group", age, "%{}%"),
+                              ("style", style, "%{}%"), ("country", country, "%{}%")):
+        if val.strip():
+            q += f" AND {col} LIKE ?"
+            params.append(pattern.format(val))
+    cdf = pd.read_sql_query(q + " ORDER BY date_from DESC", conn, params=params)
+    for col in ("od", "do"):
+        try:
+            cdf[col] = pd.to_datetime(cdf[col]).dt.strftime('%d.%m.%Y.')
+        except Exception:
+            pass
+    cdf.insert(0, 'R.br.', range(1, len(cdf)+1))
+    return cdf
+
+
+# ==========================
+# STATISTIKA
+# ==========================
+def competition_years(conn: sqlite3.Connection) -> List[str]:
+    return [r[0] for r in conn.execute(
+        "SELECT DISTINCT substr(date_from,1,4) FROM competitions WHERE date_from <> '' ORDER BY 1").fetchall()]
+
+
+def stats_summary(conn: sqlite3.Connection, year: Optional[str] = None, member: str = "",
+                  kind: str = "") -> pd.DataFrame:
+    q = """
+        SELECT c.kind, c.age_group, c.style,
+               COUNT(DISTINCT c.id) AS broj_natjecanja,
+               SUM(COALESCE(cr.wins,0)) AS pobjede, SUM(COALESCE(cr.losses,0)) AS porazi,
+               SUM(COALESCE(cr.bouts_total,0)) AS ukupno_borbi,
+               SUM(CASE WHEN cr.placement=1 THEN 1 ELSE 0 END) AS zlato,
+               SUM(CASE WHEN cr.placement=2 THEN 1 ELSE 0 END) AS srebro,
+               SUM(CASE WHEN cr.placement=3 THEN 1 ELSE 0 END) AS bronca
+        FROM competitions c
+        LEFT JOIN competition_results cr ON c.id=cr.competition_id
+        LEFT JOIN members m ON m.id=cr.member_id
+        WHERE 1=1
+    """
+    params: List[str] = []
+    if year:
+        q += " AND c.date_from LIKE ?"; params.append(f"{year}%")
+    if member.strip():
+        q += " AND (hk_fold(m.full_name) LIKE ?)"; params.append(f"%{fold(member)}%")
+    if kind.strip():
+        q += " AND (hk_fold(c.kind) LIKE ?)"; params.append(f"%{fold(kind)}%")
+    q += " GROUP BY c.kind, c.age_group, c.style ORDER BY broj_natjecanja DESC"
+    return pd.read_sql_query(q, conn, params=params)
+
+
+def _result_filters(year: Optional[str], member: str, kind: str) -> Tuple[str, List[str]]:
+    where, params = "", []
+    if year:
+        where += " AND c.date_from LIKE ?"; params.append(f"{year}%")
+    if member.strip():
+        where += " AND hk_fold(m.full_name) LIKE ?"; params.append(f"%{fold(member)}%")
+    if kind.strip():
+        where += " AND hk_fold(c.kind) LIKE ?"; params.append(f"%{fold(kind)}%")
+    return where, params
+
+
+def medals_by_season(conn: sqlite3.Connection, year: Optional[str] = None, member: str = "",
+                     kind: str = "") -> pd.DataFrame:
+    """Medalje po sportašu, sezoni (godina natjecanja) i stilu (stil rezultata, inače natjecanja)."""
+    where, params = _result_filters(year, member, kind)
+    return pd.read_sql_query(f"""
+        SELECT m.full_name AS sportaš, substr(c.date_from,1,4) AS sezona,
+               COALESCE(NULLIF(cr.style,''), c.style) AS stil, COUNT(*) AS nastupa,
+               SUM(CASE WHEN cr.placement=1 THEN 1 ELSE 0 END) AS zlato,
+               SUM(CASE WHEN cr.placement=2 THEN 1 ELSE 0 END) AS srebro,
+               SUM(CASE WHEN cr.placement=3 THEN 1 ELSE 0 END) AS bronca,
+               SUM(CASE WHEN cr.placement BETWEEN 1 AND 3 THEN 1 ELSE 0 END) AS medalje
+        FROM competition_results cr
+        JOIN competitions c ON c.id=cr.competition_id
+        JOIN members m ON m.id=cr.member_id
+        WHERE c.date_from <> ''{where}
+        GROUP BY m.id, 2, 3
+        ORDER BY sezona DESC, medalje DESC, sportaš""", conn, params=params)
+
+
+def placement_percentiles(conn: sqlite3.Connection, year: Optional[str] = None, member: str = "",
+                          kind: str = "") -> pd.DataFrame:
+    """Plasman kao percentil polja: 100 = pobjednik, 0 = zadnji (samo uz poznat broj natjecatelja)."""
+    where, params = _result_filters(year, member, kind)
+    df = pd.read_sql_query(f"""
+        SELECT m.id AS member_id, m.full_name AS sportaš,
+               100.0 * (c.total_competitors - cr.placement) / (c.total_competitors - 1) AS percentil
+        FROM competition_results cr
+        JOIN competitions c ON c.id=cr.competition_id
+        JOIN members m ON m.id=cr.member_id
+        WHERE c.total_competitors > 1 AND cr.placement BETWEEN 1 AND c.total_competitors{where}""",
+                           conn, params=params)
+    out = (df.groupby(["member_id", "sportaš"])["percentil"]
+             .agg(nastupa="count", prosjek="mean", medijan="median", najbolji="max")
+             .reset_index()
+             .sort_values(["medijan", "nastupa"], ascending=[False, False], kind="stable"))
+    out[["prosjek", "medijan", "najbolji"]] = out[["prosjek", "medijan", "najbolji"]].round(1)
+    return out.drop(columns="member_id").reset_index(drop=True)
+
+
+# ==========================
+# PRISUSTVO I PRIPREME
+# ==========================
+SESSION_INSERT = """INSERT INTO sessions (coach_id,group_id,start_ts,end_ts,location,remark)
+                    VALUES (?,?,?,?,?,?)"""
+
+SLOT_DEACTIVATE = "UPDATE schedule_slots SET active=0 WHERE id=?"
+
+
+def schedule_slots(conn: sqlite3.Connection) -> pd.DataFrame:
+    return pd.read_sql_query("""
+        SELECT s.id, g.name AS grupa, c.full_name AS trener, s.weekday AS dan, s.start_time AS početak,
+               s.duration_min AS trajanje_min, s.location AS mjesto, s.active AS aktivan
+        FROM schedule_slots s LEFT JOIN groups g ON g.id=s.group_id LEFT JOIN coaches c ON c.id=s.coach_id
+        ORDER BY g.name, s.weekday, s.start_time""", conn)
+
+
+def sessions(conn: sqlite3.Connection) -> List[Tuple[int, str, str, str]]:
+    return conn.execute("""SELECT s.id, s.start_ts, g.name, c.full_name
+                           FROM sessions s LEFT JOIN groups g ON g.id=s.group_id
+                           LEFT JOIN coaches c ON c.id=s.coach_id ORDER BY s.start_ts DESC""").fetchall()
+
+
+def session_group(conn: sqlite3.Connection, session_id: int) -> Optional[int]:
+    r = conn.execute("SELECT group_id FROM sessions WHERE id=?", (int(session_id),)).fetchone()
+    return r[0] if r else None
+
+
+def insert_camp(conn: sqlite3.Connection, title: str, place: str, coach: str, start: str, end: str):
+    conn.execute("INSERT INTO camps (title,place,coach,start_date,end_date) VALUES (?,?,?,?,?)",
+                 (title, place, coach, start, end))
+    conn.commit()
+
+
+def camps(conn: sqlite3.Connection) -> List[Tuple[int, str, str, str]]:
+    return conn.execute("SELECT id, title, start_date, end_date FROM camps ORDER BY start_date DESC").fetchall()
+
+
+def camp_member_count(conn: sqlite3.Connection, camp_id: int) -> int:
+    return conn.execute("SELECT COUNT(*) FROM camp_attendance WHERE camp_id=?", (int(camp_id),)).fetchone()[0]
+
+
+def session_months(conn: sqlite3.Connection) -> List[str]:
+    return [r[0] for r in conn.execute(
+        "SELECT DISTINCT substr(start_ts,1,7) FROM sessions WHERE start_ts IS NOT NULL ORDER BY 1").fetchall()]
+
+
+def month_totals(conn: sqlite3.Connection, ts_from: str, ts_to: str) -> Tuple[int, int, int, int]:
+    """Treninga, minuta trenera, prisustava i minuta sportaša u [ts_from, ts_to) (ix_sessions_start_ts)."""
+    s = conn.execute("SELECT COUNT(*), COALESCE(SUM((julianday(end_ts)-julianday(start_ts))*24*60),0) "
+                     "FROM sessions WHERE start_ts >= ? AND start_ts < ?", (ts_from, ts_to)).fetchone()
+    a = conn.execute("SELECT COUNT(*), COALESCE(SUM(minutes),0) FROM attendance a JOIN sessions s ON s.id=a.session_id "
+                     "WHERE a.present=1 AND s.start_ts >= ? AND s.start_ts < ?", (ts_from, ts_to)).fetchone()
+    return int(s[0]), int(s[1]), int(a[0]), int(a[1])
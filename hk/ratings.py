@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Rejting sportaša (Elo) po stilu iz pojedinačnih borbi (tablica bouts).
+
+Natjecanja se obrađuju po datumu; svaka borba s poznatim ishodom mijenja
+rejting našeg sportaša i protivnika (protivnici se prate po ključu imena,
+hk/bouts.py). K je 40 dok sportaš nema PROVISIONAL_BOUTS borbi u stilu,
+zatim 20. Nakon svakog natjecanja sprema se snimka rejtinga po sportašu
+i stilu (rating_snapshots) – iz nje je povijest i promjena na ljestvici.
+
+update() obrađuje samo rezultate koji još nisu ocijenjeni, ako su na
+natjecanjima nakon zadnjeg obrađenog. Izmjena ili brisanje već ocijenjene
+borbe, promjena datuma, stila ili uzrasta natjecanja ili ocijenjenog
+rezultata ili rezultat unesen za ranije natjecanje označava ponovno
+računanje od početka (brzo – jedan prolaz).
+
+▶ Pokretanje:
+    python -m hk.ratings update
+    python -m hk.ratings top --age U17 --style GR
+"""
+
+import argparse
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+BASE_RATING = 1500.0
+K_PROVISIONAL = 40.0
+K_STABLE = 20.0
+PROVISIONAL_BOUTS = 15
+
+
+def expected(r_a: float, r_b: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((r_b - r_a) / 400.0))
+
+
+def k_factor(bouts: int) -> float:
+    return K_PROVISIONAL if bouts < PROVISIONAL_BOUTS else K_STABLE
+
+
+# ==========================
+# SHEMA
+# ==========================
+def ensure_ratings(conn: sqlite3.Connection):
+    """Tablice rejtinga, snimaka i okidači za ponovno računanje (poziva init_db nakon ensure_bouts)."""
+    new = not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='rating_pending'").fetchone()
+    outdated = not new and not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='tr_results_rating_upd'").fetchone()
+    if outdated:
+        conn.execute("DROP TRIGGER IF EXISTS tr_competitions_rating_upd")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS athlete_ratings (
+            member_id INTEGER NOT NULL,
+            style TEXT NOT NULL,
+            rating REAL NOT NULL,
+            bouts INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            age_group TEXT,
+            last_date TEXT,
+            PRIMARY KEY (member_id, style)
+        );
+        CREATE INDEX IF NOT EXISTS ix_athlete_ratings_age ON athlete_ratings(age_group, style, rating);
+        CREATE TABLE IF NOT EXISTS opponent_ratings (
+            opponent_key TEXT NOT NULL,
+            style TEXT NOT NULL,
+            rating REAL NOT NULL,
+            bouts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (opponent_key, style)
+        );
+        CREATE TABLE IF NOT EXISTS rating_snapshots (
+            member_id INTEGER NOT NULL,
+            style TEXT NOT NULL,
+            competition_id INTEGER NOT NULL,
+            date TEXT,
+            rating REAL NOT NULL,
+            bouts INTEGER NOT NULL,
+            PRIMARY KEY (member_id, style, competition_id)
+        );
+        -- ocijenjeni rezultati i redoslijed (datum, id natjecanja) zadnjeg obrađenog
+        CREATE TABLE IF NOT EXISTS rated_results (
+            result_id INTEGER PRIMARY KEY,
+            date TEXT,
+            competition_id INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS rating_state (name TEXT PRIMARY KEY, value TEXT);
+        -- rezultati s novim borbama koje update() još nije ocijenio
+        CREATE TABLE IF NOT EXISTS rating_pending (result_id INTEGER PRIMARY KEY);
+
+        CREATE TRIGGER IF NOT EXISTS tr_bouts_rating_ins AFTER INSERT ON bouts
+        BEGIN INSERT OR IGNORE INTO rating_pending(result_id) VALUES (new.result_id); END;
+        CREATE TRIGGER IF NOT EXISTS tr_bouts_rating_del AFTER DELETE ON bouts
+        WHEN EXISTS (SELECT 1 FROM rated_results WHERE result_id=old.result_id)
+        BEGIN INSERT OR REPLACE INTO rating_state(name, value) VALUES ('replay', '1'); END;
+        CREATE TRIGGER IF NOT EXISTS tr_competitions_rating_upd AFTER UPDATE OF date_from, style, age_group ON competitions
+        WHEN EXISTS (SELECT 1 FROM rated_results WHERE competition_id=new.id)
+        BEGIN INSERT OR REPLACE INTO rating_state(name, value) VALUES ('replay', '1'); END;
+        -- natjecanje bez datuma update() preskače; kad datum stigne, njegovi rezultati opet čekaju
+        CREATE TRIGGER IF NOT EXISTS tr_competitions_rating_date AFTER UPDATE OF date_from ON competitions
+        WHEN COALESCE(new.date_from,'') <> ''
+        BEGIN INSERT OR IGNORE INTO rating_pending(result_id)
+              SELECT DISTINCT b.result_id FROM bouts b JOIN competition_results cr ON cr.id = b.result_id
+              WHERE cr.competition_id = new.id
+                AND NOT EXISTS (SELECT 1 FROM rated_results r WHERE r.result_id = b.result_id); END;
+        CREATE TRIGGER IF NOT EXISTS tr_results_rating_upd AFTER UPDATE OF style, age_group, competition_id ON competition_results
+        WHEN EXISTS (SELECT 1 FROM rated_results WHERE result_id=new.id)
+        BEGIN INSERT OR REPLACE INTO rating_state(name, value) VALUES ('replay', '1'); END;
+        CREATE TRIGGER IF NOT EXISTS tr_results_rating_move AFTER UPDATE OF competition_id ON competition_results
+        WHEN NOT EXISTS (SELECT 1 FROM rated_results WHERE result_id=new.id)
+        BEGIN INSERT OR IGNORE INTO rating_pending(result_id) SELECT DISTINCT result_id FROM bouts WHERE result_id=new.id; END;
+    """)
+    if new:
+        conn.execute("INSERT OR IGNORE INTO rating_pending(result_id) SELECT DISTINCT result_id FROM bouts")
+        conn.commit()
+    elif outdated:
+        # stari okidači nisu pratili sve stupce – rejting ponovno od početka
+        conn.execute("INSERT OR REPLACE INTO rating_state(name, value) VALUES ('replay', '1')")
+        conn.commit()
+
+
+# ==========================
+# IZRAČUN
+# ==========================
+BOUTS_SQL = """
+    SELECT c.id, c.date_from, COALESCE(NULLIF(cr.style,''), c.style) AS style,
+           COALESCE(NULLIF(cr.age_group,''), c.age_group) AS age_group,
+           cr.id, b.member_id, b.opponent_key, b.outcome
+    FROM bouts b
+    JOIN competition_results cr ON cr.id = b.result_id
+    JOIN competitions c ON c.id = cr.competition_id
+    WHERE b.member_id IS NOT NULL AND COALESCE(c.date_from,'') <> ''{where}
+    ORDER BY c.date_from, c.id, cr.id, b.id"""
+
+
+class _State:
+    """Rejtinzi u memoriji za jedan prolaz; učitavaju se samo za sudionike novih borbi."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.athletes: Dict[Tuple[int, str], list] = {}    # → [rating, bouts, wins, losses, age, last_date]
+        self.opponents: Dict[Tuple[str, str], list] = {}   # → [rating, bouts]
+
+    def athlete(self, mid: int, style: str) -> list:
+        key = (mid, style)
+        if key not in self.athletes:
+            r = self.conn.execute("""SELECT rating, bouts, wins, losses, age_group, last_date FROM athlete_ratings
+                                     WHERE member_id=? AND style=?""", key).fetchone()
+            self.athletes[key] = list(r) if r else [BASE_RATING, 0, 0, 0, None, None]
+        return self.athletes[key]
+
+    def opponent(self, okey: str, style: str) -> list:
+        key = (okey, style)
+        if key not in self.opponents:
+            r = self.conn.execute("SELECT rating, bouts FROM opponent_ratings WHERE opponent_key=? AND style=?",
+                                  key).fetchone()
+            self.opponents[key] = list(r) if r else [BASE_RATING, 0]
+        return self.opponents[key]
+
+
+def _apply(conn: sqlite3.Connection, rows: List[tuple]) -> dict:
+    """Borbe (po redoslijedu natjecanja) → rejtinzi, snimke po natjecanju i ocijenjeni rezultati."""
+    st = _State(conn)
+    snapshots: Dict[Tuple[int, str, int], tuple] = {}
+    rated: Dict[int, Tuple[str, int]] = {}
+    n = 0
+    for cid, date, style, age, rid, mid, okey, res in rows:
+        rated[rid] = (date, cid)
+        if res not in ("win", "lose") or not style:
+            continue
+        a, o = st.athlete(mid, style), st.opponent(okey, style)
+        score = 1.0 if res == "win" else 0.0
+        e = expected(a[0], o[0])
+        a[0] += k_factor(a[1]) * (score - e)
+        o[0] += k_factor(o[1]) * ((1.0 - score) - (1.0 - e))
+        a[1] += 1
+        o[1] += 1
+        a[2 if res == "win" else 3] += 1
+        a[4], a[5] = age, date
+        snapshots[(mid, style, cid)] = (date, round(a[0], 1), a[1])
+        n += 1
+
+    conn.executemany("""INSERT OR REPLACE INTO athlete_ratings(member_id, style, rating, bouts, wins, losses, age_group, last_date)
+                        VALUES (?,?,?,?,?,?,?,?)""", [(m, s, *v) for (m, s), v in st.athletes.items()])
+    conn.executemany("INSERT OR REPLACE INTO opponent_ratings(opponent_key, style, rating, bouts) VALUES (?,?,?,?)",
+                     [(k, s, *v) for (k, s), v in st.opponents.items()])
+    conn.executemany("""INSERT OR REPLACE INTO rating_snapshots(member_id, style, competition_id, date, rating, bouts)
+                        VALUES (?,?,?,?,?,?)""", [(m, s, c, *v) for (m, s, c), v in snapshots.items()])
+    conn.executemany("INSERT OR REPLACE INTO rated_results(result_id, date, competition_id) VALUES (?,?,?)",
+                     [(rid, d, c) for rid, (d, c) in rated.items()])
+    return {"borbi": n, "rezultata": len(rated), "natjecanja": len({c for _, c in rated.values()})}
+
+
+def _replay(conn: sqlite3.Connection) -> dict:
+    for t in ("athlete_ratings", "opponent_ratings", "rating_snapshots", "rated_results", "rating_pending"):
+        conn.execute(f"DELETE FROM {t}")
+    conn.execute("DELETE FROM rating_state WHERE name='replay'")
+    return _apply(conn, conn.execute(BOUTS_SQL.format(where="")).fetchall())
+
+
+def update(conn: sqlite3.Connection, full: bool = False) -> dict:
+    """Ocijeni nove rezultate; po potrebi (ili s full) sve ponovno od početka."""
+    from hk.bouts import refresh
+    from hk.sequence import run_immediate
+
+    refresh(conn)
+    t0 = time.perf_counter()
+    if not full and not conn.execute("SELECT 1 FROM rating_pending UNION ALL SELECT 1 FROM rating_state "
+                                     "WHERE name='replay' LIMIT 1").fetchone():
+        # bez BEGIN IMMEDIATE – otvaranje stranice ne uzima zaključavanje za pisanje
+        return {"način": "bez promjena", "borbi": 0, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    def work(c):
+        replay = full or c.execute("SELECT 1 FROM rating_state WHERE name='replay'").fetchone() is not None
+        if not replay:
+            if not c.execute("SELECT 1 FROM rating_pending LIMIT 1").fetchone():
+                return {"način": "bez promjena", "borbi": 0}
+            new = c.execute(BOUTS_SQL.format(
+                where=" AND b.result_id IN (SELECT result_id FROM rating_pending)")).fetchall()
+            c.execute("DELETE FROM rating_pending")
+            if not new:
+                return {"način": "bez promjena", "borbi": 0}
+            last = c.execute("SELECT MAX(date || '|' || printf('%012d', competition_id)) FROM rated_results").fetchone()[0]
+            first = f"{new[0][1]}|{new[0][0]:012d}"
+            # rezultat za natjecanje prije zadnjeg ocijenjenog mijenja sve kasnije rejtinge
+            if last is None or first >= last:
+                return {"način": "inkrementalno", **_apply(c, new)}
+        return {"način": "od početka", **_replay(c)}
+
+    out = run_immediate(conn, work)
+    out["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return out
+
+
+# ==========================
+# LJESTVICA
+# ==========================
+def leaderboard(conn: sqlite3.Connection, age_group: Optional[str] = None, style: Optional[str] = None,
+                min_bouts: int = 5, limit: int = 100) -> pd.DataFrame:
+    """Ljestvica po uzrastu (zadnji nastup u stilu) i stilu; promjena = u odnosu na prethodno natjecanje."""
+    where, params = ["r.bouts >= ?"], [int(min_bouts)]
+    if age_group:
+        where.append("r.age_group = ?")
+        params.append(age_group)
+    if style:
+        where.append("r.style = ?")
+        params.append(style)
+    df = pd.read_sql_query(f"""
+        SELECT r.member_id, m.full_name AS sportaš, r.style AS stil, r.age_group AS uzrast,
+               ROUND(r.rating, 0) AS rejting, r.bouts AS borbi, r.wins AS pobjede, r.losses AS porazi,
+               r.last_date AS zadnji_nastup,
+               ROUND(r.rating - COALESCE((SELECT s.rating FROM rating_snapshots s
+                                          WHERE s.member_id=r.member_id AND s.style=r.style AND s.date < r.last_date
+                                          ORDER BY s.date DESC LIMIT 1), ?), 1) AS promjena
+        FROM athlete_ratings r
+        JOIN members m ON m.id = r.member_id
+        WHERE {' AND '.join(where)}
+        ORDER BY r.rating DESC
+        LIMIT ?""", conn, params=[BASE_RATING] + params + [limit])
+    df.insert(0, "#", range(1, len(df) + 1))
+    return df
+
+
+def history(conn: sqlite3.Connection, member_id: int, style: Optional[str] = None) -> pd.DataFrame:
+    """Rejting sportaša nakon svakog natjecanja (za graf)."""
+    extra, params = "", [int(member_id)]
+    if style:
+        extra, params = " AND style=?", params + [style]
+    return pd.read_sql_query(f"""SELECT date AS datum, style AS stil, rating AS rejting, bouts AS borbi
+                                 FROM rating_snapshots WHERE member_id=?{extra} ORDER BY date""", conn, params=params)
+
+
+def main(argv=None):
+    from hk.db import get_conn, init_db
+
+    ap = argparse.ArgumentParser(description="Elo rejting sportaša po stilu iz pojedinačnih borbi.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    up = sub.add_parser("update", help="ocijeni nove rezultate")
+    up.add_argument("--full", action="store_true", help="sve ponovno od početka")
+    tp = sub.add_parser("top", help="ljestvica")
+    tp.add_argument("--age", help="uzrast (npr. U17)")
+    tp.add_argument("--style", help="stil (GR, FS, WW)")
+    tp.add_argument("--min-bouts", type=int, default=5)
+    tp.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    init_db(args.db)
+    conn = get_conn(args.db)
+    out = update(conn, full=args.cmd == "update" and args.full)
+    print(", ".join(f"{k}: {v}" for k, v in out.items()))
+    if args.cmd == "top":
+        print(leaderboard(conn, args.age, args.style, args.min_bouts, args.limit).drop(columns=["member_id"])
+              .to_string(index=False))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Repozitoriji za članove, natjecanja, rezultate i prisustvo.
+
+Redak je objekt sa __slots__ (stupci tablice + id), a SQL svakog
+repozitorija sastavlja se jednom pri definiciji klase. Isti tekst
+naredbe za svaki upis znači da ga sqlite3 priprema samo jednom po
+konekciji (statement cache) – i obrazac, i Excel uvoz, i pozadinski
+pisač koriste iste nizove. Skupni upis ide kroz executemany.
+
+Metode ne potvrđuju transakciju: pozivatelj radi conn.commit(),
+run_immediate ili šalje *_op() pozadinskom pisaču (hk/writer.py).
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+
+class Record:
+    """Redak tablice; podklasa zadaje COLUMNS (bez id) i __slots__ = COLUMNS."""
+    __slots__ = ("id",)
+    COLUMNS: Tuple[str, ...] = ()
+    DEFAULTS: Dict[str, object] = {}
+
+    def __init__(self, id: Optional[int] = None, **values):
+        self.id = id
+        for col in self.COLUMNS:
+            setattr(self, col, values.pop(col, self.DEFAULTS.get(col, "")))
+        if values:
+            raise TypeError(f"{type(self).__name__}: nepoznati stupci {', '.join(values)}")
+
+    @classmethod
+    def from_row(cls, row: Sequence):
+        """(id, *COLUMNS) kako ih vraća Repo.SELECT."""
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        for col, v in zip(cls.COLUMNS, row[1:]):
+            setattr(obj, col, v)
+        return obj
+
+    def values(self, columns: Optional[Sequence[str]] = None) -> tuple:
+        return tuple(getattr(self, c) for c in (columns or self.COLUMNS))
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"id": self.id, **{c: getattr(self, c) for c in self.COLUMNS}}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id!r}, ...)"
+
+
+class Member(Record):
+    __slots__ = COLUMNS = (
+        "full_name", "first_name", "last_name", "dob", "gender", "oib",
+        "street", "city", "postal_code", "residence",
+        "athlete_email", "parent_email", "athlete_phone", "parent_phone", "parent_name",
+        "id_card_number", "id_card_issuer", "id_card_valid_until",
+        "passport_number", "passport_issuer", "passport_valid_until",
+        "active_competitor", "veteran", "other_flag", "membership_fee_eur", "group_id",
+        "photo_path", "consent_path", "application_path", "medical_path", "medical_valid_until",
+    )
+    DEFAULTS = {"active_competitor": 0, "veteran": 0, "other_flag": 0, "membership_fee_eur": 0.0, "group_id": None}
+
+
+class Competition(Record):
+    __slots__ = COLUMNS = (
+        "redni_broj", "kind", "custom_kind", "name", "date_from", "date_to", "place", "style", "age_group",
+        "country", "country_code", "team_rank", "club_competitors", "total_competitors", "total_clubs",
+        "total_countries", "coaches_text", "notes", "bulletin_link", "results_link", "gallery_link",
+        "bulletin_file", "results_file",
+    )
+    DEFAULTS = {"redni_broj": None, "club_competitors": 0, "total_competitors": 0, "total_clubs": 0,
+                "total_countries": 0}
+
+
+class Result(Record):
+    __slots__ = COLUMNS = (
+        "competition_id", "member_id", "weight_category", "style", "bouts_total", "wins", "losses",
+        "placement", "opponent_list", "notes",
+    )
+    DEFAULTS = {"competition_id": None, "member_id": None, "bouts_total": 0, "wins": 0, "losses": 0,
+                "placement": None}
+
+
+class Attendance(Record):
+    __slots__ = COLUMNS = ("session_id", "member_id", "present", "minutes")
+    DEFAULTS = {"session_id": None, "member_id": None, "present": 1, "minutes": 0}
+
+
+class Repo:
+    """CRUD nad jednom tablicom; SELECT/INSERT/UPDATE se sastavljaju jednom po klasi."""
+    TABLE = ""
+    ROW: Type[Record] = Record
+    SELECT = INSERT = UPDATE = DELETE = ""
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cols = cls.ROW.COLUMNS
+        cls.SELECT = f"SELECT id, {', '.join(cols)} FROM {cls.TABLE}"
+        cls.INSERT = f"INSERT INTO {cls.TABLE} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+        cls.UPDATE = f"UPDATE {cls.TABLE} SET {', '.join(c + '=?' for c in cols)} WHERE id=?"
+        cls.DELETE = f"DELETE FROM {cls.TABLE} WHERE id=?"
+        cls._partial: Dict[Tuple[str, ...], str] = {}
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    @classmethod
+    def update_sql(cls, columns: Optional[Sequence[str]] = None) -> str:
+        """UPDATE za podskup stupaca; isti podskup uvijek daje isti niz."""
+        if not columns:
+            return cls.UPDATE
+        key = tuple(columns)
+        if key not in cls._partial:
+            unknown = set(key) - set(cls.ROW.COLUMNS)
+            if unknown:
+                raise ValueError(f"{cls.TABLE}: nepoznati stupci {', '.join(sorted(unknown))}")
+            cls._partial[key] = f"UPDATE {cls.TABLE} SET {', '.join(c + '=?' for c in key)} WHERE id=?"
+        return cls._partial[key]
+
+    # --- naredbe za pozadinskog pisača ---
+    @classmethod
+    def insert_op(cls, rows: Iterable[Record]) -> Tuple[str, List[tuple]]:
+        return cls.INSERT, [r.values() for r in rows]
+
+    @classmethod
+    def update_op(cls, rows: Iterable[Record], columns: Optional[Sequence[str]] = None) -> Tuple[str, List[tuple]]:
+        return cls.update_sql(columns), [r.values(columns) + (r.id,) for r in rows]
+
+    @classmethod
+    def delete_op(cls, ids: Iterable[int]) -> Tuple[str, List[tuple]]:
+        return cls.DELETE, [(int(i),) for i in ids]
+
+    # --- čitanje ---
+    def get(self, row_id: int) -> Optional[Record]:
+        r = self.conn.execute(self.SELECT + " WHERE id=?", (int(row_id),)).fetchone()
+        return self.ROW.from_row(r) if r else None
+
+    def where(self, clause: str = "", params: Sequence = ()) -> List[Record]:
+        return [self.ROW.from_row(r) for r in self.conn.execute(f"{self.SELECT} {clause}", params).fetchall()]
+
+    # --- pisanje ---
+    def insert(self, row: Record) -> int:
+        row.id = self.conn.execute(self.INSERT, row.values()).lastrowid
+        return row.id
+
+    def insert_many(self, rows: Iterable[Record]) -> int:
+        sql, params = self.insert_op(rows)
+        self.conn.executemany(sql, params)
+        return len(params)
+
+    def update(self, row: Record, columns: Optional[Sequence[str]] = None):
+        self.conn.execute(self.update_sql(columns), row.values(columns) + (row.id,))
+
+    def update_many(self, rows: Iterable[Record], columns: Optional[Sequence[str]] = None) -> int:
+        sql, params = self.update_op(rows, columns)
+        self.conn.executemany(sql, params)
+        return len(params)
+
+    def delete(self, row_id: int):
+        self.conn.execute(self.DELETE, (int(row_id),))
+
+    def delete_many(self, ids: Iterable[int]):
+        self.conn.executemany(*self.delete_op(ids))
+
+
+# ==========================
+# REPOZITORIJI
+# ==========================
+class MembersRepo(Repo):
+    TABLE, ROW = "members", Member
+    DELETE_VETERAN = "DELETE FROM members WHERE id=? AND veteran=1"
+
+    def names(self, group_id: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(id, ime) po abecedi – svi ili članovi jedne grupe."""
+        if group_id:
+            return self.conn.execute("SELECT id, full_name FROM members WHERE group_id=? ORDER BY full_name",
+                                     (int(group_id),)).fetchall()
+        return self.conn.execute("SELECT id, full_name FROM members ORDER BY full_name").fetchall()
+
+    def name_ids(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT full_name, id FROM members").fetchall())
+
+    @classmethod
+    def move_to_group_op(cls, member_ids: Iterable[int], group_id: Optional[int]) -> Tuple[str, List[tuple]]:
+        return cls.update_op([Member(id=int(m), group_id=group_id) for m in member_ids], ("group_id",))
+
+    @classmethod
+    def delete_veteran_op(cls, member_id: int) -> Tuple[str, tuple]:
+        return cls.DELETE_VETERAN, (int(member_id),)
+
+    def move_to_group(self, member_ids: Iterable[int], group_id: Optional[int]) -> int:
+        sql, params = self.move_to_group_op(member_ids, group_id)
+        self.conn.executemany(sql, params)
+        return len(params)
+
+    def delete_veteran(self, member_id: int):
+        self.conn.execute(*self.delete_veteran_op(member_id))
+
+
+class CompetitionsRepo(Repo):
+    TABLE, ROW = "competitions", Competition
+    PHOTO_INSERT = "INSERT INTO competition_photos (competition_id,filename,path,uploaded_at) VALUES (?,?,?,?)"
+
+    def choices(self) -> List[Tuple[int, str, str]]:
+        """(id, naziv, datum od) – najnovija prva."""
+        return self.conn.execute("SELECT id, name, date_from FROM competitions ORDER BY date_from DESC").fetchall()
+
+    def ids(self) -> set:
+        return {r[0] for r in self.conn.execute("SELECT id FROM competitions").fetchall()}
+
+    def add_photos(self, competition_id: int, photos: Iterable[Tuple[str, str]], uploaded_at: str):
+        self.conn.executemany(self.PHOTO_INSERT, [(competition_id, fname, path, uploaded_at) for fname, path in photos])
+
+
+class ResultsRepo(Repo):
+    TABLE, ROW = "competition_results", Result
+    EDIT_COLUMNS = ("member_id", "weight_category", "style", "placement", "notes")
+
+    def for_competition(self, competition_id: int) -> List[Result]:
+        """Rezultati natjecanja po imenu sportaša (samo s postojećim članom)."""
+        return [Result.from_row(r) for r in self.conn.execute(f"""
+            SELECT r.id, {', '.join('r.' + c for c in Result.COLUMNS)}
+            FROM competition_results r JOIN members m ON m.id = r.member_id
+            WHERE r.competition_id = ? ORDER BY m.full_name""", (int(competition_id),)).fetchall()]
+
+
+class AttendanceRepo(Repo):
+    TABLE, ROW = "attendance", Attendance
+    UPSERT = (f"INSERT INTO attendance ({', '.join(Attendance.COLUMNS)}) VALUES (?,?,?,?) "
+              "ON CONFLICT(session_id,member_id) DO UPDATE SET present=excluded.present, minutes=excluded.minutes")
+
+    @classmethod
+    def upsert_op(cls, rows: Iterable[Attendance]) -> Tuple[str, List[tuple]]:
+        """Ponovljeno spremanje iste sesije prepisuje retke umjesto dupliciranja."""
+        return cls.UPSERT, [r.values() for r in rows]
+
+    def upsert_many(self, rows: Iterable[Attendance]) -> int:
+        sql, params = self.upsert_op(rows)
+        self.conn.executemany(sql, params)
+        return len(params)
+
+    def for_session(self, session_id: int) -> Dict[int, Attendance]:
+        """Već spremljeno prisustvo sesije po member_id."""
+        return {a.member_id: a for a in self.where("WHERE session_id=?", (int(session_id),))}
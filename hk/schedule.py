@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Tjedni raspored treninga i generiranje sesija za sezonu.
+
+Termin (schedule_slots) je grupa + trener + dan u tjednu + vrijeme +
+trajanje + mjesto. Generator za svaki aktivni termin i svaki odgovarajući
+dan u razdoblju upisuje sesiju u jednoj transakciji; sesija koja već
+postoji (ista grupa i početak) se preskače, pa se generiranje može
+ponoviti. Vremena sesija spremaju se uvijek kao "YYYY-MM-DD HH:MM"
+(indeksirano), pa upiti po mjesecu mogu koristiti raspon umjesto LIKE.
+
+▶ Generiranje iz naredbenog retka:
+    python -m hk.schedule --from 2025-09-01 --to 2026-06-30
+"""
+
+import argparse
+import sqlite3
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+TS_FORMAT = "%Y-%m-%d %H:%M"
+TS_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]"
+
+_TS_INPUT = ["%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f",
+             "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f",
+             "%d.%m.%Y. %H:%M", "%d.%m.%Y %H:%M"]
+
+DANI = ["Ponedjeljak", "Utorak", "Srijeda", "Četvrtak", "Petak", "Subota", "Nedjelja"]
+
+
+def parse_ts(value: Union[str, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(second=0, microsecond=0)
+    s = " ".join(str(value or "").split())
+    for fmt in _TS_INPUT:
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Neispravno vrijeme: {value!r} (očekivano YYYY-MM-DD HH:MM)")
+
+
+def canonical_ts(value: Union[str, datetime]) -> str:
+    return parse_ts(value).strftime(TS_FORMAT)
+
+
+def canonical_time(value: Union[str, time]) -> str:
+    """Vrijeme termina kao HH:MM (prihvaća i 18.00, 18:00:00)."""
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    s = str(value or "").strip().replace(".", ":")
+    for fmt in ("%H:%M", "%H:%M:%S", "%H"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%H:%M")
+        except ValueError:
+            continue
+    raise ValueError(f"Neispravno vrijeme termina: {value!r} (očekivano HH:MM)")
+
+
+def normalize_session_timestamps(conn: sqlite3.Connection) -> int:
+    """Svedi postojeće start_ts/end_ts na kanonski oblik; neprepoznate ostavi."""
+    fixed = []
+    for sid, st, en in conn.execute(
+            f"SELECT id, start_ts, end_ts FROM sessions WHERE start_ts NOT GLOB '{TS_GLOB}' "
+            f"OR end_ts NOT GLOB '{TS_GLOB}'").fetchall():
+        new = []
+        for v in (st, en):
+            try:
+                new.append(canonical_ts(v) if v else v)
+            except ValueError:
+                new.append(v)
+        if new != [st, en]:
+            fixed.append((new[0], new[1], sid))
+    conn.executemany("UPDATE sessions SET start_ts=?, end_ts=? WHERE id=?", fixed)
+    return len(fixed)
+
+
+def season_bounds(today: Optional[date] = None) -> Tuple[date, date]:
+    """Sezona traje od 1. rujna do 30. lipnja."""
+    today = today or date.today()
+    y = today.year if today.month >= 9 else today.year - 1
+    return date(y, 9, 1), date(y + 1, 6, 30)
+
+
+def weekday_dates(weekday: int, date_from: date, date_to: date) -> Iterator[date]:
+    d = date_from + timedelta(days=(weekday - date_from.weekday()) % 7)
+    while d <= date_to:
+        yield d
+        d += timedelta(days=7)
+
+
+def add_slot(conn: sqlite3.Connection, group_id: int, coach_id: Optional[int], weekday: int,
+             start_time: Union[str, time], duration_min: int = 90, location: str = "") -> int:
+    if not 0 <= int(weekday) <= 6:
+        raise ValueError("Dan u tjednu mora biti 0 (ponedjeljak) … 6 (nedjelja)")
+    if int(duration_min) <= 0:
+        raise ValueError("Trajanje mora biti veće od 0 minuta")
+    cur = conn.execute("""INSERT INTO schedule_slots (group_id,coach_id,weekday,start_time,duration_min,location)
+                          VALUES (?,?,?,?,?,?)""",
+                       (group_id, coach_id, int(weekday), canonical_time(start_time), int(duration_min), location))
+    return cur.lastrowid
+
+
+def insert_season_sessions(conn: sqlite3.Connection, date_from: date, date_to: date,
+                           slot_ids: Optional[Iterable[int]] = None) -> int:
+    """Upiši sesije za aktivne termine u [date_from, date_to]; vraća broj novih.
+    Ne potvrđuje transakciju – pozivati kroz run_immediate ili pisača."""
+    q = "SELECT id, group_id, coach_id, weekday, start_time, duration_min, location FROM schedule_slots WHERE active=1"
+    params: list = []
+    if slot_ids is not None:
+        ids = [int(i) for i in slot_ids]
+        if not ids:
+            return 0
+        q += f" AND id IN ({','.join('?' * len(ids))})"
+        params = ids
+    rows = []
+    for slot_id, gid, cid, wd, st, dur, loc in conn.execute(q, params).fetchall():
+        t = datetime.strptime(st, "%H:%M").time()
+        for d in weekday_dates(wd, date_from, date_to):
+            start = datetime.combine(d, t)
+            s = start.strftime(TS_FORMAT)
+            rows.append((cid, gid, s, (start + timedelta(minutes=dur or 0)).strftime(TS_FORMAT),
+                         loc, slot_id, gid, s))
+    cur = conn.executemany("""
+        INSERT INTO sessions (coach_id,group_id,start_ts,end_ts,location,slot_id)
+        SELECT ?,?,?,?,?,?
+        WHERE NOT EXISTS (SELECT 1 FROM sessions WHERE group_id IS ? AND start_ts = ?)
+    """, rows)
+    return max(cur.rowcount, 0)
+
+
+def month_range(month: str) -> Tuple[str, str]:
+    """'2025-10' → ('2025-10-01 00:00', '2025-11-01 00:00') za indeksirani raspon."""
+    y, m = (int(x) for x in month.split("-")[:2])
+    nxt = date(y + (m == 12), m % 12 + 1, 1)
+    return f"{y:04d}-{m:02d}-01 00:00", nxt.strftime(TS_FORMAT)
+
+
+def main(argv=None):
+    from hk.db import get_conn, init_db
+    from hk.sequence import run_immediate
+
+    start, end = season_bounds()
+    ap = argparse.ArgumentParser(description="Generiraj sesije iz tjednog rasporeda.")
+    ap.add_argument("--db", help="putanja baze (zadano HK_DB_PATH / hk_podravka.db)")
+    ap.add_argument("--from", dest="date_from", default=start.isoformat())
+    ap.add_argument("--to", dest="date_to", default=end.isoformat())
+    ap.add_argument("--slot", type=int, action="append", help="samo navedeni termini (može više puta)")
+    args = ap.parse_args(argv)
+
+    init_db(args.db)
+    conn = get_conn(args.db)
+    t0 = _time.perf_counter()
+    n = run_immediate(conn, lambda c: insert_season_sessions(
+        c, date.fromisoformat(args.date_from), date.fromisoformat(args.date_to), args.slot))
+    conn.close()
+    print(f"Novih sesija: {n} ({(_time.perf_counter() - t0) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Dodjela rednog broja natjecanja (redni_broj) bez sudara kod istovremenog unosa.
+
+Brojač živi u tablici sequences i uvećava se unutar BEGIN IMMEDIATE
+transakcije, pa dva trenera koji istovremeno spremaju natjecanje nikad ne
+dobiju isti broj. Brojač nikad ne ide ispod MAX(redni_broj), pa ga ne
+poremeti ni uvoz arhive ni ručno upisan broj. SQLITE_BUSY se ponavlja s
+eksponencijalnim čekanjem.
+
+▶ Test opterećenja (paralelni pisači):
+    python -m hk.sequence --workers 8 --per-worker 200
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, TypeVar
+
+from hk.db import get_conn, init_db
+
+T = TypeVar("T")
+
+REDNI_BROJ_SEQ = "competitions.redni_broj"
+
+
+def is_busy(exc: Exception) -> bool:
+    msg = str(exc).lower()
+    return isinstance(exc, sqlite3.OperationalError) and ("locked" in msg or "busy" in msg)
+
+
+def run_immediate(conn: sqlite3.Connection, work: Callable[[sqlite3.Connection], T],
+                  retries: int = 8, base_delay: float = 0.02) -> T:
+    """Izvrši work(conn) u BEGIN IMMEDIATE transakciji i potvrdi je.
+
+    Ako je baza zaključana, cijela transakcija se ponavlja (najviše `retries`
+    puta) uz eksponencijalno čekanje s nasumičnim odmakom. Eventualna otvorena
+    implicitna transakcija na conn se prije toga potvrđuje.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    for attempt in range(retries + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = work(conn)
+                conn.commit()
+                return out
+            except BaseException:
+                conn.rollback()
+                raise
+        except sqlite3.OperationalError as e:
+            if not is_busy(e) or attempt == retries:
+                raise
+            time.sleep(base_delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+    raise AssertionError("unreachable")
+
+
+def next_redni_broj(conn: sqlite3.Connection) -> int:
+    """Sljedeći redni broj; pozivati unutar run_immediate (pisačka transakcija)."""
+    return conn.execute("""
+        INSERT INTO sequences (name, value)
+        SELECT ?, COALESCE(MAX(redni_broj), 0) + 1 FROM competitions WHERE true
+        ON CONFLICT(name) DO UPDATE SET
+            value = MAX(value, (SELECT COALESCE(MAX(redni_broj), 0) FROM competitions)) + 1
+        RETURNING value
+    """, (REDNI_BROJ_SEQ,)).fetchone()[0]
+
+
+def allocate_redni_broj(conn: sqlite3.Connection, **retry_kw) -> int:
+    """Rezerviraj redni broj u zasebnoj transakciji (npr. za prikaz u obrascu)."""
+    return run_immediate(conn, next_redni_broj, **retry_kw)
+
+
+def sync_redni_broj(conn: sqlite3.Connection):
+    """Podigni brojač na MAX(redni_broj) – nakon uvoza arhive s vlastitim brojevima."""
+    conn.execute("""
+        INSERT INTO sequences (name, value)
+        SELECT ?, COALESCE(MAX(redni_broj), 0) FROM competitions WHERE true
+        ON CONFLICT(name) DO UPDATE SET value = MAX(value, excluded.value)
+    """, (REDNI_BROJ_SEQ,))
+
+
+# ==========================
+# TEST OPTEREĆENJA
+# ==========================
+def stress(db_path: str, workers: int = 8, per_worker: int = 200) -> dict:
+    """Paralelni pisači (svaki s vlastitom konekcijom) spremaju natjecanja s
+    dodijeljenim rednim brojem; na kraju se provjerava da su brojevi jedinstveni
+    i bez rupa."""
+    init_db(db_path)
+    errors = []
+    barrier = threading.Barrier(workers)
+
+    def writer(n: int):
+        conn = get_conn(db_path)
+        try:
+            barrier.wait()
+            for i in range(per_worker):
+                def work(c):
+                    rb = next_redni_broj(c)
+                    c.execute("INSERT INTO competitions (redni_broj, name) VALUES (?, ?)",
+                              (rb, f"stress {n}/{i}"))
+                    return rb
+                run_immediate(conn, work, retries=20)
+        except Exception as e:  # pragma: no cover - prikazuje se u izvještaju
+            errors.append(repr(e))
+        finally:
+            conn.close()
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    conn = get_conn(db_path)
+    total, distinct, lo, hi = conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT redni_broj), MIN(redni_broj), MAX(redni_broj) "
+        "FROM competitions WHERE name LIKE 'stress %'").fetchone()
+    conn.close()
+    return {
+        "pisači": workers, "upisa": total, "jedinstvenih": distinct,
+        "bez_rupa": bool(total) and hi - lo + 1 == total,
+        "greške": errors, "trajanje_s": round(elapsed, 3),
+        "upisa_u_sekundi": round(total / elapsed, 1) if elapsed else None,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Test paralelne dodjele rednog broja natjecanja.")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--per-worker", type=int, default=200)
+    ap.add_argument("--db", help="baza za test (zadano: privremena datoteka)")
+    args = ap.parse_args(argv)
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.mkdtemp(prefix="hk_seq_")
+        db_path = os.path.join(tmp_dir, "stress.db")
+    try:
+        rep = stress(db_path, args.workers, args.per_worker)
+    finally:
+        if tmp_dir:
+            for fn in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, fn))
+            os.rmdir(tmp_dir)
+    for k, v in rep.items():
+        print(f"{k}: {v}")
+    ok = not rep["greške"] and rep["upisa"] == rep["jedinstvenih"] == args.workers * args.per_worker
+    raise SystemExit(0 if ok and rep["bez_rupa"] else 1)
+
+
+if __name__ == "__main__":
+    main()
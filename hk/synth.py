@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Generator sintetičkih podataka kluba za mjerenje performansi.
+
+Puni shemu iz init_db realističnim podacima (hrvatska imena s dijakriticima,
+uzrasti U11…SENIORI, stilovi GR/FS/WW): grupe, treneri, članovi, natjecanja
+s rezultatima i protivnicima, treninzi s prisustvom te pripreme. Isti seed
+uvijek daje istu bazu. Upisi idu skupno (executemany), a prisustvo se
+generira jednim INSERT … SELECT nad sesijama i članovima grupe, pa i baza
+s milijun redaka prisustva nastaje u nekoliko sekundi.
+
+▶ Pokretanje:
+    python -m hk.synth bench.db --scale large
+    python -m hk.synth bench.db --members 800 --attendance 200000 --seed 7
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from hk.config import AGES, KINDS, LOCATIONS
+from hk.db import get_conn, init_db
+from hk.sequence import sync_redni_broj
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small":  {"members": 300,  "groups": 8,  "coaches": 5,  "competitions": 60,
+               "attendance": 20_000,    "camps": 6},
+    "medium": {"members": 1500, "groups": 16, "coaches": 10, "competitions": 300,
+               "attendance": 200_000,   "camps": 20},
+    "large":  {"members": 5000, "groups": 32, "coaches": 20, "competitions": 1500,
+               "attendance": 1_000_000, "camps": 60},
+}
+
+FIRST_M = ["Ivan", "Luka", "Marko", "Josip", "Matej", "Petar", "Filip", "Karlo", "Dominik", "Antonio",
+           "Tomislav", "Mateo", "Jakov", "Fran", "Borna", "Noa", "Roko", "Lovro", "Vito", "Đuro",
+           "Krešimir", "Zvonimir", "Dražen", "Hrvoje", "Nikola"]
+FIRST_Z = ["Ana", "Marija", "Lucija", "Petra", "Ema", "Mia", "Sara", "Lana", "Nika", "Iva",
+           "Klara", "Dora", "Lea", "Tena", "Maša", "Željka", "Ivana", "Katarina", "Gordana", "Mateja"]
+LAST = ["Horvat", "Kovačević", "Babić", "Marić", "Jurić", "Novak", "Kovačić", "Knežević", "Vuković",
+        "Marković", "Petrović", "Matić", "Tomić", "Pavlović", "Kovač", "Božić", "Blažević", "Grgić",
+        "Pavić", "Radić", "Perić", "Šarić", "Lovrić", "Vidović", "Perković", "Posavec", "Đurić",
+        "Čačić", "Žagar", "Ćurković", "Šimunović", "Jakopović", "Tkalčec", "Kolarić", "Mikulić"]
+CLUBS = ["HK Metalac", "HK Lokomotiva", "HK Zagreb", "HK Split", "HK Rijeka", "HK Dubrava",
+         "HK Varaždin", "HK Osijek", "HK Istra", "RK Siska", "AC Graz", "WKG Vorarlberg",
+         "BSC Budapest", "ZK Maribor", "HK Partizan"]
+PLACES = [("Zagreb", "Croatia"), ("Koprivnica", "Croatia"), ("Split", "Croatia"), ("Poreč", "Croatia"),
+          ("Budimpešta", "Hungary"), ("Ljubljana", "Slovenia"), ("Beč", "Austria"),
+          ("Sarajevo", "Bosnia and Herzegovina"), ("Novi Sad", "Serbia"), ("Zrenjanin", "Serbia")]
+ISO3 = {"Croatia": "HRV", "Hungary": "HUN", "Slovenia": "SVN", "Austria": "AUT",
+        "Bosnia and Herzegovina": "BIH", "Serbia": "SRB"}
+# Raspon godina rođenja po uzrastu (u odnosu na sezonu)
+AGE_SPAN = {"POČETNICI": (6, 8), "U11": (9, 10), "U13": (11, 12), "U15": (13, 14),
+            "U17": (15, 16), "U20": (17, 19), "U23": (20, 22), "SENIORI": (23, 34)}
+WEIGHTS = {"U11": [26, 30, 34, 38, 42], "U13": [30, 34, 38, 42, 47, 52], "U15": [38, 41, 44, 48, 52, 57, 62],
+           "U17": [45, 48, 51, 55, 60, 65, 71, 80], "U20": [57, 61, 65, 70, 74, 79, 86, 92],
+           "U23": [57, 61, 65, 70, 74, 79, 86, 92, 97], "SENIORI": [60, 63, 67, 72, 77, 82, 87, 97, 130],
+           "POČETNICI": [22, 26, 30]}
+MAIN_STYLES = ["GR", "FS", "WW"]
+# Fiksni početak sezone da ista skala i seed uvijek daju istu bazu
+DEFAULT_SEASON_START = date(2024, 9, 1)
+
+
+def _oib(rnd: random.Random) -> str:
+    return "".join(str(rnd.randint(0, 9)) for _ in range(11))
+
+
+def generate(db_path: str, scale: str = "small", seed: int = 42,
+             season_start: Optional[date] = None, **overrides) -> Dict[str, int]:
+    """Napuni praznu bazu db_path; vraća broj upisanih redaka po tablici."""
+    cfg = dict(SCALES[scale])
+    cfg.update({k: v for k, v in overrides.items() if v is not None})
+    rnd = random.Random(seed)
+    season_start = season_start or DEFAULT_SEASON_START
+    season_end = season_start + timedelta(days=364)
+
+    init_db(db_path)
+    conn = get_conn(db_path)
+    # privremeno bez fsynca – baza se ionako puni od nule
+    conn.execute("PRAGMA synchronous = OFF")
+    counts: Dict[str, int] = {}
+    with conn:
+        # Grupe: uzrast × slovo (npr. "U13 A")
+        group_ages = [AGES[i % len(AGES)] for i in range(cfg["groups"])]
+        group_names = [f"{a} {chr(65 + i // len(AGES))}" for i, a in enumerate(group_ages)]
+        first_gid = (conn.execute("SELECT COALESCE(MAX(id),0) FROM groups").fetchone()[0]) + 1
+        conn.executemany("INSERT INTO groups(name) VALUES (?)", [(g,) for g in group_names])
+        gids = list(range(first_gid, first_gid + len(group_names)))
+        counts["groups"] = len(gids)
+
+        # Treneri i dodjela grupama
+        first_cid = (conn.execute("SELECT COALESCE(MAX(id),0) FROM coaches").fetchone()[0]) + 1
+        coaches = []
+        for _ in range(cfg["coaches"]):
+            fn, ln = rnd.choice(FIRST_M + FIRST_Z), rnd.choice(LAST)
+            coaches.append((f"{fn} {ln}", fn, ln, f"{rnd.randint(1965, 1998)}-0{rnd.randint(1, 9)}-1{rnd.randint(0, 9)}",
+                            _oib(rnd), f"{fn.lower()}.{ln.lower()}@example.hr", f"HR{rnd.randint(10**18, 10**19 - 1)}"))
+        conn.executemany("INSERT INTO coaches(full_name,first_name,last_name,dob,oib,email,iban) VALUES (?,?,?,?,?,?,?)", coaches)
+        cids = list(range(first_cid, first_cid + len(coaches)))
+        group_coach = {g: cids[i % len(cids)] for i, g in enumerate(gids)}
+        conn.executemany("INSERT INTO coach_groups(coach_id,group_id,assigned_at) VALUES (?,?,?)",
+                         [(c, g, season_start.isoformat()) for g, c in group_coach.items()])
+        counts["coaches"] = len(cids)
+
+        # Članovi
+        first_mid = (conn.execute("SELECT COALESCE(MAX(id),0) FROM members").fetchone()[0]) + 1
+        members = []
+        member_age: Dict[int, str] = {}
+        member_gender: Dict[int, str] = {}
+        for i in range(cfg["members"]):
+            gi = rnd.randrange(len(gids))
+            age = group_ages[gi]
+            lo, hi = AGE_SPAN[age]
+            gender = "Ž" if rnd.random() < 0.3 else "M"
+            fn = rnd.choice(FIRST_Z if gender == "Ž" else FIRST_M)
+            ln = rnd.choice(LAST)
+            dob = season_start - timedelta(days=rnd.randint(lo * 365, hi * 365 + 364))
+            veteran = int(age == "SENIORI" and rnd.random() < 0.15)
+            active = int(age not in ("POČETNICI",) and rnd.random() < 0.6)
+
+            def valid(p_missing: float, spread: int):
+                if rnd.random() < p_missing:
+                    return ""
+                return (season_end + timedelta(days=rnd.randint(-spread, spread))).isoformat()
+
+            city = rnd.choice(["Koprivnica", "Đurđevac", "Križevci", "Ludbreg", "Virje", "Drnje"])
+            members.append((f"{fn} {ln}", fn, ln, dob.isoformat(), gender, _oib(rnd),
+                            f"Ulica {rnd.randint(1, 80)}", city, "48000", f"Ulica, {city} 48000",
+                            f"{fn.lower()}{i}@example.hr", f"roditelj{i}@example.hr",
+                            f"+38591{rnd.randint(1000000, 9999999)}", f"+38598{rnd.randint(1000000, 9999999)}",
+                            valid(0.2, 400), valid(0.6, 600), active, veteran,
+                            30.0 if active else 20.0, gids[gi], valid(0.1, 200)))
+            member_age[first_mid + i] = age
+            member_gender[first_mid + i] = gender
+        conn.executemany("""INSERT INTO members
+            (full_name,first_name,last_name,dob,gender,oib,street,city,postal_code,residence,
+             athlete_email,parent_email,athlete_phone,parent_phone,
+             id_card_valid_until,passport_valid_until,active_competitor,veteran,membership_fee_eur,
+             group_id,medical_valid_until)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", members)
+        counts["members"] = len(members)
+        by_age: Dict[str, list] = {}
+        for mid, age in member_age.items():
+            by_age.setdefault(age, []).append(mid)
+
+        # Natjecanja s rezultatima
+        next_rb = conn.execute("SELECT COALESCE(MAX(redni_broj),0) FROM competitions").fetchone()[0] + 1
+        first_comp = (conn.execute("SELECT COALESCE(MAX(id),0) FROM competitions").fetchone()[0]) + 1
+        comps, results = [], []
+        span_days = max(1, cfg.get("years", 3) * 365)
+        for i in range(cfg["competitions"]):
+            d = season_end - timedelta(days=rnd.randint(0, span_days))
+            age = rnd.choice([a for a in AGES if a != "POČETNICI"])
+            style = rnd.choices(MAIN_STYLES, weights=[5, 3, 2])[0]
+            place, country = rnd.choice(PLACES)
+            kind = rnd.choices(KINDS[:7], weights=[4, 6, 1, 2, 2, 3, 1])[0]
+            pool = by_age.get(age) or [mid for mids in by_age.values() for mid in mids]
+            if style == "WW":
+                pool = [m for m in pool if member_gender[m] == "Ž"] or pool
+            ours = rnd.sample(pool, min(len(pool), rnd.randint(1, 8)))
+            total = rnd.randint(len(ours) + 8, len(ours) + 200)
+            comps.append((next_rb + i, kind, f"{kind.title()} {place} {d.year}", d.isoformat(),
+                          (d + timedelta(days=rnd.choice([0, 0, 1, 2]))).isoformat(), f"{place}, {country}",
+                          style, age, country, ISO3[country], f"{rnd.randint(1, 12)}.", len(ours), total,
+                          rnd.randint(3, 40), rnd.randint(1, 15)))
+            for mid in ours:
+                bouts = rnd.randint(1, 5)
+                wins = rnd.randint(0, bouts)
+                placement = max(1, min(total, (bouts - wins) * 4 + rnd.randint(1, 6) - wins))
+                opps = [{"name": f"{rnd.choice(FIRST_M + FIRST_Z)} {rnd.choice(LAST)}",
+                         "club": rnd.choice(CLUBS), "result": "win" if b < wins else "lose"}
+                        for b in range(bouts)]
+                # dio zapisa kao u Excel predlošku: pseudo-JSON s jednostrukim navodnicima
+                opp_text = json.dumps(opps, ensure_ascii=False)
+                if rnd.random() < 0.1:
+                    opp_text = str(opps)
+                results.append((first_comp + i, mid, f"{rnd.choice(WEIGHTS[age])} kg", style,
+                                bouts, wins, bouts - wins, placement, opp_text, age))
+        conn.executemany("""INSERT INTO competitions
+            (redni_broj,kind,name,date_from,date_to,place,style,age_group,country,country_code,
+             team_rank,club_competitors,total_competitors,total_clubs,total_countries)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", comps)
+        conn.executemany("""INSERT INTO competition_results
+            (competition_id,member_id,weight_category,style,bouts_total,wins,losses,placement,opponent_list,age_group)
+            VALUES (?,?,?,?,?,?,?,?,?,?)""", results)
+        sync_redni_broj(conn)
+        counts["competitions"] = len(comps)
+        counts["competition_results"] = len(results)
+
+        # Treninzi: dovoljno sesija da prisustvo dosegne zadani broj redaka
+        attend_rate = 0.8
+        avg_group = max(1.0, cfg["members"] / len(gids))
+        n_sessions = max(len(gids), math.ceil(cfg["attendance"] / (avg_group * attend_rate)))
+        per_group = math.ceil(n_sessions / len(gids))
+        slots = [(0, 18), (2, 18), (4, 17), (1, 19), (3, 19), (5, 10)]  # (dan u tjednu, sat)
+        locations = [l for l in LOCATIONS if not l.startswith("Drugo")]
+        sessions = []
+        for gi, g in enumerate(gids):
+            for k in range(per_group):
+                week, j = divmod(k, 3)  # tri treninga tjedno, različiti dani
+                dow, hour = slots[(2 * j + gi) % len(slots)]
+                start = datetime.combine(season_start, datetime.min.time()) + timedelta(
+                    weeks=week, days=dow, hours=hour)
+                dur = rnd.choice([60, 75, 90, 90, 90, 120])
+                sessions.append((group_coach[g], g, start.strftime("%Y-%m-%d %H:%M"),
+                                 (start + timedelta(minutes=dur)).strftime("%Y-%m-%d %H:%M"),
+                                 locations[(gi + k) % len(locations)], ""))
+        first_sid = (conn.execute("SELECT COALESCE(MAX(id),0) FROM sessions").fetchone()[0]) + 1
+        conn.executemany("INSERT INTO sessions(coach_id,group_id,start_ts,end_ts,location,remark) VALUES (?,?,?,?,?,?)",
+                         sessions)
+        counts["sessions"] = len(sessions)
+
+        # Prisustvo: skupno iz sesija × članova grupe, deterministički "nasumično" po (sesija, član, seed)
+        cur = conn.execute("""
+            INSERT INTO attendance (session_id, member_id, present, minutes)
+            SELECT s.id, m.id, 1,
+                   CAST(ROUND((julianday(s.end_ts) - julianday(s.start_ts)) * 1440) AS INTEGER)
+            FROM sessions s
+            JOIN members m ON m.group_id = s.group_id
+            WHERE s.id >= ? AND m.id >= ?
+              AND ((s.id * 2654435761 + m.id * 40503 + ?) % 1000) < ?
+        """, (first_sid, first_mid, seed, int(attend_rate * 1000)))
+        counts["attendance"] = cur.rowcount
+
+        # Pripreme reprezentacije
+        first_camp = (conn.execute("SELECT COALESCE(MAX(id),0) FROM camps").fetchone()[0]) + 1
+        camps, camp_att = [], []
+        all_mids = list(member_age)
+        for i in range(cfg["camps"]):
+            sd = season_start + timedelta(days=rnd.randint(0, 350))
+            days = rnd.randint(3, 10)
+            camps.append((f"Pripreme {rnd.choice(['kadeti', 'juniori', 'seniori', 'U15', 'U23'])} {i + 1}",
+                          rnd.choice(PLACES)[0], rnd.choice(coaches)[0], sd.isoformat(),
+                          (sd + timedelta(days=days)).isoformat()))
+            for mid in rnd.sample(all_mids, min(len(all_mids), rnd.randint(3, 15))):
+                t = rnd.randint(days, days * 2)
+                camp_att.append((first_camp + i, mid, t, round(t * rnd.choice([1.5, 2.0]), 1)))
+        conn.executemany("INSERT INTO camps(title,place,coach,start_date,end_date) VALUES (?,?,?,?,?)", camps)
+        conn.executemany("INSERT INTO camp_attendance(camp_id,member_id,trainings,hours) VALUES (?,?,?,?)", camp_att)
+        counts["camps"] = len(camps)
+        counts["camp_attendance"] = len(camp_att)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.close()
+    return counts
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generator sintetičke baze kluba.")
+    ap.add_argument("db", help="odredišna baza (bit će kreirana ako ne postoji)")
+    ap.add_argument("--scale", choices=sorted(SCALES), default="small")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--season-start", type=date.fromisoformat, help="početak sezone YYYY-MM-DD")
+    ap.add_argument("--force", action="store_true", help="obriši postojeću datoteku prije generiranja")
+    for key in ("members", "groups", "coaches", "competitions", "attendance", "camps"):
+        ap.add_argument(f"--{key}", type=int, help=f"nadjačaj '{key}' iz odabrane skale")
+    args = ap.parse_args(argv)
+
+    if args.force:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    t0 = time.perf_counter()
+    counts = generate(args.db, args.scale, args.seed, args.season_start,
+                      **{k: getattr(args, k) for k in ("members", "groups", "coaches",
+                                                       "competitions", "attendance", "camps")})
+    for k, v in counts.items():
+        print(f"{k}: {v}")
+    print(f"Trajanje: {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Odjeljci web aplikacije (Streamlit). Svaki modul izlaže render() i ujedno je
+stranica za st.navigation: Streamlit izvodi samo datoteku aktivne stranice
+(kao __main__), pa se kod i podaci ostalih odjeljaka ne učitavaju. Uvoz
+modula ne izvodi SQL. SQL je u hk/queries.py.
+"""
+
+import os
+
+# naziv u navigaciji → modul u hk/views/ (prvi je početna stranica)
+SECTIONS = {
+    "Klub": "klub",
+    "Članovi": "clanovi",
+    "Treneri": "treneri",
+    "Natjecanja i rezultati": "natjecanja",
+    "Statistika": "statistika",
+    "Protivnici": "protivnici",
+    "Rejting": "rejting",
+    "Grupe": "grupe",
+    "Veterani": "veterani",
+    "Prisustvo": "prisustvo",
+}
+
+
+def page_path(section: str) -> str:
+    """Datoteka stranice relativno prema streamlit_app.py (st.Page, AppTest.switch_page)."""
+    return os.path.join("hk", "views", f"{SECTIONS[section]}.py")
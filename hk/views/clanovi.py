@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: članovi – upis, uvoz/izvoz, popis po grupama, uređivanje i kontakti."""
+
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from hk import queries as q
+from hk.dataio import (comp_results_template_df, excel_bytes_from_df, export_members, import_members,
+                       members_template_df)
+from hk.db import get_conn, get_read_conn
+from hk.expiry import expiring
+from hk.lookup import Lookup
+from hk.repos import Member, MembersRepo
+from hk.views.common import contact_links, import_upload, page_header, save_upload, select_id
+from hk.writer import get_writer
+
+
+# stupci koje obrazac za uređivanje mijenja (dokumenti i osobna/putovnica ostaju)
+EDIT_COLUMNS = ("full_name", "first_name", "last_name", "gender", "oib", "street", "city", "postal_code",
+                "parent_name", "athlete_email", "parent_email", "athlete_phone", "parent_phone",
+                "membership_fee_eur", "active_competitor", "veteran", "other_flag", "medical_valid_until", "group_id")
+
+
+def _countdown(col, valid_until: date):
+    days_left = (valid_until - date.today()).days
+    style = "color:#333;"
+    if days_left <= 14:
+        style = "color:#b00020; font-weight:600;"
+    col.markdown(f"<div style='{style}'>Preostalo: {days_left} dana</div>", unsafe_allow_html=True)
+
+
+def render():
+    page_header("Članovi", "Unos, uvoz/izvoz, uređivanje, dokumenti i liječničke potvrde")
+
+    # Predlošci
+    st.download_button("Skini predložak članova (Excel)",
+                       data=excel_bytes_from_df(members_template_df(), "ClanoviPredlozak"),
+                       file_name="clanovi_predlozak.xlsx")
+
+    st.download_button("Skini predložak rezultata (Excel)",
+                       data=excel_bytes_from_df(comp_results_template_df(), "RezultatiPredlozak"),
+                       file_name="rezultati_predlozak.xlsx")
+
+    conn = get_conn()
+    repo = MembersRepo(conn)
+
+    # Upozorenja o isteku dokumenata (indeksirani upit, prije popisa članova)
+    exp_df = expiring(conn, days=14)
+    if not exp_df.empty:
+        st.markdown("<div class='hk-danger'><b>Upozorenje:</b> Slijedećim članovima istječe (ili je nedavno istekla) liječnička, osobna ili putovnica u roku 14 dana:</div>", unsafe_allow_html=True)
+        st.dataframe(exp_df[["ime_prezime", "grupa", "dokument", "vrijedi_do", "dana"]],
+                     use_container_width=True, hide_index=True)
+
+    # Upload članova iz Excela
+    upl = st.file_uploader("Učitaj članove iz Excel tablice (po predlošku)", type=["xlsx"])
+    if upl:
+        try:
+            n, _ = import_upload(conn, upl, import_members)
+            st.success(f"Članovi su uvezeni ({n}).")
+        except Exception as e:
+            st.error(f"Greška pri uvozu: {e}")
+
+    groups = Lookup(q.groups(conn))
+
+    st.markdown("---")
+    st.subheader("Upis novog člana")
+    with st.form("new_member"):
+        # Grupa – istaknuta na početku
+        new_gid = select_id("Grupa (odaberi)", groups, blank="")
+
+        c1, c2 = st.columns(2)
+        first_name = c1.text_input("Ime")
+        last_name  = c1.text_input("Prezime")
+        full_name  = f"{first_name} {last_name}".strip()
+
+        # Datum rođenja i starost
+        dob = c1.date_input("Datum rođenja", value=None, help="dan.mjesec.godina")
+        if dob:
+            # izračun starosti
+            delta = date.today() - dob
+            years = delta.days // 365
+            days_rem = delta.days - years * 365
+            st.caption(f"Starost: **{years} godina, {days_rem} dana**")
+
+        gender = c1.selectbox("Spol", ["", "M", "Ž"])
+        oib = c1.text_input("OIB")
+
+        # Adresa split u zasebne kolone
+        street = c1.text_input("Ulica i kućni broj")
+        city = c1.text_input("Mjesto/Grad")
+        postal_code = c1.text_input("Poštanski broj")
+
+        # Roditelji i kontakti
+        parent_name  = c2.text_input("Ime i prezime roditelja/skrbnika")
+        athlete_email = c2.text_input("E-mail sportaša")
+        parent_email  = c2.text_input("E-mail roditelja")
+        athlete_phone = c2.text_input("Telefon sportaša (za WhatsApp)")
+        parent_phone  = c2.text_input("Telefon roditelja (za WhatsApp)")
+
+        st.markdown("**Osobna iskaznica**")
+        id_card_number = st.text_input("Broj osobne iskaznice")
+        id_card_issuer = st.text_input("Izdavatelj osobne")
+        id_card_valid_until = st.date_input("Vrijedi do (osobna)", value=None)
+
+        st.markdown("**Putovnica**")
+        passport_number = st.text_input("Broj putovnice")
+        passport_issuer = st.text_input("Izdavatelj putovnice")
+        passport_valid_until = st.date_input("Vrijedi do (putovnica)", value=None)
+
+        st.markdown("**Status**")
+        colA, colB, colC = st.columns(3)
+        active_competitor = colA.checkbox("Aktivni natjecatelj/ica", value=False)
+        veteran = colB.checkbox("Veteran", value=False)
+        other_flag = colC.checkbox("Ostalo", value=False)
+
+        fee_default = 30.0 if active_competitor else 0.0
+        fee = st.number_input("Članarina (EUR)", min_value=0.0, value=float(fee_default), step=5.0)
+
+        # Slika člana
+        photo = st.file_uploader("Slika člana (jpg/png)", type=["png","jpg","jpeg"])
+
+        # Liječnički pregled – prvo datum, uz odbrojavanje
+        st.markdown("**Liječnička potvrda**")
+        colm1, colm2 = st.columns([2,1])
+        medical_valid = colm1.date_input("Liječnička vrijedi do", value=None, help="dan.mjesec.godina")
+        if medical_valid:
+            _countdown(colm2, medical_valid)
+        medical = st.file_uploader("Upload liječničke potvrde (pdf/jpg/png)", type=["pdf","jpg","jpeg","png"])
+
+        # Privola i pristupnica
+        consent = st.file_uploader("Privola (pdf/jpg/png)", type=["pdf","jpg","jpeg","png"])
+        application = st.file_uploader("Pristupnica (pdf/jpg/png)", type=["pdf","jpg","jpeg","png"])
+
+        submit_member = st.form_submit_button("Spremi člana")
+
+    if submit_member:
+        member = Member(
+            full_name=full_name, first_name=first_name, last_name=last_name, dob=str(dob) if dob else "",
+            gender=gender, oib=oib, street=street, city=city, postal_code=postal_code,
+            residence=f"{street}, {city} {postal_code}",
+            athlete_email=athlete_email, parent_email=parent_email, athlete_phone=athlete_phone,
+            parent_phone=parent_phone, parent_name=parent_name,
+            id_card_number=id_card_number, id_card_issuer=id_card_issuer,
+            id_card_valid_until=str(id_card_valid_until) if id_card_valid_until else "",
+            passport_number=passport_number, passport_issuer=passport_issuer,
+            passport_valid_until=str(passport_valid_until) if passport_valid_until else "",
+            active_competitor=int(active_competitor), veteran=int(veteran), other_flag=int(other_flag),
+            membership_fee_eur=float(fee), group_id=new_gid,
+            photo_path=save_upload(photo, "members/photos"), consent_path=save_upload(consent, "members/consent"),
+            application_path=save_upload(application, "members/application"),
+            medical_path=save_upload(medical, "members/medical"),
+            medical_valid_until=str(medical_valid) if medical_valid else "")
+        try:
+            get_writer().write([MembersRepo.insert_op([member])])
+        except Exception as e:
+            st.error(f"Greška pri spremanju: {e}")
+        else:
+            st.success("Član je spremljen.")
+
+    # Popis članova – format datuma dd.mm.yyyy, dob (godine,dani), R.br. od 1
+    st.markdown("---")
+    st.subheader("Popis članova")
+    filter_gid = select_id("Filtriraj po grupi", groups, blank="Sve grupe")
+
+    rconn = get_read_conn()
+    mdf = export_members(rconn, filter_gid)
+    rconn.close()
+
+    st.dataframe(mdf, use_container_width=True)
+
+    # Export članova
+    st.download_button("Skini sve članove (Excel)" if filter_gid is None else "Skini članove grupe (Excel)",
+                       data=excel_bytes_from_df(mdf, "Clanovi"),
+                       file_name="clanovi.xlsx")
+
+    # Uređivanje/brisanje + kontakti i rezultati (članovi odabrane grupe)
+    st.markdown("---")
+    st.subheader("Uredi / obriši člana, kontakt i rezultati")
+    ids = Lookup((i, str(i)) for i, _ in repo.names(filter_gid))
+    if ids:
+        sel_id = select_id("Odaberi ID člana", ids)
+        m = repo.get(sel_id)
+
+        with st.form("edit_member"):
+            # Grupa
+            gsel = select_id("Grupa", groups, blank="", selected=m.group_id)
+
+            e1, e2 = st.columns(2)
+            m.first_name = e1.text_input("Ime", m.first_name or "")
+            m.last_name  = e1.text_input("Prezime", m.last_name or "")
+            m.gender     = e1.selectbox("Spol", ["","M","Ž"], index=["","M","Ž"].index(m.gender or ""))
+            m.oib        = e1.text_input("OIB", m.oib or "")
+            m.street     = e1.text_input("Ulica i broj", m.street or "")
+            m.city       = e1.text_input("Grad", m.city or "")
+            m.postal_code= e1.text_input("Poštanski broj", m.postal_code or "")
+
+            m.parent_name  = e2.text_input("Ime i prezime roditelja/skrbnika", m.parent_name or "")
+            m.athlete_email = e2.text_input("E-mail sportaša", m.athlete_email or "")
+            m.parent_email  = e2.text_input("E-mail roditelja", m.parent_email or "")
+            m.athlete_phone = e2.text_input("Telefon sportaša", m.athlete_phone or "")
+            m.parent_phone  = e2.text_input("Telefon roditelja", m.parent_phone or "")
+            m.membership_fee_eur = float(e2.number_input("Članarina (EUR)", min_value=0.0, step=5.0, value=float(m.membership_fee_eur or 0)))
+
+            ch1, ch2, ch3 = st.columns(3)
+            m.active_competitor = int(ch1.checkbox("Aktivni", bool(m.active_competitor)))
+            m.veteran           = int(ch2.checkbox("Veteran", bool(m.veteran)))
+            m.other_flag        = int(ch3.checkbox("Ostalo", bool(m.other_flag)))
+
+            # Liječnička datum s countdown prikazom
+            med1, med2 = st.columns([2,1])
+            med_valid = med1.date_input("Liječnička vrijedi do",
+                                        value=pd.to_datetime(m.medical_valid_until).date() if m.medical_valid_until else None)
+            if med_valid:
+                _countdown(med2, med_valid)
+
+            if st.form_submit_button("Spremi izmjene"):
+                m.full_name = f"{m.first_name} {m.last_name}".strip() or m.full_name
+                m.medical_valid_until = str(med_valid) if med_valid else ""
+                m.group_id = gsel
+                try:
+                    get_writer().write([MembersRepo.update_op([m], EDIT_COLUMNS)])
+                except Exception as e:
+                    st.error(f"Greška pri spremanju: {e}")
+                else:
+                    st.success("Izmjene spremljene.")
+
+        # Kontakti
+        contact_links(m.athlete_email, m.parent_email, m.athlete_phone, m.parent_phone,
+                      subject="Obavijest HK Podravka")
+
+        # Rezultati člana
+        st.markdown("**Rezultati ovog člana:**")
+        st.dataframe(q.member_results(conn, sel_id), use_container_width=True)
+
+        colbtn1, colbtn2 = st.columns(2)
+        if colbtn1.button("Obriši ovog člana"):
+            try:
+                get_writer().write([MembersRepo.delete_op([sel_id])])
+            except Exception as e:
+                st.error(f"Greška pri brisanju: {e}")
+            else:
+                st.success("Član obrisan.")
+    else:
+        st.info("Nema članova u bazi." if filter_gid is None else "Nema članova u ovoj grupi.")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Zajednički elementi odjeljaka: stil, zaglavlje, spremanje uploada, kontakti."""
+
+import hashlib
+import os
+from typing import Any, Callable, List, Optional, Tuple
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from hk.config import UPLOAD_DIR
+from hk.dataio import read_table
+from hk.lookup import Lookup
+from hk.sequence import run_immediate
+
+# Za ISO3 kodove
+try:
+    import pycountry
+except Exception:
+    pycountry = None
+
+# ==========================
+# KONSTANTE KLUBA I STIL
+# ==========================
+PRIMARY_RED = "#c1121f"   # klupska crvena
+GOLD        = "#d4af37"   # zlatna
+WHITE       = "#ffffff"
+LIGHT_BG    = "#fffaf8"
+
+# ==========================
+# POMOĆNE FUNKCIJE
+# ==========================
+def css_style():
+    st.markdown(f"""
+        <style>
+        :root {{
+            --hk-red: {PRIMARY_RED};
+            --hk-gold:{GOLD};
+            --hk-white:{WHITE};
+        }}
+        .hk-header {{
+            background: linear-gradient(90deg, var(--hk-red), #9b0d17);
+            color: white;
+            padding: 12px 16px;
+            border-radius: 12px;
+        }}
+        .hk-pill {{
+            background: {GOLD}22;
+            border: 1px solid {GOLD}66;
+            color: #333;
+            padding: 4px 10px;
+            border-radius: 999px;
+            font-size: 12px;
+        }}
+        .stButton>button {{
+            background-color: {PRIMARY_RED};
+            color: white;
+            border-radius: 10px;
+            border: 0;
+        }}
+        .stDownloadButton>button {{
+            border: 1px solid {GOLD};
+            border-radius: 10px;
+        }}
+        .hk-danger {{
+            background: #ffefef;
+            border-left: 4px solid #d11;
+            padding: 8px 12px;
+            border-radius: 8px;
+        }}
+        a.hk-btn {{
+            text-decoration:none; padding:6px 10px; border-radius:8px; border:1px solid #ddd; margin-right:6px;
+            display:inline-block;
+        }}
+        </style>
+    """, unsafe_allow_html=True)
+
+
+def page_header(title: str, subtitle: str = ""):
+    st.markdown(f"<div class='hk-header'><h3 style='margin:0'>{title}</h3>"
+                f"<div>{subtitle}</div></div>", unsafe_allow_html=True)
+
+
+def rerun_app(key: str, message: str):
+    """Puni rerun iz fragmenta (upis trebaju vidjeti i ostali paneli); poruka preživi rerun."""
+    st.session_state[f"_hk_flash_{key}"] = message
+    st.rerun(scope="app")
+
+
+def rerun_fragment(key: str, message: str):
+    """Rerun samo trenutnog fragmenta (upis mijenja samo njegov prikaz); poruka preživi rerun.
+
+    Ako se fragment upravo izvodi u punom rerunu, scope="fragment" nije dopušten – tada cijela stranica.
+    """
+    st.session_state[f"_hk_flash_{key}"] = message
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun(scope="app")
+
+
+def show_flash(key: str):
+    message = st.session_state.pop(f"_hk_flash_{key}", None)
+    if message:
+        st.success(message)
+
+
+def upload_key(file) -> str:
+    """Identitet uploada: Streamlitov file_id, a bez njega hash sadržaja."""
+    return getattr(file, "file_id", None) or hashlib.sha256(file.getvalue()).hexdigest()
+
+
+def run_once(key, fn: Callable[[], Any]) -> Any:
+    """Izvrši fn jednom po ključu u sesiji; svaki sljedeći rerun vraća zapamćeni rezultat.
+
+    Ključ je (radnja, upload_key(...)) – ista datoteka u uploaderu ne uvozi se
+    ponovno pri svakoj interakciji, a nova datoteka (novi file_id) hoće.
+    """
+    done = st.session_state.setdefault("_hk_once", {})
+    if key not in done:
+        done[key] = fn()
+    return done[key]
+
+
+def import_upload(conn, file, importer: Callable) -> Tuple[int, int]:
+    """Uvoz Excela iz uploadera jednom po datoteci: (uvezeno, redaka u tablici).
+
+    Tablica se čita prije BEGIN IMMEDIATE, a upis ide u jednoj transakciji.
+    """
+    def once():
+        df = read_table(file)
+        return run_immediate(conn, lambda c: importer(c, df)), len(df)
+    return run_once((importer.__name__, upload_key(file)), once)
+
+
+def save_upload(file, subdir: str) -> str:
+    """Spremi upload u uploads/subdir i vrati relativnu putanju.
+
+    Ime datoteke počinje hashom sadržaja pa se isti sadržaj zapisuje na disk
+    samo jednom; unutar sesije ni ne čita se ponovno (ključ je file_id).
+    """
+    if not file:
+        return ""
+
+    def write() -> str:
+        data = file.getvalue()
+        sd = os.path.join(UPLOAD_DIR, subdir)
+        os.makedirs(sd, exist_ok=True)
+        path = os.path.join(sd, f"{hashlib.sha256(data).hexdigest()[:16]}_{file.name}")
+        if not os.path.exists(path):
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return path
+    return run_once(("upload", subdir, upload_key(file)), write)
+
+
+def all_countries_list():
+    if pycountry is None:
+        return []
+    return sorted([c.name for c in pycountry.countries])
+
+
+def iso3(country_name: str) -> str:
+    if not country_name:
+        return ""
+    if pycountry is None:
+        return ""
+    try:
+        c = pycountry.countries.lookup(country_name)
+        return getattr(c, "alpha_3", "") or ""
+    except Exception:
+        return ""
+
+
+def mailto_link(address: str, subject: str = "", body: str = "") -> str:
+    if not address:
+        return ""
+    from urllib.parse import quote
+    return f"mailto:{address}?subject={quote(subject)}&body={quote(body)}"
+
+
+def whatsapp_link(phone_or_text: str) -> str:
+    # ako je broj, koristimo wa.me; inače samo text share
+    s = str(phone_or_text).strip()
+    base = "https://wa.me"
+    if s and all(ch.isdigit() or ch in "+ " for ch in s):
+        return f"{base}/{s.replace(' ', '')}"
+    else:
+        return f"{base}/?text={s.replace(' ', '%20')}"
+
+
+def contact_links(athlete_email: str, parent_email: str, athlete_phone: str, parent_phone: str, subject: str):
+    st.markdown(
+        f"[📧 Sportaš]({mailto_link(athlete_email, subject)}) &nbsp; "
+        f"[📧 Roditelj]({mailto_link(parent_email, subject)}) &nbsp; "
+        f"[🟢 WhatsApp sportaš]({whatsapp_link(athlete_phone)}) &nbsp; "
+        f"[🟢 WhatsApp roditelj]({whatsapp_link(parent_phone)})",
+        unsafe_allow_html=True
+    )
+
+
+def select_id(label: str, lookup: Lookup, *, blank: Optional[str] = None, selected: Optional[int] = None,
+              where=None, **kw) -> Optional[int]:
+    """selectbox nad šifrarnikom – vraća id (None za praznu opciju ako je zadan natpis blank)."""
+    lead = [None] if blank is not None else []
+    index = lookup.index(selected, -1) + len(lead) if selected in lookup else 0
+    return (where or st).selectbox(label, lead + lookup.options(), index=index,
+                                   format_func=lambda i: blank if i is None else lookup.label(i), **kw)
+
+
+def multiselect_ids(label: str, lookup: Lookup, *, where=None, **kw) -> List[int]:
+    return (where or st).multiselect(label, lookup.options(), format_func=lookup.label, **kw)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: grupe – dodavanje, preimenovanje, brisanje, raspored članova i Excel."""
+
+import sqlite3
+
+import streamlit as st
+
+from hk import queries as q
+from hk.dataio import excel_bytes_from_df, export_groups, import_groups
+from hk.db import get_conn
+from hk.lookup import Lookup
+from hk.repos import MembersRepo
+from hk.views.common import import_upload, page_header, rerun_app, select_id, show_flash
+from hk.writer import get_writer
+
+
+@st.fragment
+def group_roster(gid: int, gname: str, mems: Lookup):
+    """Popis jedne grupe s premještanjem; odabir člana ponovno izvodi samo ovu grupu."""
+    st.markdown(f"### {gname}")
+    conn = get_conn()
+    st.dataframe(q.group_roster(conn, gid), use_container_width=True)
+    conn.close()
+    show_flash(f"mv_{gid}")
+    # Premještanje člana
+    sel = select_id(f"Premjesti člana u '{gname}'", mems, key=f"mv_{gid}")
+    if st.button("Premjesti", key=f"btnmv_{gid}"):
+        try:
+            get_writer().write([MembersRepo.move_to_group_op([sel], gid)])
+        except Exception as e:
+            st.error(f"Greška pri premještanju: {e}")
+        else:
+            # član nestaje iz popisa svoje dosadašnje grupe – puni rerun
+            rerun_app(f"mv_{gid}", "Premješten.")
+
+
+def render():
+    page_header("Grupe", "Dodavanje/uređivanje/brisanje i raspored članova + Excel import/export")
+
+    conn = get_conn()
+    # Dodavanje / uređivanje / brisanje
+    with st.form("group_crud"):
+        col = st.columns(3)
+        gname = col[0].text_input("Naziv grupe (dodaj)")
+        edit_id = col[1].number_input("ID za preimenovanje", min_value=0, step=1)
+        new_name = col[1].text_input("Novo ime")
+        del_id = col[2].number_input("ID za brisanje", min_value=0, step=1)
+        submitted = st.form_submit_button("Primijeni")
+    if submitted:
+        if gname:
+            try:
+                q.add_group(conn, gname)
+                st.success("Grupa dodana.")
+            except sqlite3.IntegrityError:
+                st.warning("Grupa već postoji.")
+        if edit_id and new_name:
+            q.rename_group(conn, edit_id, new_name)
+            st.success("Grupa preimenovana.")
+        if del_id:
+            q.delete_group(conn, del_id)
+            st.success("Grupa obrisana.")
+
+    # Popis grupa i članova
+    mems = Lookup.from_rows(MembersRepo(conn).names(), "{} – {}".format)
+    for gid, gname in q.groups(conn):
+        group_roster(gid, gname, mems)
+
+    # Uvoz/izvoz (Excel)
+    st.markdown("---")
+    st.subheader("Excel import/export")
+    st.download_button("Skini popis grupa (Excel)",
+                       data=excel_bytes_from_df(export_groups(conn), "Grupe"),
+                       file_name="grupe.xlsx")
+    upl = st.file_uploader("Učitaj grupe (Excel s kolonom 'name')", type=["xlsx"])
+    if upl:
+        try:
+            n, _ = import_upload(conn, upl, import_groups)
+            st.success(f"Grupe uvezene ({n} novih).")
+        except Exception as e:
+            st.error(f"Greška: {e}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
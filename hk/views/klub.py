@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: osnovni podaci o klubu, tijela upravljanja i dokumenti."""
+
+import pandas as pd
+import streamlit as st
+
+from hk import assets, maintenance
+from hk import queries as q
+from hk.config import KLUB_EMAIL, KLUB_IBAN, KLUB_NAZIV, KLUB_OIB, KLUB_WEB
+from hk.db import get_conn
+from hk.views.common import page_header, run_once, save_upload
+
+
+def _people(df: pd.DataFrame):
+    return [(r.get("ime_prezime", ""), r.get("telefon", ""), r.get("email", ""))
+            for r in df.dropna(how="all").to_dict("records")]
+
+
+def render():
+    conn = get_conn()
+    df = q.club_info(conn)
+
+    def val(col, default=""):
+        return df.loc[0, col] if col in df.columns and not df.empty else default
+
+    page_header("Osnovni podaci o klubu",
+                "Unesite i spremite podatke kluba, vodstva i dokumente.")
+    st.caption("Logo i boje: crvena • bijela • zlatna")
+
+    with st.container():
+        c1, c2 = st.columns(2)
+        with c1:
+            logo_upload = st.file_uploader("Učitaj vlastiti logo (opcionalno)", type=["png","jpg","jpeg"])
+            # isti logo (file_id / sadržaj) zapisuje se samo jednom, ne pri svakom rerunu
+            logo_path = save_upload(logo_upload, "logo") if logo_upload else q.club_logo(conn)
+            if logo_upload:
+                run_once(("club_logo", logo_path), lambda: q.set_club_logo(conn, logo_path))
+            st.image(assets.logo(assets.HEADER_WIDTH, logo_path), caption=KLUB_NAZIV)
+
+        with c2:
+            st.markdown("**Društvene mreže**")
+            instagram = st.text_input("Instagram URL", val("instagram"))
+            facebook  = st.text_input("Facebook URL",  val("facebook"))
+            tiktok    = st.text_input("TikTok URL",    val("tiktok"))
+
+    with st.form("club_form"):
+        st.subheader("Osnovni podaci")
+        a1, a2 = st.columns(2)
+        name = a1.text_input("KLUB (IME)", val("name", KLUB_NAZIV))
+        street = a1.text_input("Ulica i kućni broj", val("street", "Miklinovec 6a"))
+        city_zip = a1.text_input("Grad i poštanski broj", val("city_zip", "48000 Koprivnica"))
+        email = a2.text_input("E-mail", val("email", KLUB_EMAIL))
+        web = a2.text_input("Web stranica", val("web", KLUB_WEB))
+        iban = a2.text_input("IBAN račun", val("iban", KLUB_IBAN))
+        oib = a2.text_input("OIB", val("oib", KLUB_OIB))
+
+        st.subheader("Tijela upravljanja")
+        president = st.text_input("Predsjednik kluba", val("president"))
+        secretary = st.text_input("Tajnik kluba", val("secretary"))
+
+        st.markdown("**Članovi predsjedništva**")
+        board_df = st.data_editor(pd.DataFrame(columns=["ime_prezime","telefon","email"]), num_rows="dynamic", use_container_width=True, hide_index=True, key="board_editor")
+        st.markdown("**Nadzorni odbor**")
+        superv_df = st.data_editor(pd.DataFrame(columns=["ime_prezime","telefon","email"]), num_rows="dynamic", use_container_width=True, hide_index=True, key="supervisor_editor")
+
+        st.subheader("Dokumenti kluba")
+        d1, d2, d3 = st.columns(3)
+        statut = d1.file_uploader("Statut", type=["pdf","doc","docx"])
+        pravilnik = d2.file_uploader("Pravilnik/Opći akt", type=["pdf","doc","docx"])
+        doc_ostalo = d3.file_uploader("Ostali dokument", type=["pdf","doc","docx","png","jpg","jpeg"])
+
+        submitted = st.form_submit_button("Spremi podatke kluba")
+
+    if submitted:
+        info = dict(name=name, street=street, city_zip=city_zip, email=email, oib=oib, web=web, iban=iban,
+                    president=president, secretary=secretary,
+                    instagram=instagram, facebook=facebook, tiktok=tiktok)
+        docs = [(label, f.name, save_upload(f, "club_docs"))
+                for label, f in [("statut", statut), ("pravilnik", pravilnik), ("ostalo", doc_ostalo)] if f]
+        q.save_club(conn, info, _people(board_df), _people(superv_df), docs)
+        st.success("Podaci kluba spremljeni.")
+
+    # Pregled dokumenata
+    st.dataframe(q.club_docs(conn), use_container_width=True)
+
+    with st.expander("Održavanje baze"):
+        hist = maintenance.history(conn)
+        if hist.empty:
+            st.caption("Još nije bilo održavanja (pokreće se pri pokretanju aplikacije ili: python -m hk.maintenance run).")
+        else:
+            st.line_chart(hist.set_index("početak")[["mb_poslije", "slobodne_pct"]].iloc[::-1])
+            st.dataframe(hist, use_container_width=True, hide_index=True)
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
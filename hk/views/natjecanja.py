@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: natjecanja i rezultati – unos, uvoz/izvoz, uređivanje i pretraga."""
+
+from datetime import date, datetime
+
+import streamlit as st
+
+from hk import queries as q
+from hk.config import AGES, KINDS, REP_SUB, STYLES
+from hk.dataio import excel_bytes_from_df, export_results, import_results
+from hk.db import get_conn, get_read_conn
+from hk.lookup import Lookup
+from hk.repos import Competition, CompetitionsRepo, MembersRepo, Result, ResultsRepo
+from hk.sequence import next_redni_broj, run_immediate
+from hk.views.common import (all_countries_list, import_upload, iso3, multiselect_ids, page_header, rerun_app,
+                             rerun_fragment, save_upload, select_id, show_flash)
+from hk.writer import get_writer
+
+
+@st.fragment
+def results_entry():
+    """Unos rezultata po sportašu; odabir natjecanja/sportaša ponovno izvodi samo ovaj panel."""
+    conn = get_conn()
+    comps = CompetitionsRepo(conn).choices()
+    members = Lookup.from_rows(MembersRepo(conn).names(), "{} – {}".format)
+    conn.close()
+    show_flash("results_entry")
+    if not (comps and members):
+        st.info("Za unos rezultata potreban je barem jedan član i jedno natjecanje.")
+        return
+
+    cid = select_id("Natjecanje", Lookup.from_rows(comps, "{} – {} ({})".format))
+    mem_sel = multiselect_ids("Odaberi sportaše (iz baze)", members)
+    with st.form("add_results"):
+        for idx, ms in enumerate(mem_sel):
+            st.markdown(f"**#{idx+1} – {members.label(ms)}**")
+            st.text_input("Kategorija", key=f"k_{idx}")
+            st.selectbox("Stil", STYLES, key=f"s_{idx}")
+            st.number_input("Ukupno borbi", min_value=0, step=1, key=f"bt_{idx}")
+            st.number_input("Pobjede", min_value=0, step=1, key=f"w_{idx}")
+            st.number_input("Porazi", min_value=0, step=1, key=f"l_{idx}")
+            st.number_input("Plasman (1-100)", min_value=1, max_value=100, step=1, key=f"p_{idx}")
+            st.text_area("Protivnici (JSON lista objekata name/club/result)", key=f"o_{idx}")
+            st.text_area("Napomena", key=f"n_{idx}")
+        sres = st.form_submit_button("Spremi rezultate")
+    if sres:
+        ss = st.session_state
+        rows = [Result(competition_id=cid, member_id=ms, weight_category=ss[f"k_{idx}"],
+                       style=ss[f"s_{idx}"], bouts_total=int(ss[f"bt_{idx}"]), wins=int(ss[f"w_{idx}"]),
+                       losses=int(ss[f"l_{idx}"]), placement=int(ss[f"p_{idx}"]),
+                       opponent_list=ss[f"o_{idx}"], notes=ss[f"n_{idx}"])
+                for idx, ms in enumerate(mem_sel)]
+        try:
+            get_writer().write([ResultsRepo.insert_op(rows)])
+        except Exception as e:
+            st.error(f"Greška pri spremanju: {e}")
+        else:
+            # novi retci trebaju i uređivaču i pretrazi – puni rerun
+            rerun_app("results_entry", "Rezultati spremljeni.")
+
+
+@st.fragment
+def results_editor():
+    """Uređivanje/brisanje rezultata odabranog natjecanja kao zaseban panel."""
+    conn = get_conn()
+    show_flash("results_editor")
+    try:
+        comps = CompetitionsRepo(conn).choices()
+        if not comps:
+            st.info("Nema natjecanja.")
+            return
+        comp_id_e = select_id("Natjecanje", Lookup.from_rows(comps, lambda i, n, d: f"{n or ''} {d or ''}"),
+                              key="res_edit_comp")
+        results = ResultsRepo(conn)
+        rlist = results.for_competition(comp_id_e)
+        if not rlist:
+            st.info("Nema unesenih rezultata za ovo natjecanje.")
+            return
+        mem_names = Lookup(MembersRepo(conn).names())
+        for rowr in rlist:
+            rid = rowr.id
+            with st.expander(f"#{rid} – {mem_names.label(rowr.member_id)} • {rowr.weight_category} • {rowr.placement}"):
+                c1, c2 = st.columns(2)
+                with c1:
+                    member_id_e = select_id("Sportaš", mem_names, selected=rowr.member_id, key=f"res_member_{rid}")
+                    weight_e = st.text_input("Težinska kategorija", value=rowr.weight_category or "", key=f"res_weight_{rid}")
+                    placing_e = st.number_input("Plasman", min_value=0, max_value=100, step=1, value=int(rowr.placement or 0), key=f"res_placing_{rid}")
+                with c2:
+                    style_e = st.selectbox("Stil", STYLES, index=(STYLES.index(rowr.style) if rowr.style in STYLES else 0), key=f"res_style_{rid}")
+                    result_text_e = st.text_input("Napomena", value=rowr.notes or "", key=f"res_text_{rid}")
+                b1, b2 = st.columns(2)
+                with b1:
+                    if st.button("Spremi izmjene", key=f"btn_save_res_{rid}"):
+                        row = Result(id=rid, member_id=member_id_e, weight_category=weight_e, style=style_e,
+                                     placement=int(placing_e), notes=result_text_e)
+                        try:
+                            get_writer().write([ResultsRepo.update_op([row], ResultsRepo.EDIT_COLUMNS)])
+                        except Exception as e:
+                            st.error(f"Greška pri spremanju: {e}")
+                        else:
+                            # novi natpisi retka – rerun samo ovog panela
+                            rerun_fragment("results_editor", "Rezultat ažuriran.")
+                with b2:
+                    if st.button("Obriši rezultat", key=f"btn_del_res_{rid}"):
+                        try:
+                            get_writer().write([ResultsRepo.delete_op([rid])])
+                        except Exception as e:
+                            st.error(f"Greška pri brisanju: {e}")
+                        else:
+                            rerun_fragment("results_editor", "Rezultat obrisan.")
+    finally:
+        conn.close()
+
+
+def render():
+    page_header("Natjecanja i rezultati", "Unos natjecanja, datoteka, rezultata i pretraga")
+
+    conn = get_conn()
+
+    with st.form("comp_form"):
+        col1, col2, col3 = st.columns([2,2,2])
+        with col1:
+            kind = st.selectbox("Vrsta natjecanja", KINDS)
+        with col2:
+            rep_enabled = (kind == "REPREZENTATIVNI NASTUP")
+            rep_sub = st.selectbox("Podvrsta (REP)", REP_SUB, disabled=not rep_enabled)
+        with col3:
+            custom_kind = st.text_input("Upiši vrstu (ako 'OSTALO')", disabled=(kind!="OSTALO"))
+        name = st.text_input("Ime natjecanja (ako postoji naziv)")
+        c1, c2 = st.columns(2)
+        date_from = c1.date_input("Datum od", value=date.today())
+        date_to = c2.date_input("Datum do (ako 1 dan, ostavi isti)", value=date.today())
+        place = st.text_input("Mjesto")
+        countries = all_countries_list()
+        c_country, c_iso = st.columns([3,1])
+        with c_country:
+            country = st.selectbox("Država (odaberi)", [""] + countries, index=0)
+        with c_iso:
+            auto_iso = iso3(country) if country else ""
+            st.text_input("ISO3 kratica", value=auto_iso, disabled=True)
+        style = st.selectbox("Hrvački stil", STYLES)
+        age_group = st.selectbox("Uzrast", AGES)
+        c3, c4, c5 = st.columns(3)
+        team_rank = c3.text_input("Ekipni poredak (npr. 1., 5., 10.)")
+        club_competitors = c4.number_input("Broj naših natjecatelja", min_value=0, step=1)
+        total_competitors = c5.number_input("Ukupan broj natjecatelja", min_value=0, step=1)
+        c6, c7 = st.columns(2)
+        total_clubs = c6.number_input("Broj klubova", min_value=0, step=1)
+        total_countries = c7.number_input("Broj zemalja", min_value=0, step=1)
+
+        # Treneri koji su vodili
+        coach_choices = Lookup(q.coaches(conn))
+        c_coach_sel, c_coach_custom = st.columns([2,1])
+        coach_mult = multiselect_ids("Trener(i) (iz baze)", coach_choices, where=c_coach_sel)
+        with c_coach_custom:
+            coach_custom = st.text_input("Dodatni trener (ime i prezime)")
+        coach_all = [c for c in ([coach_choices.label(i) for i in coach_mult] + ([coach_custom] if coach_custom else [])) if c]
+        coach_text = ", ".join(coach_all)
+
+        # Opis i linkovi + upload
+        notes = st.text_area("Zapažanje trenera (za objave)")
+        bulletin_link = st.text_input("Link na bilten/rezultate")
+        results_link = st.text_input("Link na službene rezultate")
+        gallery_link = st.text_input("Link na objavu na webu (galerija)")
+        bulletin_file = st.file_uploader("Učitaj bilten (pdf)", type=["pdf"])
+        results_file = st.file_uploader("Učitaj rezultate (pdf/xlsx)", type=["pdf","xlsx"])
+
+        # Slike
+        photos = st.file_uploader("Slike s natjecanja (više datoteka)", type=["jpg","jpeg","png"], accept_multiple_files=True)
+
+        submit = st.form_submit_button("Spremi natjecanje")
+
+    if submit:
+        # novi treneri tek pri spremanju, ne pri svakom rerunu dok se obrazac ispunjava
+        q.ensure_coaches(conn, coach_all)
+        bull_p = save_upload(bulletin_file, "competitions/docs") if bulletin_file else ""
+        res_p = save_upload(results_file, "competitions/docs") if results_file else ""
+        photo_paths = [(ph.name, save_upload(ph, "competitions/photos")) for ph in photos or []]
+
+        def insert_comp(c):
+            # redni broj i upis u istoj transakciji – nema sudara kod istovremenog unosa
+            rb = next_redni_broj(c)
+            repo = CompetitionsRepo(c)
+            comp_id = repo.insert(Competition(
+                redni_broj=rb, kind=kind, custom_kind=rep_sub if kind=="REPREZENTATIVNI NASTUP" else custom_kind,
+                name=name, date_from=str(date_from), date_to=str(date_to), place=f"{place}, {country}",
+                style=style, age_group=age_group, country=country, country_code=auto_iso, team_rank=team_rank,
+                club_competitors=int(club_competitors), total_competitors=int(total_competitors),
+                total_clubs=int(total_clubs), total_countries=int(total_countries), coaches_text=coach_text,
+                notes=notes, bulletin_link=bulletin_link, results_link=results_link, gallery_link=gallery_link,
+                bulletin_file=bull_p, results_file=res_p))
+            repo.add_photos(comp_id, photo_paths, datetime.now().isoformat())
+            return rb
+        rb = run_immediate(conn, insert_comp)
+        st.success(f"Natjecanje spremljeno (redni broj {rb}).")
+
+    # Dodavanje rezultata po sportašu
+    st.markdown("---")
+    st.subheader("Rezultati sportaša")
+    results_entry()
+
+    # Uvoz/izvoz rezultata iz Excela
+    upl = st.file_uploader("Učitaj rezultate (Excel po predlošku)", type=["xlsx"], key="upl_res")
+    if upl:
+        try:
+            n, total = import_upload(conn, upl, import_results)
+            st.success(f"Rezultati uvezeni ({n} od {total} redaka).")
+        except Exception as e:
+            st.error(f"Greška pri uvozu: {e}")
+    # Izvoz i pretraga čitaju preko konekcije samo za čitanje
+    rconn = get_read_conn()
+    # Export svih rezultata
+    st.download_button("Skini sve rezultate (Excel)",
+                       data=excel_bytes_from_df(export_results(rconn), "Rezultati"),
+                       file_name="rezultati.xlsx")
+
+    st.markdown("---")
+    st.subheader("Uredi / obriši rezultate")
+    results_editor()
+
+    st.subheader("Pregled i pretraga natjecanja")
+    colf = st.columns(5)
+    f_kind = colf[0].text_input("Vrsta (dio naziva)")
+    f_year = colf[1].text_input("Godina (npr. 2025)")
+    f_age  = colf[2].text_input("Uzrast (dio naziva)")
+    f_style= colf[3].text_input("Stil (GR/FS/WW/BW/MOD)")
+    f_country = colf[4].text_input("Država (dio naziva)")
+    if st.button("Pretraži"):
+        cdf = q.search_competitions(rconn, f_kind, f_year, f_age, f_style, f_country, detailed=True)
+    else:
+        cdf = q.search_competitions(rconn)
+    st.dataframe(cdf, use_container_width=True)
+
+    rconn.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
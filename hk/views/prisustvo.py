@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: prisustvo – sesije, tjedni raspored, prisustvo sportaša, pripreme i analitika."""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from hk import analytics
+from hk import queries as q
+from hk.camps import CAMP_ATTENDANCE_UPSERT, camp_season_report, camp_seasons, season_label, upsert_rows
+from hk.config import LOCATIONS
+from hk.dataio import excel_bytes_from_df
+from hk.db import get_conn, get_read_conn, read_snapshot
+from hk.lookup import Lookup
+from hk.repos import Attendance, AttendanceRepo, MembersRepo
+from hk.schedule import DANI, add_slot, canonical_ts, insert_season_sessions, month_range, season_bounds
+from hk.views.common import multiselect_ids, page_header, select_id
+from hk.writer import get_writer
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def attendance_analytics(window: str, as_of: date, fp: tuple) -> dict:
+    """Rezultat analitike; otisak podataka (fp) poništava cache nakon upisa."""
+    conn = get_read_conn()
+    try:
+        with read_snapshot(conn):
+            return analytics.compute(conn, window, as_of)
+    finally:
+        conn.close()
+
+
+@st.fragment
+def attendance_checkin():
+    """Prozivka sesije: odabir sesije, kvačice i spremanje ponovno izvode samo ovaj panel."""
+    conn = get_conn()
+    sessions = q.sessions(conn)
+    if not sessions:
+        conn.close()
+        st.info("Najprije unesite sesiju.")
+        return
+    sid = select_id("Sesija", Lookup.from_rows(sessions, "{} – {} – {} – {}".format))
+    # predložena grupa članova
+    mems = MembersRepo(conn).names(q.session_group(conn, sid))
+    # već spremljeno prisustvo sesije ima prednost
+    saved = AttendanceRepo(conn).for_session(sid)
+    conn.close()
+
+    minutes = st.number_input("Trajanje treninga (minute po sportašu)", min_value=0, step=15, value=90)
+    # Zadano: cijela grupa prisutna
+    roster = pd.DataFrame([{"id": m[0], "sportaš": m[1],
+                            "prisutan": bool(saved[m[0]].present) if m[0] in saved else True,
+                            "minute": int(saved[m[0]].minutes or 0) if m[0] in saved else int(minutes)}
+                           for m in mems],
+                          columns=["id", "sportaš", "prisutan", "minute"])
+    edited = st.data_editor(roster, key=f"att_roster_{sid}", hide_index=True, use_container_width=True,
+                            disabled=["id", "sportaš"],
+                            column_config={"prisutan": st.column_config.CheckboxColumn("Prisutan"),
+                                           "minute": st.column_config.NumberColumn("Minute", min_value=0, step=15)})
+    st.caption(f"Prisutno: {int(edited['prisutan'].sum())} / {len(edited)}")
+    if st.button("Spremi prisustvo"):
+        rows = [Attendance(session_id=sid, member_id=int(r.id), present=int(bool(r.prisutan)),
+                           minutes=int(r.minute or 0) if r.prisutan else 0)
+                for r in edited.itertuples(index=False)]
+        try:
+            # jedan paket = jedna transakcija; ponovljeni klik samo prepisuje iste retke
+            get_writer().write([AttendanceRepo.upsert_op(rows)])
+            st.success(f"Prisustvo spremljeno ({len(rows)} sportaša).")
+        except Exception as e:
+            st.error(f"Greška pri spremanju: {e}")
+
+
+def render():
+    page_header("Prisustvo", "Evidencija prisustva trenera i sportaša, statistika i pripreme reprezentacije")
+
+    conn = get_conn()
+
+    st.subheader("Upis prisustva trenera (sesija)")
+    coaches = Lookup.from_rows(q.coaches(conn), "{} – {}".format)
+    groups = Lookup.from_rows(q.groups(conn), "{} – {}".format)
+
+    if coaches and groups:
+        csel = select_id("Trener", coaches)
+        gsel = select_id("Grupa", groups)
+        t1, t2 = st.columns(2)
+        start_ts = t1.text_input("Početak (YYYY-MM-DD HH:MM)", value=datetime.now().strftime("%Y-%m-%d 18:00"))
+        end_ts   = t2.text_input("Kraj (YYYY-MM-DD HH:MM)", value=datetime.now().strftime("%Y-%m-%d 19:30"))
+        loc = st.selectbox("Mjesto", LOCATIONS)
+        if loc == "Drugo (upiši)":
+            loc = st.text_input("Upiši mjesto")
+        remark = st.text_input("Napomena")
+        if st.button("Spremi sesiju"):
+            try:
+                start_ts, end_ts = canonical_ts(start_ts), canonical_ts(end_ts)
+                if end_ts <= start_ts:
+                    raise ValueError("Kraj mora biti nakon početka")
+                get_writer().write([(q.SESSION_INSERT,
+                                     (csel, gsel, start_ts, end_ts, loc, remark))])
+                st.success("Sesija spremljena.")
+            except Exception as e:
+                st.error(f"Greška pri spremanju: {e}")
+
+        st.subheader("Tjedni raspored treninga")
+        with st.form("slot_form"):
+            r1, r2, r3 = st.columns(3)
+            s_group = select_id("Grupa", groups, where=r1, key="slot_group")
+            s_coach = select_id("Trener", coaches, where=r2, key="slot_coach")
+            s_day = r3.selectbox("Dan", list(range(7)), format_func=lambda d: DANI[d])
+            r4, r5, r6 = st.columns(3)
+            s_time = r4.text_input("Početak (HH:MM)", value="18:00")
+            s_dur = r5.number_input("Trajanje (min)", min_value=15, step=15, value=90)
+            s_loc = r6.selectbox("Mjesto", [l for l in LOCATIONS if l != "Drugo (upiši)"], key="slot_loc")
+            add_sub = st.form_submit_button("Dodaj termin")
+        if add_sub:
+            try:
+                get_writer().write(lambda c: add_slot(c, s_group, s_coach, s_day, s_time, int(s_dur), s_loc))
+                st.success("Termin dodan.")
+            except Exception as e:
+                st.error(f"Greška pri spremanju: {e}")
+
+        slots = q.schedule_slots(conn)
+        if not slots.empty:
+            slots["dan"] = slots["dan"].map(lambda d: DANI[int(d)])
+            st.dataframe(slots, use_container_width=True, hide_index=True)
+            active = Lookup((r.id, f"{r.id} – {r.grupa} {r.dan} {r.početak}")
+                            for r in slots.itertuples() if r.aktivan)
+            off = multiselect_ids("Isključi termine", active)
+            if off and st.button("Isključi odabrane"):
+                get_writer().write([(q.SLOT_DEACTIVATE, [(o,) for o in off])])
+                st.success("Termini isključeni.")
+            season_from, season_to = season_bounds()
+            g1, g2 = st.columns(2)
+            gen_from = g1.date_input("Generiraj od", value=season_from)
+            gen_to = g2.date_input("Generiraj do", value=season_to)
+            if st.button("Generiraj treninge za razdoblje"):
+                try:
+                    n = get_writer().write(lambda c: insert_season_sessions(c, gen_from, gen_to), timeout=120)
+                    st.success(f"Upisano novih sesija: {n} (postojeće su preskočene).")
+                except Exception as e:
+                    st.error(f"Greška pri generiranju: {e}")
+    else:
+        st.info("Dodajte trenere i grupe.")
+
+    st.subheader("Prisustvo sportaša")
+    attendance_checkin()
+
+    # Pripreme reprezentacije
+    st.markdown("---")
+    st.subheader("Pripreme reprezentacije (evidencija)")
+    with st.form("camp_form"):
+        title = st.text_input("Naziv/Opis priprema")
+        place = st.text_input("Mjesto")
+        coach = st.text_input("Voditelj (trener)")
+        c1, c2 = st.columns(2)
+        sd = c1.date_input("Od", value=date.today())
+        ed = c2.date_input("Do", value=date.today() + timedelta(days=7))
+        submit = st.form_submit_button("Spremi pripreme")
+    if submit:
+        q.insert_camp(conn, title, place, coach, str(sd), str(ed))
+        st.success("Pripreme spremljene.")
+
+    camps = q.camps(conn)
+    if camps:
+        camp_id = select_id("Odaberi pripreme", Lookup.from_rows(camps, "{} – {} ({}–{})".format))
+        mems2 = Lookup.from_rows(MembersRepo(conn).names(), "{} – {}".format)
+        n_already = q.camp_member_count(conn, camp_id)
+        picks2 = multiselect_ids("Članovi na pripremama", mems2)
+        if n_already:
+            st.caption(f"Već upisano sportaša: {n_already} (ponovni upis ažurira treninge i sate)")
+        tnum = st.number_input("Broj treninga", min_value=0, step=1)
+        thrs = st.number_input("Sati", min_value=0.0, step=0.5)
+        if st.button("Spremi sudjelovanje"):
+            rows = upsert_rows(camp_id, picks2, tnum, thrs)
+            try:
+                # ponovno spremanje prepisuje treninge/sate umjesto dupliciranja
+                get_writer().write([(CAMP_ATTENDANCE_UPSERT, rows)])
+                st.success(f"Sudjelovanje spremljeno ({len(rows)} sportaša).")
+            except Exception as e:
+                st.error(f"Greška pri spremanju: {e}")
+
+        seasons = camp_seasons(conn)
+        if seasons:
+            st.markdown("**Izvještaj priprema za sezonu**")
+            season = st.selectbox("Sezona", seasons, format_func=season_label, key="camp_season")
+            rep = camp_season_report(conn, season)
+            st.dataframe(rep, use_container_width=True, hide_index=True)
+            st.download_button("Preuzmi izvještaj priprema (Excel)",
+                               data=excel_bytes_from_df(rep, "Pripreme"),
+                               file_name=f"pripreme_{season_label(season).replace('/', '-')}.xlsx")
+
+    # Statistika za mjesec
+    st.markdown("---")
+    st.subheader("Statistika prisustva (mjesec)")
+    months = q.session_months(conn)
+    month = st.selectbox("Mjesec (YYYY-MM)", months if months else [])
+    if month:
+        n_sess, coach_min, n_att, att_min = q.month_totals(conn, *month_range(month))
+        st.write(f"- Broj treninga: **{n_sess}**")
+        st.write(f"- Ukupno minuta (treneri): **{coach_min}**")
+        st.write(f"- Prisustava (sportaši): **{n_att}**")
+        st.write(f"- Ukupno minuta (sportaši): **{att_min}**")
+
+    # Analitika (sezona / zadnja 4 tjedna)
+    st.markdown("---")
+    st.subheader("Analitika prisustva")
+    last = analytics.latest_session_date(conn)
+    if last:
+        a1, a2 = st.columns(2)
+        window = a1.radio("Razdoblje", list(analytics.WINDOWS), format_func=analytics.WINDOWS.get, horizontal=True)
+        as_of = a2.date_input("Do datuma", value=min(last, date.today()))
+        res = attendance_analytics(window, as_of, analytics.fingerprint(conn))
+        st.caption(f"{res['od']} – {res['do']} • dohvat {res['ms']['dohvat']} ms, izračun {res['ms']['izračun']} ms")
+        st.markdown("**Grupe**")
+        st.dataframe(res["grupe"], use_container_width=True, hide_index=True)
+        if not res["tjedno"].empty:
+            st.markdown("**Tjedni postotak dolazaka (pomični prosjek 4 tjedna)**")
+            st.line_chart(res["tjedno"])
+        st.markdown("**Sportaši**")
+        st.dataframe(res["sportasi"].drop(columns=["member_id"]), use_container_width=True, hide_index=True)
+        st.markdown("**Sati trenera**")
+        st.dataframe(res["treneri"], use_container_width=True, hide_index=True)
+        if not res["treneri"].empty:
+            st.bar_chart(res["treneri"].set_index("trener")["sati"])
+    else:
+        st.info("Nema sesija za analitiku.")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
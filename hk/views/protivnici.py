@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: protivnici – međusobni omjeri sportaša i omjer po klubovima protivnika."""
+
+import time
+
+import streamlit as st
+
+from hk import bouts
+from hk.db import get_conn, get_read_conn
+from hk.lookup import Lookup
+from hk.repos import MembersRepo
+from hk.views.common import page_header, select_id
+
+
+def render():
+    page_header("Protivnici", "Kako naši sportaši stoje protiv pojedinih protivnika i klubova")
+
+    # novi/izmijenjeni rezultati → borbe (bez promjena je to jedan prazan upit)
+    conn = get_conn()
+    bouts.refresh(conn)
+    conn.close()
+
+    rconn = get_read_conn()
+    members = Lookup.from_rows(MembersRepo(rconn).names(), "{} – {}".format)
+    c1, c2 = st.columns(2)
+    with c1:
+        mid = select_id("Sportaš", members, blank="Svi sportaši")
+    search = c2.text_input("Protivnik (dio imena ili prezimena)")
+
+    t0 = time.perf_counter()
+    opp = bouts.opponents(rconn, search, mid)
+    st.dataframe(opp.drop(columns=["ključ"]), use_container_width=True, hide_index=True)
+    if not opp.empty:
+        names = dict(zip(opp["ključ"], opp["protivnik"] + " (" + opp["klub"] + ")"))
+        key = st.selectbox("Borbe protiv", list(names), format_func=names.get)
+        h2h = bouts.head_to_head(rconn, key, mid)
+        wins = int((h2h["ishod"] == "win").sum())
+        st.markdown(f"**{wins} : {int((h2h['ishod'] == 'lose').sum())}** (pobjede : porazi)")
+        st.dataframe(h2h, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.subheader("Klubovi protivnika")
+    min_bouts = st.number_input("Najmanje borbi", min_value=1, value=3, step=1)
+    st.dataframe(bouts.club_record(rconn, mid, int(min_bouts)), use_container_width=True, hide_index=True)
+    st.caption(f"Upiti: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    rconn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: rejting – Elo ljestvica po uzrastu i stilu te povijest rejtinga sportaša."""
+
+import streamlit as st
+
+from hk import ratings
+from hk.config import AGES, STYLES
+from hk.db import get_conn, get_read_conn
+from hk.lookup import Lookup
+from hk.views.common import page_header, select_id
+
+
+def render():
+    page_header("Rejting", "Elo rejting iz pojedinačnih borbi – pomoć pri odabiru za nastupe i kategorije")
+
+    # samo novi rezultati; bez promjena je to nekoliko praznih upita
+    conn = get_conn()
+    upd = ratings.update(conn)
+    conn.close()
+    st.caption(f"Ažuriranje: {upd['način']}, {upd['borbi']} borbi ({upd['ms']} ms)")
+
+    c1, c2, c3 = st.columns(3)
+    age = c1.selectbox("Uzrast", ["Svi"] + AGES)
+    style = c2.selectbox("Stil", ["Svi"] + STYLES)
+    min_bouts = c3.number_input("Najmanje borbi", min_value=1, value=5, step=1)
+
+    rconn = get_read_conn()
+    board = ratings.leaderboard(rconn, None if age == "Svi" else age, None if style == "Svi" else style,
+                                int(min_bouts))
+    if board.empty:
+        st.info("Nema sportaša s dovoljno ocijenjenih borbi.")
+        rconn.close()
+        return
+    st.dataframe(board.drop(columns=["member_id"]), use_container_width=True, hide_index=True)
+
+    st.markdown("**Povijest rejtinga**")
+    athletes = Lookup.from_rows(board[["member_id", "sportaš"]].drop_duplicates().itertuples(index=False))
+    mid = select_id("Sportaš", athletes)
+    hist = ratings.history(rconn, mid, None if style == "Svi" else style)
+    if not hist.empty:
+        st.line_chart(hist.pivot_table(index="datum", columns="stil", values="rejting"))
+    rconn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: statistika medalja, pobjeda/poraza i borbi (tablica i grafovi)."""
+
+import streamlit as st
+
+from hk import olap, profiler
+from hk import queries as q
+from hk.config import STATS_ENGINE
+from hk.db import get_read_conn, read_snapshot
+from hk.views.common import page_header
+
+# Za grafove u statistici
+try:
+    import matplotlib.pyplot as plt
+    HAS_MPL = True
+except Exception:
+    HAS_MPL = False
+
+
+def _charts(sdf):
+    # Medalje
+    medals = sdf[["zlato","srebro","bronca"]].sum()
+    if HAS_MPL:
+        fig = plt.figure()
+        plt.bar(["Zlato","Srebro","Bronca"], medals.values)
+        plt.title("Medalje (ukupno)")
+        st.pyplot(fig)
+    else:
+        st.bar_chart(medals)
+
+    # Omjer pobjeda/poraza
+    wl = sdf[["pobjede","porazi"]].sum()
+    if HAS_MPL:
+        fig2 = plt.figure()
+        plt.bar(["Pobjede","Porazi"], wl.values)
+        plt.title("Pobjede / Porazi (ukupno)")
+        st.pyplot(fig2)
+    else:
+        st.bar_chart(wl)
+
+    # Ukupno borbi po vrsti natjecanja (top 10)
+    top = sdf.groupby("kind")["ukupno_borbi"].sum().sort_values(ascending=False).head(10)
+    if HAS_MPL:
+        fig3 = plt.figure()
+        plt.bar(list(top.index), list(top.values))
+        plt.title("Ukupno borbi po vrsti (top 10)")
+        plt.xticks(rotation=45, ha="right")
+        st.pyplot(fig3)
+    else:
+        st.bar_chart(top)
+
+
+class _SqliteStats:
+    """Isti upiti kao olap.DuckStats, izravno nad SQLite konekcijom."""
+    source = "sqlite"
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def summary(self, year, member, kind):
+        return q.stats_summary(self.conn, year, member, kind)
+
+    def medals_by_season(self, year, member, kind):
+        return q.medals_by_season(self.conn, year, member, kind)
+
+    def placement_percentiles(self, year, member, kind):
+        return q.placement_percentiles(self.conn, year, member, kind)
+
+
+def _tables(src, args):
+    return src.summary(*args), src.medals_by_season(*args), src.placement_percentiles(*args)
+
+
+@st.fragment
+def stats_panel():
+    """Filtri, tablica i grafovi; interakcije ponovno izvode samo ovaj panel."""
+    conn = get_read_conn()
+    year = st.selectbox("Godina", ["Sve"] + q.competition_years(conn))
+    member = st.text_input("Sportaš/ica (dio imena)")
+    kind = st.text_input("Vrsta natjecanja (dio naziva)")
+    if st.button("Izračunaj", key="stats_run"):
+        args = (None if year == "Sve" else year, member, kind)
+        src = olap.engine()
+        if src is not None:
+            # DuckDB: svaki upit čita bazu (ili Parquet snimku) zasebno
+            try:
+                sdf, medals, pct = _tables(src, args)
+            except Exception as e:
+                olap.log.exception("DuckDB upit za statistiku nije uspio")
+                st.warning(f"DuckDB upit nije uspio ({e}) – koristi se SQLite.")
+                src = None
+        elif STATS_ENGINE == "duckdb":
+            st.warning(f"HK_STATS_ENGINE=duckdb, ali DuckDB nije dostupan ({olap.engine_error()}) – koristi se SQLite.")
+        if src is None:
+            src = _SqliteStats(conn)
+            # sve tri tablice iz istog stanja baze, i kad se usput sprema prisustvo
+            with read_snapshot(conn):
+                sdf, medals, pct = _tables(src, args)
+        st.caption(f"Izvor: {src.source}")
+        st.dataframe(sdf, use_container_width=True)
+
+        # Grafovi
+        with profiler.span("grafovi (matplotlib)"):
+            if not sdf.empty:
+                _charts(sdf)
+
+        st.markdown("**Medalje po sportašu, sezoni i stilu**")
+        st.dataframe(medals, use_container_width=True)
+        st.markdown("**Plasman u odnosu na broj natjecatelja (percentil)**")
+        st.caption("100 = pobjeda, 0 = zadnje mjesto; samo natjecanja s upisanim ukupnim brojem natjecatelja.")
+        st.dataframe(pct, use_container_width=True)
+    conn.close()
+
+
+def render():
+    page_header("Statistika", "Filtri i grafički/tablični prikaz medalja, pobjeda/poraza i borbi")
+    stats_panel()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: treneri – upis, dodjela grupama, dokumenti i Excel uvoz/izvoz."""
+
+import streamlit as st
+
+from hk import queries as q
+from hk.lookup import Lookup
+from hk.dataio import excel_bytes_from_df, export_coaches, import_coaches
+from hk.db import get_conn
+from hk.views.common import import_upload, page_header, save_upload, select_id
+
+
+def render():
+    page_header("Treneri", "Upis, uređivanje, dokumenti i Excel import/export")
+
+    conn = get_conn()
+    groups = Lookup(q.groups(conn))
+    with st.form("coach_form"):
+        c1, c2 = st.columns(2)
+        first_name = c1.text_input("Ime")
+        last_name  = c1.text_input("Prezime")
+        full_name = f"{first_name} {last_name}".strip()
+        dob = c1.date_input("Datum rođenja", value=None)
+        oib = c1.text_input("OIB")
+        email = c2.text_input("E-mail")
+        iban = c2.text_input("IBAN račun")
+        # Grupa pri upisu
+        gid = select_id("Grupa", groups, blank="", where=c2)
+        photo = st.file_uploader("Slika (jpg/png)", type=["jpg","jpeg","png"])
+        submit = st.form_submit_button("Spremi trenera")
+
+    if submit:
+        q.insert_coach(conn, (full_name, first_name, last_name, str(dob) if dob else "", oib, email, iban,
+                              save_upload(photo, "coaches/photos")),
+                       gid)
+        st.success("Trener spremljen.")
+
+    # Uređivanje/brisanje trenera
+    st.subheader("Uredi / obriši trenera")
+    tdf = export_coaches(conn)
+    st.dataframe(tdf, use_container_width=True)
+    st.download_button("Skini trenere (Excel)",
+                       data=excel_bytes_from_df(tdf, "Treneri"),
+                       file_name="treneri.xlsx")
+
+    uplc = st.file_uploader("Učitaj trenere (Excel po predlošku)", type=["xlsx"])
+    if uplc:
+        try:
+            n, _ = import_upload(conn, uplc, import_coaches)
+            st.success(f"Treneri uvezeni ({n}).")
+        except Exception as e:
+            st.error(f"Greška pri uvozu: {e}")
+
+    # Povezivanje s grupama (dodatno)
+    st.subheader("Dodjela trenera u grupe")
+    coaches = Lookup.from_rows(q.coaches(conn), "{} – {}".format)
+    if coaches and groups:
+        cc = select_id("Trener", coaches)
+        gg = select_id("Grupa", groups)
+        if st.button("Dodijeli"):
+            q.assign_coach(conn, cc, gg)
+            st.success("Dodano.")
+    else:
+        st.info("Najprije unesite trenere i grupe.")
+
+    # Ugovori/dokumenti
+    st.subheader("Učitavanje ugovora i drugih dokumenata")
+    if coaches:
+        csel = select_id("Trener (dokumenti)", coaches, key="docs_coach")
+        doc1 = st.file_uploader("Ugovor (pdf/doc)", type=["pdf","doc","docx"], key="c_doc1")
+        doc2 = st.file_uploader("Drugi dokument", type=["pdf","doc","docx","jpg","jpeg","png"], key="c_doc2")
+        if st.button("Spremi dokumente"):
+            q.add_coach_docs(conn, csel,
+                             [(k, f.name, save_upload(f, "coaches/docs")) for f, k in [(doc1, "ugovor"), (doc2, "ostalo")] if f])
+            st.success("Dokumenti spremljeni.")
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Odjeljak: veterani – popis, brisanje i komunikacija (e-mail/WhatsApp)."""
+
+import streamlit as st
+
+from hk import queries as q
+from hk.db import get_conn
+from hk.lookup import Lookup
+from hk.repos import MembersRepo
+from hk.views.common import contact_links, page_header, select_id
+from hk.writer import get_writer
+
+
+def render():
+    page_header("Veterani", "Popis, uređivanje/brisanje i komunikacija (e-mail/WhatsApp)")
+
+    conn = get_conn()
+    vdf = q.veterans(conn)
+    st.dataframe(vdf, use_container_width=True)
+
+    if not vdf.empty:
+        vets = Lookup((r.id, f"{r.id} – {r.ime_prezime}") for r in vdf.itertuples())
+        vid = select_id("Odaberi veterana (ID – ime)", vets)
+        row = vdf.iloc[vets.index(vid)]
+        contact_links(row["athlete_email"], row["parent_email"], row["athlete_phone"], row["parent_phone"],
+                      subject="Obavijest – Veterani HK Podravka")
+
+    # Brisanje/mijenjanje
+    st.markdown("---")
+    del_id = st.number_input("ID veterana za brisanje", min_value=0, step=1)
+    if st.button("Obriši"):
+        try:
+            get_writer().write([MembersRepo.delete_veteran_op(del_id)])
+        except Exception as e:
+            st.error(f"Greška pri brisanju: {e}")
+        else:
+            st.success("Obrisano (ako je postojalo).")
+    conn.close()
+
+
+if __name__ == "__main__":
+    # stranica u st.navigation (streamlit_app.py)
+    render()
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Koordinacija pisanja u bazu: jedna pozadinska nit-pisač po bazi.
+
+Obrasci (prisustvo, rezultati…) predaju paket upisa u red; pisač uzima
+više paketa odjednom i potvrđuje ih u jednoj transakciji (svaki paket u
+svom SAVEPOINT-u, pa neispravan paket ne ruši ostale). Zaključana baza se
+ponavlja ograničen broj puta s eksponencijalnim čekanjem. stats() vraća
+dubinu reda i latenciju potvrde (commit).
+
+Paket je lista (sql, params) parova – params kao tuple znači execute, kao
+lista redaka executemany – ili funkcija f(conn) kad treba npr. lastrowid.
+
+▶ Usporedba s izravnim commitom po upisu:
+    python -m hk.writer --threads 8 --batches 200
+"""
+
+import argparse
+import os
+import queue
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from hk.config import DB_PATH
+from hk.db import get_conn, init_db
+from hk.sequence import is_busy
+
+Ops = Union[Callable[[sqlite3.Connection], object], Sequence[Tuple[str, object]]]
+
+_STOP = object()
+
+
+class WriteQueue:
+    def __init__(self, db_path: Optional[str] = None, max_group: int = 64,
+                 max_wait: float = 0.0, retries: int = 6, base_delay: float = 0.02):
+        self.db_path = db_path or DB_PATH
+        self.max_group = max_group
+        self.max_wait = max_wait
+        self.retries = retries
+        self.base_delay = base_delay
+        self._q: "queue.Queue" = queue.Queue()
+        self._lat_ms: deque = deque(maxlen=500)
+        self._counts = {"paketi": 0, "transakcije": 0, "ponavljanja": 0, "neuspjeli": 0}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="hk-writer", daemon=True)
+        self._thread.start()
+
+    # --- javno sučelje ---
+    def submit(self, ops: Ops) -> Future:
+        fut: Future = Future()
+        self._q.put((ops, fut))
+        return fut
+
+    def write(self, ops: Ops, timeout: Optional[float] = 30.0):
+        """Predaj paket i pričekaj potvrdu; greška iz paketa se ponovno diže."""
+        return self.submit(ops).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lat = sorted(self._lat_ms)
+            out: Dict[str, object] = dict(self._counts)
+        out["dubina_reda"] = self._q.qsize()
+        out["commit_ms_zadnji"] = round(self._lat_ms[-1], 2) if self._lat_ms else None
+        out["commit_ms_p50"] = round(statistics.median(lat), 2) if lat else None
+        out["commit_ms_p95"] = round(lat[int(0.95 * (len(lat) - 1))], 2) if lat else None
+        return out
+
+    def close(self, timeout: Optional[float] = 10.0):
+        self._q.put(_STOP)
+        self._thread.join(timeout)
+
+    # --- pozadinska nit ---
+    def _run(self):
+        conn = get_conn(self.db_path)
+        try:
+            while True:
+                item = self._q.get()
+                if item is _STOP:
+                    return
+                group = [item]
+                stop = False
+                deadline = time.monotonic() + self.max_wait
+                while len(group) < self.max_group:
+                    try:
+                        left = deadline - time.monotonic()
+                        nxt = self._q.get(timeout=left) if left > 0 else self._q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is _STOP:
+                        stop = True
+                        break
+                    group.append(nxt)
+                self._commit_group(conn, group)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, ops: Ops):
+        if callable(ops):
+            return ops(conn)
+        n = 0
+        for sql, params in ops:
+            if isinstance(params, list):
+                n += conn.executemany(sql, params).rowcount
+            else:
+                n += conn.execute(sql, params or ()).rowcount
+        return n
+
+    def _commit_group(self, conn: sqlite3.Connection, group: List[Tuple[Ops, Future]]):
+        for attempt in range(self.retries + 1):
+            t0 = time.perf_counter()
+            outcomes = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for i, (ops, fut) in enumerate(group):
+                    conn.execute(f"SAVEPOINT b{i}")
+                    try:
+                        outcomes.append((fut, self._apply(conn, ops), None))
+                    except sqlite3.OperationalError as e:
+                        if is_busy(e):
+                            raise
+                        conn.execute(f"ROLLBACK TO b{i}")
+                        outcomes.append((fut, None, e))
+                    except Exception as e:
+                        conn.execute(f"ROLLBACK TO b{i}")
+                        outcomes.append((fut, None, e))
+                    conn.execute(f"RELEASE b{i}")
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if is_busy(e) and attempt < self.retries:
+                    with self._lock:
+                        self._counts["ponavljanja"] += 1
+                    time.sleep(self.base_delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+                    continue
+                outcomes = [(fut, None, e) for _, fut in group]
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                outcomes = [(fut, None, e) for _, fut in group]
+            break
+
+        with self._lock:
+            self._lat_ms.append((time.perf_counter() - t0) * 1000)
+            self._counts["transakcije"] += 1
+            for _, _, err in outcomes:
+                self._counts["paketi" if err is None else "neuspjeli"] += 1
+        for fut, res, err in outcomes:
+            if err is None:
+                fut.set_result(res)
+            else:
+                fut.set_exception(err)
+
+
+_writers: Dict[str, WriteQueue] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path: Optional[str] = None) -> WriteQueue:
+    """Zajednički pisač za bazu (jedan po procesu i datoteci)."""
+    key = os.path.abspath(db_path or DB_PATH)
+    with _writers_lock:
+        w = _writers.get(key)
+        if w is None or not w._thread.is_alive():
+            w = _writers[key] = WriteQueue(key)
+        return w
+
+
+# ==========================
+# USPOREDBA PROPUSNOSTI
+# ==========================
+def bench(db_path: str, threads: int = 8, batches: int = 200, rows: int = 20) -> dict:
+    """N niti sprema pakete prisustva: izravno (commit po paketu) i kroz pisača."""
+    init_db(db_path)
+    conn = get_conn(db_path)
+    conn.execute("INSERT INTO sessions (start_ts) VALUES ('2025-01-01 18:00')")
+    conn.commit()
+    conn.close()
+    sql = "INSERT INTO attendance (session_id,member_id,present,minutes) VALUES (1,NULL,1,90)"
+    report = {}
+
+    def run(label, save):
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(batches):
+                    save()
+            except Exception as e:
+                errors.append(repr(e))
+
+        t0 = time.perf_counter()
+        ts = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        dt = time.perf_counter() - t0
+        report[label] = {"paketa_u_s": round(threads * batches / dt, 1),
+                         "trajanje_s": round(dt, 3), "greške": len(errors)}
+
+    local = threading.local()
+
+    def direct():
+        if not hasattr(local, "conn"):
+            local.conn = get_conn(db_path)
+        for _ in range(rows):
+            local.conn.execute(sql)
+        local.conn.commit()
+
+    run("izravno", direct)
+    w = WriteQueue(db_path)
+    run("pisač", lambda: w.write([(sql.replace("VALUES (1,NULL,1,90)", "VALUES (?,?,?,?)"),
+                                   [(1, None, 1, 90)] * rows)]))
+    report["pisač"].update(w.stats())
+    w.close()
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Propusnost pisanja: izravno vs. pozadinski pisač.")
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--batches", type=int, default=200)
+    args = ap.parse_args(argv)
+    tmp_dir = tempfile.mkdtemp(prefix="hk_writer_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    try:
+        rep = bench(db_path, args.threads, args.batches)
+    finally:
+        for fn in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, fn))
+        os.rmdir(tmp_dir)
+    for label, r in rep.items():
+        print(label, r)
+
+
+if __name__ == "__main__":
+    main()